@@ -1,467 +1,1191 @@
 import os
-import random
-from flask import Flask, render_template, request, redirect, url_for, session
-from flask_socketio import SocketIO, emit, join_room, leave_room
+# 여러 워커(STORE_URL): Redis 클라이언트가 허브를 막지 않도록 소켓부터 패치 (gunicorn -k eventlet은 이미 패치됨)
+if os.environ.get("STORE_URL") and os.environ.get("ASYNC_MODE", "eventlet") != "asgi":
+    import eventlet
+    eventlet.monkey_patch()
+import logging
+import secrets
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, abort, jsonify, render_template, request, redirect, url_for, session
 from datetime import datetime
-from data.topics import TOPICS
+from liar.actors import RoomActors
+from liar.assets import AssetBundle
+from liar.cluster import Cluster
+from liar.engine import (MIN_PLAYERS, SENDER, Engine, Phase, current_tally, hint_order_payload, open_vote_payload,
+                         role_info_payload, score_deltas, vote_progress_payload)
+from liar.journal import Journal, dump_room, load_room, recover, settle_room
+from liar.limits import Outbox, RateLimiter
+from liar.matchmaking import MatchQueue
+from liar.metrics import Metrics
+from liar.rooms import Player, RoomRegistry
+from liar.scheduler import TimerScheduler
+from liar.spectators import SpectatorHub
+from liar.stats import BOARDS, PlayerStats
+from liar.store import open_store
+from liar.topic_bank import TopicBank
+from liar.wire import CompactJSON, WireManager, WirePacket, WireRedisManager, install as install_wire, msgpack
+
+# eventlet(기본, gunicorn -k eventlet) 또는 asgi(asyncio AsyncServer + uvicorn/hypercorn)
+ASYNC_MODE = os.environ.get("ASYNC_MODE", "eventlet")
+# 워커 여러 개: 방 주인/문서 저장소 겸 Socket.IO 메시지 큐 (redis://...). 비우면 워커 하나, 모두 메모리
+STORE_URL = os.environ.get("STORE_URL", "")
+if STORE_URL and ASYNC_MODE == "asgi":
+    raise RuntimeError("STORE_URL is supported with the eventlet server only")
+if ASYNC_MODE == "asgi":
+    from liar.aio import AsyncSocketIO, emit, join_room, request
+else:
+    from eventlet import tpool
+    from flask_socketio import SocketIO, emit, join_room
 
 # ------------ App Setup ------------
 app = Flask(__name__)
+app.logger.setLevel(logging.INFO)  # 시작 때 한 번씩 남기는 안내 (복구한 방 수 등)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret-key")
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="eventlet")
+# 연결마다 JSON/MessagePack을 고를 수 있는 직렬화 (client.js가 ?wire=msgpack 으로 요청)
+if ASYNC_MODE == "asgi":
+    socketio = AsyncSocketIO(app, cors_allowed_origins="*", json=CompactJSON, serializer=WirePacket)
+    asgi = socketio.asgi_app  # uvicorn app:asgi / hypercorn app:asgi
+else:
+    # STORE_URL이 있으면 Flask-SocketIO message_queue 자리에 형식별 인코딩을 유지하는 Redis 매니저
+    manager = WireRedisManager(STORE_URL) if STORE_URL else WireManager()
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode="eventlet",
+                        json=CompactJSON, serializer=WirePacket, client_manager=manager)
+install_wire(socketio.server)
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 HOST_CODE = os.environ.get("HOST_CODE", "9999")
-ROOM = "main"
-
-# ------------ In-Memory Game State (reset on server restart) ------------
-class GameState:
-    def __init__(self):
-        self.reset_all()
-
-    def reset_all(self):
-        self.players = {}  # sid -> {'name': str, 'score': int, 'is_host': bool}
-        self.sid_by_name = {}
-        self.host_sid = None
-        self.phase = "lobby"  # 'lobby','hint1','discussion','vote1','hint2','vote2','liar_guess','results','summary'
-        self.round_num = 0
-        self.max_rounds = 3
-        self.category = None
-        self.secret_word = None
-        self.order = []  # speaking order
-        self.roles = {}  # sid -> 'liar'|'spy'|'citizen'
-        self.liar_sid = None
-        self.spy_sid = None
-        self.votes1 = {}  # voter_sid -> target_sid
-        self.votes2 = {}  # voter_sid -> target_sid
-        self.last_result = None  # dict summary of last round
-
-    def game_started(self):
-        return self.round_num > 0
-
-GS = GameState()
+TOPIC_RELOAD_INTERVAL = float(os.environ.get("TOPIC_RELOAD_INTERVAL", "2"))
+ROOM_IDLE_TTL = int(os.environ.get("ROOM_IDLE_TTL", "600"))  # 빈 방 보관 시간(초)
+ROOM_GC_INTERVAL = int(os.environ.get("ROOM_GC_INTERVAL", "60"))
+RECONNECT_GRACE = int(os.environ.get("RECONNECT_GRACE", "60"))  # 연결이 끊긴 플레이어 자리 보관 시간(초)
+HINT_SECONDS = int(os.environ.get("HINT_SECONDS", "15"))
+DISCUSSION_SECONDS = int(os.environ.get("DISCUSSION_SECONDS", "120"))
+GUESS_SECONDS = int(os.environ.get("GUESS_SECONDS", "30"))
+VOTE_FLUSH_SECONDS = int(os.environ.get("VOTE_FLUSH_MS", "200")) / 1000.0  # 투표 현황 묶음 전송 간격
+LOBBY_FLUSH_SECONDS = int(os.environ.get("LOBBY_FLUSH_MS", "100")) / 1000.0  # 로비 변경 묶음 전송 간격
+# 상태 변경 저널 위치 (빈 값이면 끔). 재시작하면 스냅샷 + 저널 꼬리로 방을 복구한다.
+# 워커 여러 개일 때는 저장소가 그 역할이라 기본은 끔 (워커들이 같은 디렉터리에 쓰면 안 된다)
+JOURNAL_DIR = os.environ.get("JOURNAL_DIR", "" if STORE_URL else os.path.join(BASE_DIR, "var", "journal"))
+JOURNAL_FLUSH_SECONDS = int(os.environ.get("JOURNAL_FLUSH_MS", "20")) / 1000.0
+SNAPSHOT_INTERVAL = int(os.environ.get("SNAPSHOT_INTERVAL", "60"))
+# 플레이어 누적 전적 (SQLite, 빈 값이면 끔). 끝난 라운드/게임을 STATS_FLUSH_MS마다 묶어서 쓴다
+STATS_DB = os.environ.get("STATS_DB", os.path.join(BASE_DIR, "var", "stats.sqlite3"))
+STATS_FLUSH_SECONDS = int(os.environ.get("STATS_FLUSH_MS", "1000")) / 1000.0
+METRICS_ENABLED = os.environ.get("METRICS", "1") != "0"
+HUB_BLOCK_SECONDS = int(os.environ.get("HUB_BLOCK_MS", "100")) / 1000.0  # 이보다 오래 허브가 멈추면 기록
+HUB_WATCH_INTERVAL = 0.05
+# 1이면 입장 후 /play 한 페이지에서 로비/게임을 바꿔 끼운다 (0이면 예전처럼 /lobby → /game 페이지 이동)
+SPA_MODE = os.environ.get("SPA_MODE", "1") != "0"
+ASSET_RELOAD_INTERVAL = float(os.environ.get("ASSET_RELOAD_INTERVAL", "2"))
+# 관전 스냅샷 전송 빈도 (초당). 게임 이벤트가 아무리 많아도 관전자에게는 이 속도로만
+SPECTATOR_HZ = float(os.environ.get("SPECTATOR_HZ", "2"))
+SPECTATOR_CHUNK = 256  # 관전 스냅샷을 이만큼 보낼 때마다 허브/루프를 양보
+# python app.py(eventlet) 동시 연결 상한. eventlet 기본값 1024로는 관전자 몇천 명을 못 받는다
+MAX_CONNECTIONS = int(os.environ.get("MAX_CONNECTIONS", "10000"))
+# 소켓 이벤트 허용량: sid마다 이벤트마다 (초당, 버스트). 넘친 명령은 조용히 버린다. RATE_LIMIT=0이면 끔
+RATE_LIMIT = os.environ.get("RATE_LIMIT", "1") != "0"
+EVENT_LIMITS = {
+    "register": (0.5, 5),
+    "lobby_sync": (1, 5),
+    "cast_vote": (2, 6),
+    "liar_guess": (1, 3),
+    "watch": (0.5, 3),
+    "claim_host": (0.2, 3),  # 4자리 호스트 코드 대입 방지
+    "queue": (0.5, 5),
+    "queue_ready": (1, 3),
+    "queue_leave": (1, 3),
+}
+# 호스트 전용: 버튼 연타 정도는 받아 주고 스크립트 폭주는 막는다
+HOST_EVENT_LIMITS = {
+    event: (2, 5) for event in ("start_game", "start_discussion", "start_vote1", "start_hint2",
+                                "close_vote1", "start_vote2", "close_vote2", "next_round")
+}
+HOST_EVENT_LIMITS["hint_next"] = (4, 10)  # '다음 발언자'는 연달아 누르는 버튼
+# 소켓별 송신 큐: SOFT개를 넘으면 관전 스냅샷/로비 변경은 버리고, HARD개를 넘으면 연결을 끊는다 (재접속으로 복구)
+OUTBOX_SOFT = int(os.environ.get("OUTBOX_SOFT", "32"))
+OUTBOX_HARD = int(os.environ.get("OUTBOX_HARD", "256"))
+# 빠른 시작: 대기열에서 이 인원씩 테이블을 만든다 (7명 이상이면 스파이 역할이 생긴다)
+MATCH_TABLE_SIZE = int(os.environ.get("MATCH_TABLE_SIZE", "7"))
+MATCH_MAX_WAIT = float(os.environ.get("MATCH_MAX_WAIT", "20"))  # 가장 오래 기다린 사람이 이만큼(초) 넘으면 덜 찬 테이블도 출발
+MATCH_START_SECONDS = int(os.environ.get("MATCH_START_SECONDS", "30"))  # 매칭된 방: 전원이 앉거나 이 시간이 지나면 자동 시작
+MATCH_INTERVAL = 0.5
+ROOM_ACTORS = os.environ.get("ROOM_ACTORS", "1") != "0"  # 0이면 방 우편함 없이 바로 실행 (비교 벤치용)
+ROOM_CLAIM_TTL = int(os.environ.get("ROOM_CLAIM_TTL", "15"))  # 방 주인 표시 유효 시간(초): 주인 워커가 죽으면 이만큼 뒤 이어받음
+STORE_FLUSH_SECONDS = int(os.environ.get("STORE_FLUSH_MS", "100")) / 1000.0  # 바뀐 방 문서를 묶어서 저장하는 간격
+# 클라이언트에 권할 전송 형식: msgpack 패키지가 있으면 MessagePack, WIRE_FORMAT=json이면 항상 JSON
+WIRE_FORMAT = "msgpack" if msgpack is not None and os.environ.get("WIRE_FORMAT", "msgpack") == "msgpack" else "json"
+
+# ------------ Rooms (one GameState per table) ------------
+ROOMS = RoomRegistry(idle_ttl=ROOM_IDLE_TTL)
+# 저널 디스크 I/O: eventlet은 tpool(끝날 때까지 그린렛만 기다림), asyncio는 스레드 하나짜리 executor에 순서대로
+JOURNAL_OFFLOAD = ThreadPoolExecutor(1, "journal").submit if ASYNC_MODE == "asgi" else tpool.execute
+JOURNAL = Journal(JOURNAL_DIR, offload=JOURNAL_OFFLOAD, interval=JOURNAL_FLUSH_SECONDS) if JOURNAL_DIR else None
+# 전적 DB: 쓰기는 저널처럼 (asyncio는 전용 스레드 하나). 읽기는 eventlet이면 tpool,
+# asyncio면 /leaderboard, /players/ 라우트를 통째로 쓰기와 같은 스레드에서 돌려 루프를 막지 않는다
+STATS_EXECUTOR = ThreadPoolExecutor(1, "stats") if ASYNC_MODE == "asgi" else None
+STATS = PlayerStats(STATS_DB, offload=STATS_EXECUTOR.submit if STATS_EXECUTOR else tpool.execute,
+                    read=None if STATS_EXECUTOR else tpool.execute, interval=STATS_FLUSH_SECONDS) if STATS_DB else None
+if STATS is not None and STATS_EXECUTOR is not None:
+    socketio.offload_routes(("/leaderboard", "/players/"), STATS_EXECUTOR)
+METRICS = Metrics(block_threshold=HUB_BLOCK_SECONDS) if METRICS_ENABLED else None
+SCHED = TimerScheduler()
+# data/topics.py + data/packs/*.json, 파일이 바뀌면 재시작 없이 다시 읽는다
+TOPIC_BANK = TopicBank(os.path.join(BASE_DIR, "data", "topics.py"),
+                       os.path.join(BASE_DIR, "data", "packs", "*.json"))
+# 규칙은 liar/engine.py: 핸들러는 명령을 넘기고 돌려받은 이벤트만 보낸다 (send).
+# 방마다 섞인 덱에서 뽑는다: 주제의 제시어를 다 쓰기 전엔 같은 제시어가 안 나온다
+ENGINE = Engine(draw_topic=lambda gs, rng: gs.deck.draw(TOPIC_BANK.current, rng))
+# 공식 Socket.IO 클라이언트 4.7.5 (long-polling으로 붙은 뒤 websocket으로 올라간다, 막힌 망에서는 polling 그대로).
+# 빌드할 때 static/vendor/에 받아 두고(render.yaml buildCommand, 해시 확인) 다른 정적 파일처럼 해시 이름으로 서빙한다.
+# 받아 두지 않은 체크아웃(로컬 실행, Procfile, 테스트)은 같은 파일을 CDN에서 SRI(render.yaml과 같은 sha384)로 고정해 쓴다
+SOCKETIO_CLIENT = "vendor/socket.io.min.js"
+SOCKETIO_CDN = ("https://cdn.socket.io/4.7.5/socket.io.min.js",
+                "sha384-2huaZvOR9iDzHqslqwpR87isEmrfxqyWOF7hr7BY6KG0+hVKLoEXMPUJw3ynWuhO")
+# static/ 파일은 내용 해시 이름 + 미리 압축한 gzip/br 로 /assets/ 아래에서 서빙
+ASSETS = AssetBundle(os.path.join(BASE_DIR, "static"), (SOCKETIO_CLIENT, "wire.js", "client.js", "watch.js", "queue.js",
+                                                        "style.css"))
+if ASSETS.url_name(SOCKETIO_CLIENT) is None:
+    app.logger.warning("static/%s is missing; pages load it from %s (see render.yaml's buildCommand)",
+                       SOCKETIO_CLIENT, SOCKETIO_CDN[0])
+WATCH = SpectatorHub()
+MATCH = MatchQueue(MATCH_TABLE_SIZE, MIN_PLAYERS, MATCH_MAX_WAIT)
+LIMITER = RateLimiter(EVENT_LIMITS, HOST_EVENT_LIMITS) if RATE_LIMIT else None
+OUTBOX = Outbox(OUTBOX_SOFT, OUTBOX_HARD)
+ACTORS = RoomActors(direct=not ROOM_ACTORS)
+STORE = open_store(STORE_URL)
+CLUSTER = Cluster(STORE, ttl=ROOM_CLAIM_TTL)
+_background_started = False
+
+def every(interval, fn, *args):
+    # 주기 작업 하나 = 백그라운드 태스크 하나. interval은 초, 또는 다음 대기 시간을 돌려주는 함수
+    if ASYNC_MODE == "asgi":
+        return socketio.every(interval, fn, *args)
+
+    def loop():
+        while True:
+            socketio.sleep(interval() if callable(interval) else interval)
+            try:
+                fn(*args)
+            except Exception:
+                traceback.print_exc()
+    return socketio.start_background_task(loop)
+
+def in_room(code, fn, *args):
+    # 방 상태를 바꾸거나 읽는 일은 전부 그 방의 우편함을 거친다 (소켓 이벤트, 타이머, 관전 스냅샷).
+    # 다른 워커가 맡은 방이면 그 워커의 우편함으로 넘긴다 (fn은 @CLUSTER.task로 등록된 것만)
+    if code in ROOMS.rooms or not CLUSTER.shared:
+        deliver(code, fn, args)
+    else:
+        CLUSTER.forward(code, fn, args)
+
+def deliver(code, fn, args):
+    ACTORS.tell(code, fn, *args)
+    CLUSTER.touch(code)
+
+def find_room(code):
+    # 방 코드 정규화: 이 워커에 있거나 다른 워커가 맡고 있으면 코드, 없으면 None
+    gs = ROOMS.get(code)
+    if gs is not None:
+        return gs.code
+    code = str(code or "").strip().upper()
+    if not code or not CLUSTER.shared:
+        return None
+    return code if CLUSTER.owner_of(code) is not None else None
+
+def create_room():
+    # 코드는 모든 워커에서 유일해야 한다: 저장소에 주인으로 올리지 못하면 다른 코드로
+    while True:
+        gs = ROOMS.create()
+        if CLUSTER.claim(gs.code):
+            return gs
+        del ROOMS.rooms[gs.code]
+
+def dump_owned(code):
+    # 저널 문서 + 다른 워커에 붙은 소켓: 이 워커가 죽으면 그 소켓들은 살아 있으니 이어받는 워커가 자리를 유지한다
+    gs = ROOMS.rooms.get(code)
+    if gs is None:
+        return None
+    doc = dump_room(gs)
+    manager = socketio.server.manager
+    doc["remote"] = [[pid, sid] for pid, sid in gs.sid_of.items() if not manager.is_connected(sid, "/")]
+    return doc
+
+def enter_room(sid, room):
+    # 우편함 안(핸들러 컨텍스트 밖일 수 있음)에서 불리므로 매니저를 직접.
+    # 다른 워커에 붙은 sid면 메시지 큐 매니저가 그 워커로 넘긴다
+    if CLUSTER.shared:
+        socketio.server.manager.enter_room(sid, "/", room)
+    else:
+        socketio.server.manager.basic_enter_room(sid, "/", room)
+
+def exit_room(sid, room):
+    if CLUSTER.shared:
+        socketio.server.manager.leave_room(sid, "/", room)
+    else:
+        socketio.server.manager.basic_leave_room(sid, "/", room)
+
+def collect_rooms():
+    for code in ROOMS.collect_idle():
+        WATCH.drop(code)
+        CLUSTER.release(code)
+        journal("drop", code)
+
+def ensure_background_tasks():
+    global _background_started
+    if _background_started:
+        return
+    _background_started = True
+    every(SCHED.next_delay, SCHED.run_due)
+    every(ROOM_GC_INTERVAL, collect_rooms)
+    every(TOPIC_RELOAD_INTERVAL, TOPIC_BANK.check)
+    every(ASSET_RELOAD_INTERVAL, ASSETS.check)
+    every(1.0 / SPECTATOR_HZ, flush_spectators)
+    every(MATCH_INTERVAL, seat_matches)
+    if JOURNAL is not None:
+        every(JOURNAL.interval, JOURNAL.tick, dump_rooms, SNAPSHOT_INTERVAL)
+    if STATS is not None:
+        every(STATS.interval, STATS.tick)
+    if METRICS is not None:
+        every(HUB_WATCH_INTERVAL, METRICS.check_hub, HUB_WATCH_INTERVAL)
+    if CLUSTER.shared:
+        every(STORE_FLUSH_SECONDS, CLUSTER.flush, dump_owned)
+        socketio.start_background_task(CLUSTER.listen)
+
+def journal(op, code, *args):
+    # 상태 전이 기록: 메모리에 쌓기만 하고 디스크 쓰기는 every(JOURNAL.interval, JOURNAL.tick)이 묶어서
+    if JOURNAL is not None:
+        JOURNAL.append([op, code] + list(args))
+
+def dump_rooms():
+    return [dump_room(gs) for gs in ROOMS.rooms.values()]
+
+def now_ms():
+    return int(time.time() * 1000)
+
+# ------------ Emit helpers ------------
+def room_emit(gs, event, payload):
+    # 방 전체 방송은 순번을 붙여 링 버퍼에 남긴다 (재접속 시 놓친 것만 다시 보내기 위해)
+    payload["seq"] = gs.events.append(event, payload)
+    socketio.emit(event, payload, to=gs.code)
+    WATCH.mark(gs.code)
+
+def emit_spread(event, payload, room):
+    # 관전 채널처럼 큰 방송: 인코딩은 한 번, 전송은 SPECTATOR_CHUNK명씩 끊고 사이사이 양보해서
+    # 같은 허브/루프의 게임 이벤트가 관전자 수천 명 뒤에 줄 서지 않게 한다
+    if ASYNC_MODE == "asgi":
+        return socketio.emit_spread(event, payload, room, SPECTATOR_CHUNK)
+    if CLUSTER.shared:
+        socketio.server.manager.publish_emit(event, payload, "/", room)
+    out = socketio.server.manager.fanout(event, payload, "/", room)
+    if out:
+        # asgi 쪽처럼 전송은 따로: 방 우편함 안에서 불려도 그 방 일이 전송 끝까지 밀리지 않게
+        socketio.start_background_task(send_spread, out)
+
+def send_spread(out):
+    send = socketio.server._send_eio_packet
+    for i in range(0, len(out), SPECTATOR_CHUNK):
+        if i:
+            socketio.sleep(0)
+        for eio_sid, pkt in out[i:i + SPECTATOR_CHUNK]:
+            send(eio_sid, pkt)
+
+def fresh(gs, payload):
+    # 다시 보내는 타이머 이벤트는 남은 시간을 지금 기준으로 (이미 지나간 타이머는 0)
+    if "ms" in payload:
+        info = gs.timer_info
+        remain = info[2] - now_ms() if info and info[1] is payload else 0
+        payload = dict(payload, ms=max(0, remain))
+    return payload
+
+# ------------ Phase Timers (server-authoritative) ------------
+def timer_payload(seconds):
+    # 절대 시각(13자리 두 개) 대신 남은 ms만: 클라이언트는 받은 순간부터 카운트다운
+    return {"seconds": seconds, "ms": int(seconds * 1000)}
+
+def cancel_phase_timer(gs):
+    SCHED.cancel(gs.timer)
+    gs.timer = None
+
+def schedule_phase(gs, seconds, fn, *args):
+    cancel_phase_timer(gs)
+    gs.timer = SCHED.call_later(seconds, in_room, gs.code, run_phase_timer, gs.code, gs.round_num, fn, args)
+
+def run_phase_timer(code, round_num, fn, args):
+    gs = ROOMS.get(code)
+    # 방이 사라졌거나 라운드가 넘어간 뒤의 타이머는 무시
+    if gs is None or gs.round_num != round_num:
+        return
+    gs.timer = None
+    send(gs, fn(gs, *args))
+
+def announce_timer(gs, event, payload, seconds):
+    payload.update(timer_payload(seconds))
+    gs.timer_info = (event, payload, now_ms() + payload["ms"])
+    room_emit(gs, event, payload)
+
+# 시간이 걸린 이벤트: 보낼 때 남은 시간을 붙이고, 시간이 다 되면 엔진에 넘길 명령
+def hint_timeout(gs, payload):
+    return ENGINE.next_hint(gs, payload["index"] + 1)
+
+def discussion_timeout(gs, payload):
+    return ENGINE.open_vote(gs, Phase.VOTE1)
+
+def guess_timeout(gs, payload):
+    # 시간 안에 못 맞히면 오답 처리
+    return ENGINE.guess(gs, gs.liar_pid, None)
+
+PHASE_TIMERS = {
+    "hint_turn": (HINT_SECONDS, hint_timeout),
+    "start_timer": (DISCUSSION_SECONDS, discussion_timeout),
+    "liar_selected": (GUESS_SECONDS, guess_timeout),
+}
+# 단계를 바꾸는 (시간 제한 없는) 이벤트: 돌던 타이머와 아직 안 보낸 표 현황은 버린다
+PHASE_EVENTS = ("hint_order", "open_vote", "round_result", "final_scores")
+
+# ------------ Engine events ------------
+def send(gs, events, sender=None):
+    # 엔진(liar/engine.py)이 돌려준 이벤트만 보낸다. 보내면서 그 이벤트에 딸린 서버 일
+    # (역할 채널, 저널, 전적, 단계 타이머, 표 현황 묶기)을 한다. sender: SENDER로 온 이벤트를 받을 곳
+    synced = False
+    for event, payload, to in events:
+        if to == SENDER:
+            if sender is not None:
+                socketio.emit(event, payload, to=sender)
+            continue
+        if to is not None:
+            # 역할별 채널에 한 번씩: 역할이 바뀐 사람만 채널을 옮긴 뒤
+            if not synced:
+                sync_role_channels(gs)
+                synced = True
+            socketio.emit(event, payload, to=role_channel(gs, to))
+            continue
+        record_event(gs, event, payload)
+        if event == "vote_progress":
+            queue_vote_progress(gs, payload)
+            continue
+        if event in PHASE_TIMERS:
+            seconds, timeout = PHASE_TIMERS[event]
+            announce_timer(gs, event, payload, seconds)
+            schedule_phase(gs, seconds, timeout, payload)
+            continue
+        if event == "vote_closed":
+            # 닫기 직전에 남은 변경분을 먼저
+            flush_vote_progress(gs)
+        elif event in PHASE_EVENTS:
+            cancel_phase_timer(gs)
+            gs.timer_info = None
+            drop_vote_progress(gs)
+        room_emit(gs, event, payload)
+
+def record_event(gs, event, payload):
+    # 상태 전이 기록(저널)과 전적: 이벤트 하나에 기록 하나
+    if event == "game_started":
+        journal("round", gs.code, gs.round_num, gs.category, gs.secret_word, list(gs.roles.items()), gs.order)
+    elif event == "hint_order":
+        journal("phase", gs.code, payload["phase"], -1, payload["order"])
+    elif event == "hint_turn":
+        journal("phase", gs.code, gs.phase, payload["index"])
+    elif event in ("start_timer", "open_vote"):
+        journal("phase", gs.code, payload["phase"], gs.hint_index)
+    elif event == "liar_selected":
+        journal("phase", gs.code, Phase.LIAR_GUESS, gs.hint_index)
+    elif event == "vote_progress":
+        for voter, target in payload["votes"]:
+            journal("vote", gs.code, payload["phase"], voter, target)
+    elif event == "round_result":
+        record_round(gs, payload)
+        journal("result", gs.code, [[pid, info.score] for pid, info in gs.players.items()], payload)
+    elif event == "final_scores":
+        journal("final", gs.code, payload)
+        if STATS is not None:
+            STATS.add_game(gs.code, gs.round_num, [[gs.players[pid].name, score] for pid, score in payload["scores"]])
 
 # ------------ Helpers ------------
-def get_players_public():
-    arr = []
-    for sid, info in GS.players.items():
-        arr.append({
-            "sid": sid,
-            "name": info["name"],
-            "score": info["score"],
-            "is_host": info.get("is_host", False)
-        })
-    # stable sort by join order (approx by name mapping) then host first
-    arr.sort(key=lambda x: (not x["is_host"], x["name"]))
-    return arr
-
-def broadcast_lobby_state():
-    socketio.emit("lobby_state", {
-        "players": get_players_public(),
-        "host_sid": GS.host_sid,
-        "host_name": GS.players.get(GS.host_sid, {}).get("name") if GS.host_sid else None,
-        "phase": GS.phase
-    }, to=ROOM)
-
-def choose_roles_and_topic():
-    sids = list(GS.players.keys())
-    if len(sids) < 3:
-        return False, "최소 3명 이상이 필요합니다."
-    liar = random.choice(sids)
-    spy = None
-    if len(sids) >= 7:
-        rest = [x for x in sids if x != liar]
-        spy = random.choice(rest)
-    GS.liar_sid = liar
-    GS.spy_sid = spy
-    GS.roles = {}
-    for sid in sids:
-        if sid == liar:
-            GS.roles[sid] = "liar"
-        elif spy and sid == spy:
-            GS.roles[sid] = "spy"
-        else:
-            GS.roles[sid] = "citizen"
-
-    category = random.choice(list(TOPICS.keys()))
-    word = random.choice(TOPICS[category])
-    GS.category = category
-    GS.secret_word = word
-    return True, None
-
-def reset_round():
-    GS.votes1 = {}
-    GS.votes2 = {}
-    GS.order = []
-    GS.phase = "lobby"
-
-def speaking_order():
-    # random order among players
-    order = list(GS.players.keys())
-    random.shuffle(order)
-    GS.order = order
-    return order
-
-def vote_tally(votes):
-    tally = {}
-    for voter, target in votes.items():
-        tally[target] = tally.get(target, 0) + 1
-    return tally
-
-def top_candidates(tally):
-    if not tally:
-        return []
-    maxv = max(tally.values())
-    tops = [sid for sid, v in tally.items() if v == maxv]
-    return tops, maxv
-
-def apply_scores(result):
-    # result dict keys: 'winner' 'liar_selected' 'liar_guessed_correct' etc.
-    # Scoring rules:
-    # 시민 승리: 최다득표로 라이어 정확 지목 & 라이어 정답 못맞힘 → 시민 전원 +1, 라이어/스파이 0
-    # 라이어 승리(1): 최다득표로 라이어가 안 걸림 → 라이어 +2, 스파이 +1, 시민 0
-    # 라이어 승리(2): 라이어가 걸렸지만 정답 맞힘 → 라이어 +2, 스파이 +1, 시민 0
-    if result.get("winner") == "citizens":
-        for sid, info in GS.players.items():
-            if GS.roles.get(sid) == "citizen" or GS.roles.get(sid) == "spy":  # 시민 전원만 +1 (스파이는 0)
-                pass
-        for sid, info in GS.players.items():
-            role = GS.roles.get(sid)
-            if role == "citizen":
-                info["score"] += 1
+def lobby_snapshot(gs):
+    state = gs.roster.snapshot()
+    state["room"] = gs.code
+    state["phase"] = gs.phase
+    return state
+
+def send_lobby_snapshot(gs, sid):
+    # 전체 명단은 처음 접속했을 때나 클라이언트 버전이 어긋났을 때만 그 사람에게
+    socketio.emit("lobby_state", lobby_snapshot(gs), to=sid)
+
+def queue_lobby_delta(gs):
+    # 명단 변경은 LOBBY_FLUSH_SECONDS 동안 모아서 한 번에 방송 (재접속 폭주 대비)
+    if gs.lobby_flush is None and gs.roster.pending:
+        gs.lobby_flush = SCHED.call_later(LOBBY_FLUSH_SECONDS, in_room, gs.code, flush_lobby_delta, gs.code)
+
+def flush_lobby_delta(code):
+    gs = ROOMS.get(code)
+    if gs is None:
+        return
+    gs.lobby_flush = None
+    delta = gs.roster.take_delta()
+    if delta is not None:
+        # 재접속 때는 로비 스냅샷을 따로 보내므로 링 버퍼에는 남기지 않는다
+        socketio.emit("lobby_delta", delta, to=gs.code)
+        WATCH.mark(gs.code)
+
+def queue_vote_progress(gs, payload):
+    # 창(VOTE_FLUSH_SECONDS) 안의 vote_progress를 하나로 합쳐 보낸다.
+    # 같은 사람이 여러 번 바꾸면 마지막 표만, 득표수는 대상마다 마지막 값
+    pending = gs.vote_pending
+    if not pending:
+        pending = gs.vote_pending = {"phase": payload["phase"], "votes": {}, "counts": {}}
+    pending["votes"].update(payload["votes"])
+    pending["counts"].update(payload["counts"])
+    pending["voted"], pending["top"], pending["max"] = payload["voted"], payload["top"], payload["max"]
+    if gs.vote_flush is None:
+        gs.vote_flush = SCHED.call_later(VOTE_FLUSH_SECONDS, in_room, gs.code, vote_flush_due, gs.code)
+
+def vote_flush_due(code):
+    gs = ROOMS.get(code)
+    if gs is not None:
+        gs.vote_flush = None
+        flush_vote_progress(gs)
+
+def drop_vote_progress(gs):
+    SCHED.cancel(gs.vote_flush)
+    gs.vote_flush = None
+    gs.vote_pending = {}
+
+def flush_vote_progress(gs):
+    pending = gs.vote_pending
+    drop_vote_progress(gs)
+    if not pending:
+        return
+    room_emit(gs, "vote_progress", {
+        "phase": pending["phase"],
+        "votes": [[voter, target] for voter, target in pending["votes"].items()],
+        "counts": [[t, n] for t, n in pending["counts"].items() if t in gs.players],
+        "voted": pending["voted"],
+        "top": pending["top"],
+        "max": pending["max"]
+    })
+
+def record_round(gs, result):
+    # 전적: 역할별 승패/점수, 라이어 정답 시도, 시민 표가 라이어를 가리켰는지 (두 번의 투표 모두)
+    if STATS is None:
+        return
+    deltas = score_deltas(gs.roles, result["winner"])
+    liar_team = result["winner"] != "citizens"
+    for pid, role in gs.roles.items():
+        info = gs.players.get(pid)
+        if info is None:
+            continue
+        votes = correct = 0
+        if role == "citizen":
+            for tally in (gs.votes1, gs.votes2):
+                target = tally.votes.get(pid)
+                if target is not None:
+                    votes += 1
+                    correct += target == gs.liar_pid
+        STATS.add_round(info.name, role, liar_team == (role != "citizen"), deltas.get(pid, 0),
+                        result["liar_guessed_correct"] if role == "liar" and result["liar_selected"] else None,
+                        votes, correct)
+
+def role_channel(gs, role):
+    return "%s:%s" % (gs.code, role)
+
+def sync_role_channels(gs):
+    # 역할이 바뀐 사람만 채널을 옮긴다 (보통 라운드당 라이어/스파이 몇 명)
+    for pid, role in gs.roles.items():
+        prev = gs.role_channel.get(pid)
+        if prev == role:
+            continue
+        sid = gs.sid_of.get(pid)
+        if sid is not None:
+            # 매니저를 직접: 핸들러 밖(타이머 등)에서도, 두 서버 모드 모두에서 동기로 동작
+            if prev:
+                exit_room(sid, role_channel(gs, prev))
+            enter_room(sid, role_channel(gs, role))
+        gs.role_channel[pid] = role
+
+# ------------ Sessions (resume after disconnect) ------------
+def bind_socket(gs, pid, sid):
+    old_sid = gs.sid_of.get(pid)
+    if old_sid is not None and old_sid != sid:
+        # 이전 탭/페이지의 소켓은 이 플레이어와 끊는다 (그쪽 disconnect는 무시됨)
+        gs.pid_of_sid.pop(old_sid, None)
+    gs.sid_of[pid] = sid
+    gs.pid_of_sid[sid] = pid
+    enter_room(sid, gs.code)
+    role = gs.role_channel.get(pid)
+    if role:
+        enter_room(sid, role_channel(gs, role))
+
+def game_snapshot(gs):
+    # 너무 오래 끊겨 있던 클라이언트용: 지금 화면을 그리는 데 필요한 이벤트만 골라 한 번에
+    events = [("game_started", {"round": gs.round_num})]
+    if gs.order:
+        events.append(("hint_order", hint_order_payload(gs)))
+    if gs.timer_info:
+        events.append((gs.timer_info[0], fresh(gs, gs.timer_info[1])))
+    if gs.phase in ("vote1", "vote2"):
+        tally = current_tally(gs)
+        events.append(("open_vote", open_vote_payload(gs, gs.phase)))
+        votes = [[voter, target] for voter, target in tally.votes.items()]
+        events.append(("vote_progress", vote_progress_payload(gs, tally, votes, set(tally.votes.values()))))
+    if gs.phase == "results" and gs.last_result:
+        events.append(("round_result", gs.last_result))
+    if gs.phase == "summary" and gs.final_scores:
+        events.append(("final_scores", gs.final_scores))
+    return {"seq": gs.events.seq, "events": [[e, p] for e, p in events]}
+
+# ------------ Spectators ------------
+def spectator_snapshot(gs):
+    # 관전 화면 한 장: 공개된 것만 (역할/제시어 없음, 정답은 결과가 나온 뒤 round_result로만)
+    speaker = None
+    if gs.phase in ("hint1", "hint2") and 0 <= gs.hint_index < len(gs.order):
+        speaker = gs.order[gs.hint_index]
+    counts = []
+    if gs.phase in ("vote1", "vote2"):
+        tally = current_tally(gs)
+        counts = [[pid, tally.count(pid)] for pid in gs.players if tally.count(pid)]
+    info = gs.timer_info
+    return {
+        "room": gs.code,
+        "phase": gs.phase,
+        "round": gs.round_num,
+        "max_rounds": gs.max_rounds,
+        "players": [[pid, p.name, p.score] for pid, p in gs.players.items()],
+        "host_pid": gs.host_pid,
+        "order": gs.order,
+        "speaker": speaker,
+        "ms": max(0, info[2] - now_ms()) if info else 0,
+        "counts": counts,
+        "accused": gs.liar_pid if gs.phase == "liar_guess" else None,
+        "result": gs.last_result if gs.phase in ("results", "summary") else None,
+        "final": gs.final_scores if gs.phase == "summary" else None,
+        "watchers": WATCH.count(gs.code)
+    }
+
+def flush_spectators():
+    # SPECTATOR_HZ 틱마다: 그사이 바뀐 방만, 방마다 스냅샷 하나를 관전 채널로
+    for code in WATCH.take_dirty():
+        in_room(code, send_spectate, code)
+
+@CLUSTER.task
+def send_spectate(code, sid=None):
+    # 스냅샷은 그 방 차례에 만들고, 관전자 전원에게 퍼뜨리는 건 emit_spread가 방 밖에서
+    gs = ROOMS.get(code)
+    if gs is None:
+        return
+    if sid is not None:
+        socketio.emit("spectate", spectator_snapshot(gs), to=sid)
     else:
-        # Liar/Spy win
-        for sid, info in GS.players.items():
-            role = GS.roles.get(sid)
-            if role == "liar":
-                info["score"] += 2
-            elif role == "spy":
-                info["score"] += 1
+        emit_spread("spectate", spectator_snapshot(gs), WATCH.channel(code))
+
+@CLUSTER.task
+def watch_remote(code, sid, watching):
+    # 다른 워커에 붙은 관전자: 주인 워커의 목록에도 있어야 틱마다 이 방 스냅샷이 나간다
+    # (관전 채널 방송은 메시지 큐로 그 워커에 닿는다)
+    if not watching:
+        WATCH.leave(sid)
+    elif code in ROOMS.rooms:
+        WATCH.watch(sid, code)
+        send_spectate(code, sid)
+
+def stop_watching(sid):
+    code = WATCH.leave(sid)
+    if code is not None:
+        exit_room(sid, WATCH.channel(code))
+        if CLUSTER.shared and code not in ROOMS.rooms:
+            in_room(code, watch_remote, code, sid, False)
+
+def send_catch_up(gs, pid, sid, last_seq):
+    if gs.game_started() and pid in gs.roles:
+        socketio.emit("role_info", role_info_payload(gs, gs.roles[pid]), to=sid)
+    missed = gs.events.since(last_seq)
+    if missed is not None:
+        for event, payload in missed:
+            socketio.emit(event, fresh(gs, payload), to=sid)
+    elif gs.game_started():
+        socketio.emit("snapshot", game_snapshot(gs), to=sid)
+
+def expire_player(code, pid):
+    gs = ROOMS.get(code)
+    if gs is None:
+        return
+    gs.away_timers.pop(pid, None)
+    info = gs.players.get(pid)
+    if info is not None and info.away:
+        remove_player(gs, pid)
+
+def remove_player(gs, pid):
+    # If host leaves, drop host
+    if pid == gs.host_pid:
+        gs.host_pid = None
+    gs.players.pop(pid, None)
+    for token in [t for t, p in gs.sessions.items() if p == pid]:
+        del gs.sessions[token]
+    # Clean roles if mid-game
+    if pid in gs.roles:
+        del gs.roles[pid]
+    gs.role_channel.pop(pid, None)
+    for tally in (gs.votes1, gs.votes2):
+        tally.retract(pid)
+        tally.drop_target(pid)
+    if gs.vote_pending:
+        gs.vote_pending["votes"].pop(pid, None)
+    gs.roster.remove(pid)
+    journal("leave", gs.code, pid)
+    queue_lobby_delta(gs)
+    gs.touch()
 
 # ------------ Routes ------------
+def asset_url(name):
+    hashed = ASSETS.url_name(name)
+    if hashed is None:
+        return url_for("static", filename=name)
+    return url_for("asset", filename=hashed)
+
+def socketio_script():
+    # (src, integrity): 받아 둔 파일이 있으면 해시 이름 (integrity 없음), 없으면 CDN + SRI
+    hashed = ASSETS.url_name(SOCKETIO_CLIENT)
+    if hashed is None:
+        return SOCKETIO_CDN
+    return url_for("asset", filename=hashed), None
+
+@app.context_processor
+def inject_client_config():
+    return {"wire": WIRE_FORMAT, "asset_url": asset_url, "socketio_script": socketio_script}
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    a = ASSETS.get(filename)
+    if a is None:
+        abort(404)
+    # 이름에 내용 해시가 들어 있으니 바뀔 일이 없다: 1년 캐시
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
+    if a.etag in request.if_none_match:
+        return Response(status=304, headers=headers)
+    encoding, body = a.pick(request.accept_encodings)
+    resp = Response(body, mimetype=a.mimetype, headers=headers)
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(a.etag)
+    return resp
+
 @app.route("/")
 def index():
     name = session.get("name", "")
-    return render_template("index.html", name=name)
+    room = request.args.get("room", "") or session.get("room", "")
+    return render_template("index.html", name=name, room=room)
 
 @app.route("/join", methods=["POST"])
 def join():
+    name = request.form.get("name", "").strip()
+    code = request.form.get("room", "").strip().upper()
+    if not name:
+        return redirect(url_for("index"))
+    if code:
+        code = find_room(code)
+        if code is None:
+            return render_template("index.html", name=name, room=request.form.get("room", "").strip().upper(),
+                                   error="존재하지 않는 방 코드입니다.")
+    else:
+        code = create_room().code
+        journal("room", code)
+    session["name"] = name
+    session["room"] = code
+    # 재접속해도 같은 플레이어로 이어지도록 브라우저마다 고정 토큰
+    session.setdefault("token", secrets.token_urlsafe(16))
+    return redirect(url_for("play" if SPA_MODE else "lobby"))
+
+@app.route("/quick", methods=["POST"])
+def quick():
+    # 빠른 시작: 대기열 화면. 테이블이 잡히면 그 방 코드로 /join을 대신 눌러 준다
     name = request.form.get("name", "").strip()
     if not name:
         return redirect(url_for("index"))
     session["name"] = name
-    return redirect(url_for("lobby"))
+    session.setdefault("token", secrets.token_urlsafe(16))
+    return render_template("queue.html", name=name, token=session["token"],
+                           party=request.form.get("party", "").strip().upper(),
+                           hold=bool(request.form.get("hold")), table_size=MATCH_TABLE_SIZE)
 
 @app.route("/lobby")
 def lobby():
     if not session.get("name"):
         return redirect(url_for("index"))
-    return render_template("lobby.html", name=session["name"])
+    return render_template("lobby.html", name=session["name"], room=session.get("room", ""),
+                           token=session.get("token", ""))
 
 @app.route("/game")
 def game():
     if not session.get("name"):
         return redirect(url_for("index"))
-    return render_template("game.html", name=session["name"])
+    return render_template("game.html", name=session["name"], room=session.get("room", ""),
+                           token=session.get("token", ""))
+
+@app.route("/watch/<code>")
+def watch(code):
+    # 관전 페이지: 이름/토큰 없이 방 코드만 (플레이어로 등록되지 않는다)
+    room = find_room(code)
+    if room is None:
+        return render_template("index.html", room=code.upper(), error="존재하지 않는 방 코드입니다.")
+    return render_template("watch.html", room=room)
+
+@app.route("/play")
+def play():
+    # 한 페이지 모드: 로비와 게임 화면을 한 번에 내려주고 소켓 하나로 끝까지
+    if not session.get("name"):
+        return redirect(url_for("index"))
+    return render_template("play.html", name=session["name"], room=session.get("room", ""),
+                           token=session.get("token", ""))
 
 # ------------ Socket.IO ------------
+# 소켓 핸들러는 보낸 사람이 어느 방인지만 찾아 그 방 우편함에 넣는다. 방 상태를 만지는 실제 처리는
+# 전부 (gs, pid, sid, data)를 받는 함수로, request 컨텍스트 없이 그 방 차례에 돈다.
+ROOM_EVENTS = {}  # event -> (fn, host) — host: 호스트 전용이면 True 또는 거절 메시지
+
+def room_event(event, host=False):
+    def decorator(fn):
+        ROOM_EVENTS[event] = (fn, host)
+
+        def handler(data=None):
+            dispatch(request.sid, event, data)
+        handler.__name__ = "on_" + event
+        socketio.on(event)(handler)
+        return fn
+    return decorator
+
+def dispatch(sid, event, data=None):
+    code = ROOMS.code_by_sid.get(sid)
+    if code is None:
+        deny(sid, ROOM_EVENTS[event][1])
+        return
+    in_room(code, run_room_event, code, sid, event, data)
+
+def deny(sid, host):
+    if isinstance(host, str):
+        socketio.emit("error", {"message": host}, to=sid)
+
+@CLUSTER.task
+def run_room_event(code, sid, event, data):
+    gs = ROOMS.get(code)
+    if gs is None:
+        return
+    gs.touch()
+    fn, host = ROOM_EVENTS[event]
+    pid = gs.pid_of_sid.get(sid)
+    if host and (pid is None or pid != gs.host_pid):
+        deny(sid, host)
+        return
+    fn(gs, pid, sid, data or {})
+
 @socketio.on("connect")
 def on_connect():
-    join_room(ROOM)
+    ensure_background_tasks()
     emit("connected", {"message": "connected"})
 
 @socketio.on("register")
 def on_register(data):
+    register(request.sid, data)
+
+def register(sid, data):
     name = data.get("name", "").strip()
-    sid = request.sid
     if not name:
-        emit("error", {"message": "이름이 필요합니다."})
+        socketio.emit("error", {"message": "이름이 필요합니다."}, to=sid)
         return
-    # If already exists with this sid, update name; else create
-    GS.players[sid] = {"name": name, "score": 0, "is_host": (GS.host_sid == sid)}
-    GS.sid_by_name[name] = sid
-    broadcast_lobby_state()
-
-@socketio.on("disconnect")
-def on_disconnect():
-    sid = request.sid
-    # If host leaves, drop host
-    if sid == GS.host_sid:
-        GS.host_sid = None
-    if sid in GS.players:
-        del GS.players[sid]
-    # Clean roles if mid-game
-    if sid in GS.roles:
-        del GS.roles[sid]
-    broadcast_lobby_state()
+    code = find_room(data.get("room"))
+    if code is None:
+        socketio.emit("error", {"message": "방을 찾을 수 없습니다."}, to=sid)
+        return
+    ROOMS.bind(sid, code)
+    stop_watching(sid)
+    in_room(code, seat_player, code, sid, name, data)
 
-@socketio.on("claim_host")
-def on_claim_host(data):
-    code = str(data.get("code", "")).strip()
-    sid = request.sid
-    if code == HOST_CODE:
-        GS.host_sid = sid
-        # update host flags
-        for s, info in GS.players.items():
-            info["is_host"] = (s == GS.host_sid)
-        emit("host_granted", {"ok": True, "host_sid": sid, "host_name": GS.players[sid]["name"]}, to=sid)
-        broadcast_lobby_state()
+@CLUSTER.task
+def seat_player(code, sid, name, data):
+    gs = ROOMS.get(code)
+    # 차례가 오기 전에 다른 방으로 옮겼다 (다른 워커의 소켓이면 역인덱스가 그쪽에 있다).
+    # 그사이 끊긴 경우는 뒤따르는 mark_away가 자리 비움으로 돌린다
+    if gs is None or ROOMS.code_by_sid.get(sid, code) != code:
+        return
+    gs.touch()
+    token = str(data.get("token") or "") or secrets.token_urlsafe(16)
+    pid = gs.sessions.get(token)
+    resumed = pid in gs.players
+    if resumed:
+        # 유예 시간 안에 돌아온 플레이어: 점수/역할/호스트 그대로 이어서
+        SCHED.cancel(gs.away_timers.pop(pid, None))
+        gs.players[pid].away = False
+        gs.players[pid].name = name
     else:
-        emit("host_granted", {"ok": False, "message": "호스트 코드가 올바르지 않습니다."}, to=sid)
+        pid = gs.new_pid()
+        gs.sessions[token] = pid
+        gs.players[pid] = Player(name)
+    journal("join", gs.code, pid, name, token)
+    bind_socket(gs, pid, sid)
+    socketio.emit("session", {"pid": pid, "token": token, "resumed": resumed}, to=sid)
+    gs.roster.add(pid, name)
+    send_lobby_snapshot(gs, sid)
+    queue_lobby_delta(gs)
+    last_seq = data.get("last_seq")
+    send_catch_up(gs, pid, sid, int(last_seq) if last_seq is not None else None)
+    if gs.match is not None:
+        seat_matched(gs, pid, sid, token)
 
-@socketio.on("start_game")
-def on_start_game():
-    sid = request.sid
-    if sid != GS.host_sid:
-        emit("error", {"message": "호스트만 시작할 수 있습니다."}, to=sid)
-        return
-    ok, msg = choose_roles_and_topic()
-    if not ok:
-        emit("error", {"message": msg}, to=sid)
-        return
-    GS.round_num = 1
-    GS.phase = "hint1"
-    order = speaking_order()
-
-    # send private role info
-    for target_sid, info in GS.players.items():
-        role = GS.roles.get(target_sid)
-        if role == "liar":
-            socketio.emit("role_info", {
-                "role": "라이어",
-                "topic": GS.category,
-                "keyword": None
-            }, to=target_sid)
-        elif role == "spy":
-            socketio.emit("role_info", {
-                "role": "스파이",
-                "topic": GS.category,
-                "keyword": GS.secret_word
-            }, to=target_sid)
-        else:
-            socketio.emit("role_info", {
-                "role": "시민",
-                "topic": GS.category,
-                "keyword": GS.secret_word
-            }, to=target_sid)
-
-    # tell everyone to move to /game
-    socketio.emit("game_started", {"round": GS.round_num})
-    # initial hint order
-    socketio.emit("hint_order", {
-        "order": [{"sid": s, "name": GS.players[s]["name"]} for s in order],
-        "phase": GS.phase,
-        "round": GS.round_num
-    }, to=ROOM)
-
-@socketio.on("hint_next")
-def on_hint_next(data):
-    # host advances to next speaker index
+@socketio.on("watch")
+def on_watch(data):
     sid = request.sid
-    if sid != GS.host_sid:
-        return
-    idx = int(data.get("index", 0))
-    if not GS.order:
+    code = find_room((data or {}).get("room"))
+    if code is None:
+        emit("error", {"message": "방을 찾을 수 없습니다."})
         return
-    if idx < 0 or idx >= len(GS.order):
+    if sid in ROOMS.code_by_sid:
+        emit("error", {"message": "플레이어는 같은 연결로 관전할 수 없습니다."})
         return
-    target_sid = GS.order[idx]
-    socketio.emit("hint_turn", {
-        "index": idx,
-        "sid": target_sid,
-        "name": GS.players.get(target_sid, {}).get("name"),
-        "seconds": 15
-    }, to=ROOM)
-
-@socketio.on("start_discussion")
-def on_start_discussion():
-    if request.sid != GS.host_sid:
-        return
-    GS.phase = "discussion"
-    socketio.emit("start_timer", {"label": "전체 자유토론", "seconds": 120}, to=ROOM)
+    stop_watching(sid)
+    WATCH.watch(sid, code)
+    join_room(WATCH.channel(code))
+    # 처음 한 장은 바로, 그다음부터는 틱마다
+    if code in ROOMS.rooms or not CLUSTER.shared:
+        in_room(code, send_spectate, code, sid)
+    else:
+        in_room(code, watch_remote, code, sid, True)
+
+@room_event("lobby_sync")
+def on_lobby_sync(gs, pid, sid, data):
+    # 클라이언트가 가진 버전이 최신이 아니면 스냅샷으로 맞춰준다
+    if data.get("version") != gs.roster.version:
+        send_lobby_snapshot(gs, sid)
+
+@socketio.on("disconnect")
+def on_disconnect(reason=None):
+    disconnect(request.sid)
 
-@socketio.on("start_vote1")
-def on_start_vote1():
-    if request.sid != GS.host_sid:
+def disconnect(sid):
+    stop_watching(sid)
+    if LIMITER is not None:
+        LIMITER.forget(sid)
+    send_queue_state(MATCH.leave(sid))
+    code = ROOMS.code_by_sid.get(sid)
+    ROOMS.leave(sid)
+    if code is not None:
+        in_room(code, mark_away, code, sid)
+
+@CLUSTER.task
+def mark_away(code, sid):
+    gs = ROOMS.get(code)
+    if gs is None:
         return
-    GS.phase = "vote1"
-    socketio.emit("open_vote", {
-        "phase": "vote1",
-        "players": [{"sid": s, "name": info["name"]} for s, info in GS.players.items()]
-    }, to=ROOM)
-
-@socketio.on("start_hint2")
-def on_start_hint2():
-    if request.sid != GS.host_sid:
+    pid = gs.pid_of_sid.pop(sid, None)
+    if pid is None or gs.sid_of.get(pid) != sid:
         return
-    GS.phase = "hint2"
-    order = speaking_order()
-    socketio.emit("hint_order", {
-        "order": [{"sid": s, "name": GS.players[s]["name"]} for s in order],
-        "phase": GS.phase,
-        "round": GS.round_num
-    }, to=ROOM)
-
-@socketio.on("cast_vote")
-def on_cast_vote(data):
-    voter = request.sid
-    target = data.get("target_sid")
-    phase = GS.phase
-    if phase not in ["vote1", "vote2"]:
+    # 바로 지우지 않고 '자리 비움'으로 표시, 유예 시간이 지나도 안 돌아오면 정리
+    del gs.sid_of[pid]
+    gs.players[pid].away = True
+    gs.away_timers[pid] = SCHED.call_later(RECONNECT_GRACE, in_room, gs.code, expire_player, gs.code, pid)
+
+@room_event("claim_host")
+def on_claim_host(gs, pid, sid, data):
+    if pid is None:
         return
-    if target not in GS.players:
+    code = str(data.get("code", "")).strip()
+    if code == HOST_CODE:
+        grant_host(gs, pid, sid)
+    else:
+        socketio.emit("host_granted", {"ok": False, "message": "호스트 코드가 올바르지 않습니다."}, to=sid)
+
+def grant_host(gs, pid, sid):
+    # update host flags (이전 호스트와 새 호스트만)
+    if gs.host_pid in gs.players:
+        gs.players[gs.host_pid].is_host = False
+    gs.host_pid = pid
+    gs.players[pid].is_host = True
+    journal("host", gs.code, pid)
+    socketio.emit("host_granted", {"ok": True, "host_pid": pid, "host_name": gs.players[pid].name}, to=sid)
+    gs.roster.set_host(pid)
+    queue_lobby_delta(gs)
+
+@room_event("start_game", host="호스트만 시작할 수 있습니다.")
+def on_start_game(gs, pid, sid, data):
+    start_game(gs, sid)
+
+def start_game(gs, sender):
+    events = ENGINE.start(gs)
+    if gs.game_started():
+        gs.match = None
+    send(gs, events, sender)
+
+@room_event("hint_next", host=True)
+def on_hint_next(gs, pid, sid, data):
+    # host advances to next speaker index
+    idx = int(data.get("index", 0))
+    if idx < 0 or idx >= len(gs.order):
         return
-    if target == voter:
-        emit("error", {"message": "자기 자신에게는 투표할 수 없습니다."}, to=voter)
+    send(gs, ENGINE.next_hint(gs, idx))
+
+# 단계 확인은 엔진이 한다 (늦게/두 번 누른 호스트 버튼은 빈 이벤트 목록)
+@room_event("start_discussion", host=True)
+def on_start_discussion(gs, pid, sid, data):
+    send(gs, ENGINE.start_discussion(gs))
+
+@room_event("start_vote1", host=True)
+def on_start_vote1(gs, pid, sid, data):
+    send(gs, ENGINE.open_vote(gs, Phase.VOTE1))
+
+@room_event("start_hint2", host=True)
+def on_start_hint2(gs, pid, sid, data):
+    send(gs, ENGINE.start_hint2(gs))
+
+@room_event("cast_vote")
+def on_cast_vote(gs, voter, sid, data):
+    if voter is None:
         return
-    if phase == "vote1":
-        GS.votes1[voter] = target
-        socketio.emit("vote_update", {"phase": "vote1", "voter": GS.players[voter]["name"], "target": GS.players[target]["name"]}, to=ROOM)
-    else:
-        GS.votes2[voter] = target
-        socketio.emit("vote_update", {"phase": "vote2", "voter": GS.players[voter]["name"], "target": GS.players[target]["name"]}, to=ROOM)
+    send(gs, ENGINE.cast_vote(gs, voter, data.get("target")), sid)
+
+@room_event("close_vote1", host=True)
+def on_close_vote1(gs, pid, sid, data):
+    send(gs, ENGINE.close_vote(gs, Phase.VOTE1))
+
+@room_event("start_vote2", host=True)
+def on_start_vote2(gs, pid, sid, data):
+    send(gs, ENGINE.open_vote(gs, Phase.VOTE2))
+
+@room_event("close_vote2", host=True)
+def on_close_vote2(gs, pid, sid, data):
+    # 동률이면 그중 무작위 (liar/engine.py pick_accused)
+    send(gs, ENGINE.close_vote(gs, Phase.VOTE2))
+
+@room_event("liar_guess")
+def on_liar_guess(gs, pid, sid, data):
+    # only liar can send this
+    send(gs, ENGINE.guess(gs, pid, str(data.get("guess", "")).strip()))
+
+@room_event("next_round", host=True)
+def on_next_round(gs, pid, sid, data):
+    # 결과 화면에서만. 이미 끝난 게임(요약)에서 다시 눌러도 전적을 또 쌓지 않는다
+    send(gs, ENGINE.next_round(gs), sid)
+
+# ------------ Quick play (matchmaking) ------------
+@socketio.on("queue")
+def on_queue(data):
+    join_queue(request.sid, data or {})
 
-@socketio.on("close_vote1")
-def on_close_vote1():
-    if request.sid != GS.host_sid:
+def join_queue(sid, data):
+    name = str(data.get("name", "")).strip()
+    if not name:
+        socketio.emit("error", {"message": "이름이 필요합니다."}, to=sid)
         return
-    tally = vote_tally(GS.votes1)
-    tops, maxv = top_candidates(tally)
-    socketio.emit("vote_closed", {
-        "phase": "vote1",
-        "tally": {GS.players[sid]["name"]: cnt for sid, cnt in tally.items()},
-        "top": [GS.players[sid]["name"] for sid in tops],
-        "max": maxv
-    }, to=ROOM)
-
-@socketio.on("start_vote2")
-def on_start_vote2():
-    if request.sid != GS.host_sid:
+    if sid in ROOMS.code_by_sid:
+        socketio.emit("error", {"message": "이미 방에 들어가 있습니다."}, to=sid)
         return
-    GS.phase = "vote2"
-    socketio.emit("open_vote", {
-        "phase": "vote2",
-        "players": [{"sid": s, "name": info["name"]} for s, info in GS.players.items()]
-    }, to=ROOM)
-
-@socketio.on("close_vote2")
-def on_close_vote2():
-    if request.sid != GS.host_sid:
+    send_queue_state(MATCH.leave(sid))
+    party = str(data.get("party") or "").strip().upper() or None
+    ticket = MATCH.join(sid, name, str(data.get("token") or ""), party, bool(data.get("hold")))
+    if ticket is None:
+        socketio.emit("error", {"message": "파티를 찾을 수 없거나 이미 매칭을 시작했습니다."}, to=sid)
         return
-    tally2 = vote_tally(GS.votes2)
-    tops2, maxv2 = top_candidates(tally2)
-    socketio.emit("vote_closed", {
-        "phase": "vote2",
-        "tally": {GS.players[sid]["name"]: cnt for sid, cnt in tally2.items()},
-        "top": [GS.players[sid]["name"] for sid in tops2],
-        "max": maxv2
-    }, to=ROOM)
-
-    # Decide accused: if tie persists, pick randomly among tops2
-    if not tops2:
-        accused_sid = None
-    elif len(tops2) == 1:
-        accused_sid = tops2[0]
-    else:
-        accused_sid = random.choice(tops2)
-
-    if accused_sid and accused_sid == GS.liar_sid:
-        # liar selected -> allow liar to guess
-        GS.phase = "liar_guess"
-        liar_name = GS.players[GS.liar_sid]["name"]
-        socketio.emit("liar_selected", {
-            "liar_name": liar_name,
-            "seconds": 30,
-            "category": GS.category
-        }, to=ROOM)
-    else:
-        # liar not selected => liar team wins immediately
-        result = {
-            "winner": "liar_team",
-            "liar_selected": False,
-            "liar_guessed_correct": None,
-            "secret_word": GS.secret_word,
-            "category": GS.category,
-            "accused": GS.players[accused_sid]["name"] if accused_sid else None
-        }
-        apply_scores(result)
-        GS.last_result = result
-        GS.phase = "results"
-        socketio.emit("round_result", result, to=ROOM)
-
-@socketio.on("liar_guess")
-def on_liar_guess(data):
-    # only liar can send this
-    sid = request.sid
-    if sid != GS.liar_sid:
+    send_queue_state(ticket)
+
+@socketio.on("queue_ready")
+def on_queue_ready(data=None):
+    send_queue_state(MATCH.ready(request.sid))
+
+@socketio.on("queue_leave")
+def on_queue_leave(data=None):
+    send_queue_state(MATCH.leave(request.sid))
+
+def send_queue_state(ticket):
+    # 파티원 모두에게 (최대 한 테이블 인원)
+    if ticket is None:
         return
-    guess = str(data.get("guess", "")).strip()
-    correct = (guess == GS.secret_word)
-    if correct:
-        winner = "liar_team"
-    else:
-        winner = "citizens"
-    result = {
-        "winner": winner,
-        "liar_selected": True,
-        "liar_guessed_correct": correct,
-        "secret_word": GS.secret_word,
-        "category": GS.category,
-        "accused": GS.players[GS.liar_sid]["name"]
-    }
-    apply_scores(result)
-    GS.last_result = result
-    GS.phase = "results"
-    socketio.emit("round_result", result, to=ROOM)
-
-@socketio.on("next_round")
-def on_next_round():
-    if request.sid != GS.host_sid:
+    state = MATCH.position(ticket)
+    for i, (sid, _, _) in enumerate(ticket.members):
+        state["leader"] = i == 0
+        socketio.emit("queue_state", state, to=sid)
+
+def seat_matches():
+    # MATCH_INTERVAL마다: 대기열에서 만들 수 있는 테이블을 모두 만들고 각자에게 방 코드를 보낸다
+    for seats in MATCH.pack():
+        gs = create_room()
+        journal("room", gs.code)
+        # 호스트는 서버가 정한다: 가장 오래 기다린 티켓의 (파티장) 첫 사람
+        gs.match = {"tokens": set(token for _, _, token in seats), "host": seats[0][2]}
+        SCHED.call_later(MATCH_START_SECONDS, in_room, gs.code, auto_start, gs.code)
+        for sid, _, _ in seats:
+            socketio.emit("matched", {"room": gs.code}, to=sid)
+
+def seat_matched(gs, pid, sid, token):
+    # 매칭된 방에 앉음: 정해진 호스트면 호스트로, 예정된 사람이 다 앉았으면 바로 시작
+    if token == gs.match["host"]:
+        grant_host(gs, pid, sid)
+    if all(gs.sessions.get(t) in gs.sid_of for t in gs.match["tokens"]):
+        auto_start(gs.code)
+
+def auto_start(code):
+    gs = ROOMS.get(code)
+    if gs is None or gs.match is None or gs.phase != "lobby":
         return
-    if GS.round_num >= GS.max_rounds:
-        # game over -> summary
-        GS.phase = "summary"
-        scoreboard = [{"name": info["name"], "score": info["score"]} for _, info in GS.players.items()]
-        scoreboard.sort(key=lambda x: (-x["score"], x["name"]))
-        socketio.emit("final_scores", {"scores": scoreboard}, to=ROOM)
+    gs.match = None
+    if gs.host_pid not in gs.sid_of:
+        # 정해진 호스트가 안 왔다: 먼저 앉은 사람
+        present = sorted(gs.sid_of)
+        if not present:
+            return
+        grant_host(gs, present[0], gs.sid_of[present[0]])
+    start_game(gs, gs.code)
+
+# ------------ Metrics ------------
+def connected_sockets():
+    return len(socketio.server.manager.rooms.get("/", {}).get(None, ()))
+
+def players_by_phase():
+    out = {}
+    for gs in ROOMS.rooms.values():
+        out[gs.phase] = out.get(gs.phase, 0) + len(gs.players)
+    return out
+
+if METRICS is not None:
+    # 위에서 등록한 모든 @socketio.on 핸들러와 패킷 전송을 감싼다
+    METRICS.instrument(socketio.server)
+# 제한은 계측 바깥에: 버려진 명령/메시지는 핸들러 지연이나 전송 카운터에 잡히지 않는다
+if LIMITER is not None:
+    LIMITER.instrument(socketio.server)
+OUTBOX.install(socketio.server)
+
+if METRICS is not None:
+    METRICS.gauge("connected_sockets", "Connected Socket.IO clients.", connected_sockets)
+    METRICS.gauge("rooms", "Live rooms.", lambda: len(ROOMS))
+    METRICS.gauge("players", "Seated players per phase.", players_by_phase, label="phase")
+    METRICS.gauge("spectators", "Sockets watching a table.", lambda: len(WATCH))
+    if LIMITER is not None:
+        METRICS.counter("throttled_total", "Client events dropped by the per-socket rate limit.",
+                        lambda: LIMITER.throttled, label="event")
+    METRICS.counter("outbox_dropped_total", "Outgoing messages dropped for slow consumers.",
+                    lambda: OUTBOX.dropped, label="event")
+    METRICS.counter("outbox_kicked_total", "Sockets disconnected for an overflowing send queue.",
+                    lambda: OUTBOX.kicked)
+    METRICS.gauge("outbox_queued", "Packets waiting in per-socket send queues.",
+                  lambda: sum(s.queue.qsize() for s in list(socketio.server.eio.sockets.values())))
+    METRICS.gauge("timers_pending", "Timers waiting in the scheduler.", lambda: len(SCHED))
+    METRICS.counter("room_messages_total", "Work items run through per-room mailboxes.", lambda: ACTORS.processed)
+    METRICS.counter("room_messages_deferred_total", "Work items that waited behind another one in the same room.",
+                    lambda: ACTORS.deferred)
+    METRICS.counter("room_errors_total", "Work items that raised inside a room mailbox.", lambda: ACTORS.errors)
+    METRICS.gauge("match_waiting", "Players waiting in the quick-play queue.", lambda: MATCH.waiting)
+    METRICS.counter("match_tables_total", "Tables formed by the quick-play queue.", lambda: MATCH.tables)
+    METRICS.counter("match_players_total", "Players seated by the quick-play queue.", lambda: MATCH.matched)
+    if CLUSTER.shared:
+        METRICS.gauge("rooms_owned", "Rooms this worker owns in the shared store.", lambda: len(CLUSTER.owned))
+        METRICS.counter("cluster_forwarded_total", "Room work items sent to the owning worker.",
+                        lambda: CLUSTER.forwarded)
+        METRICS.counter("cluster_received_total", "Room work items received from other workers.",
+                        lambda: CLUSTER.received)
+        METRICS.counter("cluster_owner_lookups_total", "Room owner lookups by cache result.",
+                        lambda: {"hit": CLUSTER.cache_hits, "miss": CLUSTER.cache_misses}, label="cache")
+        METRICS.counter("cluster_adopted_total", "Rooms taken over from a worker that went away.",
+                        lambda: CLUSTER.adopted)
+        METRICS.counter("cluster_lost_total", "Rooms dropped because another worker took over their lease.",
+                        lambda: CLUSTER.lost)
+    if STATS is not None:
+        METRICS.gauge("stats_pending", "Finished round/game records waiting for the stats database.",
+                      lambda: len(STATS.pending))
+        METRICS.counter("stats_written_total", "Round/game records written to the stats database.", lambda: STATS.written)
+        METRICS.counter("leaderboard_cache_total", "Leaderboard requests by cache result.",
+                        lambda: {"hit": STATS.cache_hits, "miss": STATS.cache_misses}, label="cache")
+    if JOURNAL is not None:
+        METRICS.gauge("journal_pending", "Journal records not yet committed.", lambda: len(JOURNAL.pending))
+        METRICS.counter("journal_failures_total", "Journal writes or snapshots that failed on disk.",
+                        lambda: JOURNAL.failures)
+
+@app.route("/leaderboard")
+def leaderboard():
+    # ?by=points|wins|games&limit=10 (최대 100). 게임이 하나 끝나 기록될 때까지는 캐시에서
+    if STATS is None:
+        abort(404)
+    by = request.args.get("by", "points")
+    if by not in BOARDS:
+        return jsonify({"error": "by must be one of: " + ", ".join(sorted(BOARDS))}), 400
+    limit = request.args.get("limit", 10, type=int)
+    return jsonify({"by": by, "players": STATS.leaderboard(by, limit)})
+
+@app.route("/players/<name>/stats")
+def player_stats(name):
+    if STATS is None:
+        abort(404)
+    row = STATS.player(name.strip())
+    if row is None:
+        abort(404)
+    return jsonify(row)
+
+@app.route("/metrics")
+def metrics():
+    if METRICS is None:
+        return Response("metrics disabled\n", status=404, mimetype="text/plain")
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+# ------------ Recovery ------------
+def resume_phase(gs):
+    # 복구 직후: 진행 중이던 단계의 타이머를 처음부터 다시 건다
+    send(gs, ENGINE.resume(gs))
+
+def restart_room(gs):
+    # 소켓이 없는 자리는 '자리 비움'으로 시작: 유예 시간 안에 다시 붙으면 이어서, 아니면 정리
+    for pid in gs.players:
+        if pid in gs.sid_of:
+            continue
+        gs.players[pid].away = True
+        gs.away_timers[pid] = SCHED.call_later(RECONNECT_GRACE, in_room, gs.code, expire_player, gs.code, pid)
+    resume_phase(gs)
+
+def recover_rooms():
+    t0 = time.perf_counter()
+    recovered = recover(JOURNAL, ROOMS)
+    for gs in recovered:
+        CLUSTER.claim(gs.code)
+        restart_room(gs)
+    if recovered:
+        app.logger.info("recovered %d rooms in %.1fms", len(recovered), (time.perf_counter() - t0) * 1000)
+
+def adopt_room(doc):
+    # 주인 워커가 사라진 방을 저장소의 마지막 문서로 이어받는다 (저널 복구와 같은 모양)
+    gs = load_room(doc)
+    settle_room(gs)
+    for pid, sid in doc.get("remote", ()):
+        if pid in gs.players:
+            gs.sid_of[pid] = sid
+            gs.pid_of_sid[sid] = pid
+            gs.players[pid].away = False
+    ROOMS.rooms[gs.code] = gs
+    restart_room(gs)
+
+def evict_room(code):
+    # 이 워커가 멈춘 사이 다른 워커가 이어받은 방: 로컬 사본과 타이머를 버린다.
+    # 여기 붙은 소켓의 이벤트는 in_room이 새 주인에게 넘긴다 (이어받은 워커는 문서의 remote로 자리를 유지)
+    gs = ROOMS.rooms.pop(code, None)
+    if gs is None:
         return
+    cancel_phase_timer(gs)
+    drop_vote_progress(gs)
+    SCHED.cancel(gs.lobby_flush)
+    gs.lobby_flush = None
+    for timer in gs.away_timers.values():
+        SCHED.cancel(timer)
+    gs.away_timers.clear()
 
-    # Start next round
-    reset_round()
-    GS.round_num += 1
-    choose_roles_and_topic()
-    GS.phase = "hint1"
-    order = speaking_order()
-
-    for target_sid, info in GS.players.items():
-        role = GS.roles.get(target_sid)
-        if role == "liar":
-            socketio.emit("role_info", {
-                "role": "라이어",
-                "topic": GS.category,
-                "keyword": None
-            }, to=target_sid)
-        elif role == "spy":
-            socketio.emit("role_info", {
-                "role": "스파이",
-                "topic": GS.category,
-                "keyword": GS.secret_word
-            }, to=target_sid)
-        else:
-            socketio.emit("role_info", {
-                "role": "시민",
-                "topic": GS.category,
-                "keyword": GS.secret_word
-            }, to=target_sid)
-
-    socketio.emit("game_started", {"round": GS.round_num})
-    socketio.emit("hint_order", {
-        "order": [{"sid": s, "name": GS.players[s]["name"]} for s in order],
-        "phase": GS.phase,
-        "round": GS.round_num
-    }, to=ROOM)
+CLUSTER.deliver = deliver
+CLUSTER.adopt = adopt_room
+CLUSTER.evict = evict_room
+
+if JOURNAL is not None:
+    recover_rooms()
+if CLUSTER.shared:
+    # 다른 워커가 넘기는 방 작업은 첫 접속 전에도 받아야 한다
+    ensure_background_tasks()
 
 # ------------ Main ------------
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "10000"))
-    # Using eventlet web server for websockets on Render
-    socketio.run(app, host="0.0.0.0", port=port)
+    # eventlet 웹서버 (Render), ASYNC_MODE=asgi면 uvicorn
+    if ASYNC_MODE == "asgi":
+        socketio.run(app, host="0.0.0.0", port=port)
+    else:
+        socketio.run(app, host="0.0.0.0", port=port, max_size=MAX_CONNECTIONS)
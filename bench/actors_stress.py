@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""방 우편함(liar/actors.py) 스트레스: 여러 방에 표, 끊김/재접속, 단계 전환을 OS 스레드 여러 개로 섞어 던지고
+방 상태 불변식을 확인한다. 우편함 켬(ROOM_ACTORS=1)과 끔(바로 실행)을 각각 새 프로세스에서 돌려 비교.
+
+서버 모드와 무관하게 app.py의 소켓 이벤트 입구(register / dispatch / disconnect)를 소켓 없이 직접 부른다.
+가짜 클라이언트는 Socket.IO 매니저에 sid만 등록해 둔다 (보내는 패킷은 받을 소켓이 없어 버려진다).
+타이머는 전부 0초(HINT/DISCUSSION/GUESS, 재접속 유예)라 타이머 스레드도 계속 방 상태를 바꾼다.
+스레드 전환 간격을 아주 짧게 잡아(sys.setswitchinterval) 핸들러 도중에 끼어들 기회를 늘린다.
+
+확인하는 불변식 (검사도 그 방 차례에 돈다):
+  roles / 투표자 / 투표 대상 / 대기 중인 표 ⊆ players, host_pid ∈ players,
+  sid_of ↔ pid_of_sid 서로 역, 로비 명단 = players, 집계(counts/by_count/top)가 표와 일치
+
+    python bench/actors_stress.py --rooms 200 --threads 8 --seconds 5 --out bench_actors.json
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["JOURNAL_DIR"] = ""
+os.environ["STATS_DB"] = ""
+os.environ["RATE_LIMIT"] = "0"
+os.environ["METRICS"] = "0"
+for _name in ("HINT_SECONDS", "DISCUSSION_SECONDS", "GUESS_SECONDS", "RECONNECT_GRACE"):
+    os.environ[_name] = "0"
+os.environ["VOTE_FLUSH_MS"] = "5"
+os.environ["LOBBY_FLUSH_MS"] = "5"
+
+import app as A  # noqa: E402
+
+HOST_EVENTS = ("start_game", "hint_next", "start_discussion", "start_vote1", "close_vote1",
+               "start_hint2", "start_vote2", "close_vote2", "next_round")
+
+
+def check_room(gs):
+    bad = []
+    players = set(gs.players)
+    if not set(gs.roles) <= players:
+        bad.append("roles")
+    if gs.host_pid is not None and gs.host_pid not in players:
+        bad.append("host")
+    for name, tally in (("votes1", gs.votes1), ("votes2", gs.votes2)):
+        if not set(tally.votes) <= players or not set(tally.votes.values()) <= players:
+            bad.append(name + "_members")
+        counts = {}
+        for target in tally.votes.values():
+            counts[target] = counts.get(target, 0) + 1
+        by_count = {}
+        for target, n in counts.items():
+            by_count.setdefault(n, set()).add(target)
+        if counts != tally.counts or by_count != tally.by_count or max(counts.values() or [0]) != tally.top:
+            bad.append(name + "_tally")
+    if not set(gs.vote_pending.get("votes", ())) <= players:
+        bad.append("vote_pending")
+    if any(gs.pid_of_sid.get(sid) != pid for pid, sid in gs.sid_of.items()) or not set(gs.sid_of) <= players:
+        bad.append("sessions")
+    if set(gs.roster.by_pid) != players:
+        bad.append("roster")
+    return bad
+
+
+class Stress:
+    def __init__(self, args):
+        self.args = args
+        self.rooms = []  # [(code, [[sid, token]])] — 첫 자리가 호스트
+        self.violations = {}
+        self.checks = 0
+        self.sent = 0
+        self.stop = threading.Event()
+        self.serial = 0
+        self.serial_lock = threading.Lock()
+
+    def new_sid(self):
+        # 연결 수락은 실제 서버처럼 한 번에 하나씩 (끊긴 sid는 매니저에 남겨 둔다: 보낼 곳 없는 패킷만 생김)
+        with self.serial_lock:
+            self.serial += 1
+            return A.socketio.server.manager.connect("e%d" % self.serial, "/")
+
+    def setup(self):
+        for r in range(self.args.rooms):
+            gs = A.ROOMS.create()
+            seats = []
+            for i in range(self.args.players):
+                sid = self.new_sid()
+                token = "t%d-%d" % (r, i)
+                A.register(sid, {"name": "p%d" % i, "room": gs.code, "token": token})
+                seats.append([sid, token])
+            A.dispatch(seats[0][0], "claim_host", {"code": A.HOST_CODE})
+            self.rooms.append((gs.code, seats))
+
+    def check(self, code):
+        gs = A.ROOMS.get(code)
+        if gs is None:
+            return
+        try:
+            bad = check_room(gs)
+        except Exception as e:  # 검사 도중 dict가 바뀜 (우편함 없이 돌 때)
+            bad = [type(e).__name__]
+        for kind in bad:
+            self.violations[kind] = self.violations.get(kind, 0) + 1
+        self.checks += 1
+
+    def act(self, rng):
+        code, seats = rng.choice(self.rooms)
+        seat = rng.choice(seats)
+        gs = A.ROOMS.get(code)
+        roll = rng.random()
+        if roll < 0.45:
+            target = rng.randint(1, gs.next_pid) if gs is not None and gs.next_pid else 1
+            A.dispatch(seat[0], "cast_vote", {"target": target})
+        elif roll < 0.55:
+            # 끊겼다가 (대부분) 같은 토큰으로 재접속. 유예 0초라 타이머가 먼저 돌면 자리는 이미 정리됨
+            A.disconnect(seat[0])
+            seat[0] = self.new_sid()
+            if rng.random() < 0.8:
+                A.register(seat[0], {"name": "p%d" % seats.index(seat), "room": code, "token": seat[1]})
+        elif roll < 0.60:
+            A.dispatch(seat[0], "liar_guess", {"guess": "x"})
+        elif roll < 0.63:
+            A.dispatch(seat[0], "claim_host", {"code": A.HOST_CODE})
+        else:
+            host = seats[0] if rng.random() < 0.9 else seat
+            event = rng.choice(HOST_EVENTS)
+            A.dispatch(host[0], event, {"index": rng.randint(0, self.args.players)} if event == "hint_next" else None)
+        self.sent += 1
+
+    def worker(self, seed):
+        rng = random.Random(seed)
+        while not self.stop.is_set():
+            self.act(rng)
+
+    def timers(self):
+        while not self.stop.is_set():
+            A.SCHED.run_due()
+            time.sleep(0.001)
+
+    def checker(self):
+        rng = random.Random(self.args.seed + 1)
+        while not self.stop.is_set():
+            code = rng.choice(self.rooms)[0]
+            A.in_room(code, self.check, code)
+            time.sleep(0.0005)
+
+    def run(self):
+        self.setup()
+        before = (A.ACTORS.processed, A.ACTORS.deferred, A.ACTORS.errors)
+        threads = [threading.Thread(target=self.worker, args=(self.args.seed + i,)) for i in range(self.args.threads)]
+        threads += [threading.Thread(target=self.timers), threading.Thread(target=self.checker)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(self.args.seconds)
+        self.stop.set()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+        A.SCHED.run_due()
+        during = dict(self.violations)
+        self.violations = {}
+        for code, _ in self.rooms:
+            self.check(code)  # 조용해진 뒤 마지막 검사
+        return {
+            "room_actors": A.ROOM_ACTORS,
+            "events_sent": self.sent,
+            "events_per_sec": self.sent / wall,
+            "processed": A.ACTORS.processed - before[0],
+            "deferred": A.ACTORS.deferred - before[1],
+            "max_mailbox_depth": A.ACTORS.max_depth,
+            "handler_errors": A.ACTORS.errors - before[2],
+            "checks": self.checks,
+            "violations_during": during,
+            "violations_final": self.violations,
+        }
+
+
+def run_child(args):
+    # 우편함이 잡은 예외는 traceback으로 찍히므로, 한 번 돌 동안 모아서 종류만 센다
+    logging.getLogger("engineio.server").setLevel(logging.ERROR)  # 소켓 없는 sid로 보내는 경고
+    sys.setswitchinterval(args.switch_interval)
+    stderr, sys.stderr = sys.stderr, io.StringIO()
+    try:
+        out = Stress(args).run()
+    finally:
+        captured, sys.stderr = sys.stderr.getvalue(), stderr
+    kinds = {}
+    for line in captured.splitlines():
+        if line and not line.startswith((" ", "Traceback", "During")):
+            kinds[line[:120]] = kinds.get(line[:120], 0) + 1
+    out["error_kinds"] = dict(sorted(kinds.items(), key=lambda kv: -kv[1])[:8])
+    return out
+
+
+def run_mode(actors):
+    # 앞 실행의 타이머/방이 섞이지 않게 모드마다 새 프로세스
+    env = dict(os.environ, ROOM_ACTORS=actors)
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"] + sys.argv[1:],
+                          env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rooms", type=int, default=200)
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=5)
+    ap.add_argument("--switch-interval", type=float, default=1e-5)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args)))
+        return
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "child")}
+    report = {"config": config, "result": [run_mode("0"), run_mode("1")]}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""서버 모드 비교: eventlet (gunicorn -k eventlet) vs asgi (AsyncServer + uvicorn).
+
+모드마다 app.py를 따로 띄우고 같은 순서로 잰다.
+connect: --clients 개 소켓을 --concurrency 개씩 동시에 붙일 때 초당 연결 수와 연결 시간
+fanout : 모두 한 방에 등록한 뒤, 한 명이 표를 바꿀 때마다 나가는 vote_progress가
+         --clients 명 전원에게 도착하기까지의 시간 (--rounds 번)
+memory : 전원 연결/등록 후 서버 RSS
+
+    pip install -r bench/requirements.txt
+    python bench/backends.py --clients 200 --out bench_backends.json
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loadtest import HOST_CODE, create_room, free_port, read_rss, start_server  # noqa: E402
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+
+
+def summarize(samples):
+    return {"n": len(samples), "p50_ms": percentile(samples, 0.5) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000, "max_ms": max(samples) * 1000 if samples else 0.0}
+
+
+class Fleet:
+    def __init__(self, url, n):
+        self.url = url
+        self.cond = threading.Condition()
+        self.got = {}  # event -> 받은 횟수
+        self.arrivals = []  # vote_progress 도착 시각
+        self.pids = {}
+        self.clients = []
+        for i in range(n):
+            self.clients.append(self._make_client(i))
+
+    def _make_client(self, i):
+        sio = socketio.Client(reconnection=False)
+
+        def on_any(event, data=None):
+            now = time.perf_counter()
+            with self.cond:
+                self.got[event] = self.got.get(event, 0) + 1
+                if event == "vote_progress":
+                    self.arrivals.append(now)
+                elif event == "session":
+                    self.pids[i] = data["pid"]
+                self.cond.notify_all()
+        sio.on("*", on_any)
+        return sio
+
+    def wait(self, event, n, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.got.get(event, 0) < n:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise TimeoutError("waiting for %d x %s, got %d" % (n, event, self.got.get(event, 0)))
+                self.cond.wait(left)
+
+    def connect(self, concurrency):
+        times = []
+
+        def one(c):
+            t0 = time.perf_counter()
+            c.connect(self.url, transports=["websocket"])
+            times.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(one, self.clients))
+        wall = time.perf_counter() - t0
+        return {"clients": len(self.clients), "wall_s": wall,
+                "connects_per_sec": len(self.clients) / wall, "connect": summarize(times)}
+
+    def register(self, room):
+        for i, c in enumerate(self.clients):
+            c.emit("register", {"name": "bot%d" % i, "room": room})
+        self.wait("session", len(self.clients))
+
+    def fanout(self, rounds):
+        n = len(self.clients)
+        host, voter = self.clients[0], self.clients[1]
+        host.emit("claim_host", {"code": HOST_CODE})
+        self.wait("host_granted", 1)
+        host.emit("start_game")
+        self.wait("hint_order", n)
+        host.emit("start_vote1")
+        self.wait("open_vote", n)
+        targets = [self.pids[2], self.pids[3]]
+        per_client, all_done = [], []
+        for r in range(rounds):
+            with self.cond:
+                self.arrivals = []
+                self.got["vote_progress"] = 0
+            t0 = time.perf_counter()
+            voter.emit("cast_vote", {"target": targets[r % 2]})
+            self.wait("vote_progress", n)
+            with self.cond:
+                arrivals = list(self.arrivals)
+            per_client.extend(t - t0 for t in arrivals)
+            all_done.append(max(arrivals) - t0)
+        return {"recipients": n, "per_client": summarize(per_client), "last_recipient": summarize(all_done)}
+
+    def close(self):
+        for c in self.clients:
+            try:
+                c.disconnect()
+            except Exception:
+                pass
+
+
+def run_mode(mode, args):
+    os.environ["ASYNC_MODE"] = mode
+    os.environ["VOTE_FLUSH_MS"] = "0"  # 표 하나에 방송 하나 (묶지 않음)
+    os.environ["METRICS"] = "0"
+    port = free_port()
+    proc = start_server(port)
+    url = "http://127.0.0.1:%d" % port
+    out = {"mode": mode, "rss_idle": read_rss(proc.pid)}
+    fleet = None
+    try:
+        room = create_room(url)
+        fleet = Fleet(url, args.clients)
+        out["connect"] = fleet.connect(args.concurrency)
+        fleet.register(room)
+        out["rss_connected"] = read_rss(proc.pid)
+        out["fanout"] = fleet.fanout(args.rounds)
+        out["rss_after"] = read_rss(proc.pid)
+    finally:
+        if fleet is not None:
+            fleet.close()
+        proc.terminate()
+        proc.wait()
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=20)
+    ap.add_argument("--rounds", type=int, default=30)
+    ap.add_argument("--modes", default="eventlet,asgi")
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    report = {"config": {"clients": args.clients, "concurrency": args.concurrency, "rounds": args.rounds},
+              "modes": [run_mode(mode, args) for mode in args.modes.split(",")]}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""점수 밸런스 시뮬레이션 (서버 없이 liar/engine.py 규칙만 사용).
+
+인원수마다 --rounds 라운드를 봇 투표 정책으로 돌려서
+라이어팀 승률 (미지목 / 지목됐지만 정답), 시민 승률, 역할별·자리별 라운드당 기대 점수를 낸다.
+7인 이상은 스파이가 들어가므로 6인과 7인을 나란히 보면 스파이가 밸런스에 주는 영향이 보인다.
+--check-rules N: 서버 방 핸들러가 모는 것과 같은 Engine(liar/engine.py)으로 봇 테이블 N 라운드를
+하나씩 돌려 (힌트 → 투표 → 지목 → 정답 → 승패) 배치 결과와 승률 차이를 같이 보여 준다.
+
+    python bench/balance.py --players 5,6,7,8 --rounds 1000000
+    python bench/balance.py --policy coordinated --p-detect 0.6 --check-rules 20000 --out bench_balance.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from liar import simulate  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", default="4,5,6,7,8,10")
+    ap.add_argument("--rounds", type=int, default=1000000)
+    ap.add_argument("--policy", default="informed", choices=sorted(simulate.POLICIES))
+    ap.add_argument("--p-detect", type=float)
+    ap.add_argument("--guess", type=float)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--check-rules", type=int, default=0)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    policy = simulate.policy_for(args.policy, args.p_detect, args.guess)
+    results = []
+    for players in [int(x) for x in args.players.split(",")]:
+        t0 = time.perf_counter()
+        res = simulate.simulate(players, args.rounds, policy, args.seed)
+        res["seconds"] = time.perf_counter() - t0
+        if args.check_rules:
+            t0 = time.perf_counter()
+            step = simulate.simulate_py(players, args.check_rules, policy, args.seed)
+            res["rules"] = {
+                "rounds": step["rounds"],
+                "liar_team_win_rate": step["liar_team_win_rate"],
+                "diff": step["liar_team_win_rate"] - res["liar_team_win_rate"],
+                "stderr": step["stderr"],
+                "seconds": time.perf_counter() - t0,
+            }
+        results.append(res)
+
+    report = {"config": {"rounds": args.rounds, "policy": args.policy, "params": policy, "seed": args.seed,
+                         "numpy": simulate.np is not None},
+              "results": results}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""이벤트 폭주와 느린 클라이언트 벤치.
+
+flood : 한 클라이언트가 cast_vote를 --flood-rate 개/초로 --seconds 동안 보낼 때 (표 현황은 원래 묶어서 방송),
+        소켓별 제한(RATE_LIMIT) 끔/켬 각각 서버 CPU 시간, 다른 플레이어가 받은 vote_progress 수,
+        /metrics의 throttled_total.
+slow  : 플레이어 --slow 명이 접속만 해 두고 읽지 않을 때 (수신 버퍼 4KB, 압축 없음), 호스트가 hint_next를
+        같은 속도로 --slow-seconds 동안 보내 방 전체 방송(hint_turn)을 쏟아 내면서
+        송신 큐 상한(OUTBOX_HARD) 끔/켬 각각 서버 RSS 증가, 남은 큐 길이, outbox_dropped_total / outbox_kicked_total.
+        (서버 커널 송신 버퍼가 소켓당 수 MB까지 먼저 차므로, 큐는 그다음부터 쌓인다)
+
+클라이언트는 모두 asyncio 웹소켓으로 Engine.IO v4 텍스트 프레임을 직접 주고받는다.
+
+    pip install -r bench/requirements.txt
+    python bench/flood.py --out bench_flood.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+import urllib.request
+
+from websockets.asyncio.client import connect
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loadtest import HOST_CODE, create_room, free_port, read_rss, start_server  # noqa: E402
+
+
+class Raw:
+    # 최소 Socket.IO 클라이언트: 보낸 이벤트는 그대로, 받은 이벤트는 이름별로 센다 (읽기를 멈출 수도 있다)
+    def __init__(self, url, slow=False):
+        self.url = url.replace("http://", "ws://") + "/socket.io/?EIO=4&transport=websocket"
+        self.slow = slow
+        self.got = {}
+        self.pid = None
+        self.ws = None
+        self.reader = None
+
+    async def open(self):
+        sock = None
+        if self.slow:
+            host, port = self.url.split("/")[2].split(":")
+            sock = socket.socket()
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            sock.connect((host, int(port)))
+        # max_queue=1: 읽지 않으면 라이브러리도 곧 소켓 읽기를 멈춘다 (TCP 역압이 서버까지 그대로).
+        # 압축을 끄는 건 같은 모양의 메시지가 몇 바이트로 줄어 버퍼가 안 차기 때문
+        self.ws = await connect(self.url, sock=sock, max_queue=1 if self.slow else 64, ping_interval=None,
+                                compression=None)
+        await self.ws.recv()
+        await self.ws.send("40")
+        while not (await self.ws.recv()).startswith("40"):
+            pass
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        try:
+            async for msg in self.ws:
+                if msg == "2":
+                    await self.ws.send("3")
+                elif msg.startswith("42"):
+                    event, *args = json.loads(msg[2:])
+                    self.got[event] = self.got.get(event, 0) + 1
+                    if event == "session":
+                        self.pid = args[0]["pid"]
+                if self.slow and self.pid is not None:
+                    return  # 자리를 잡은 뒤로는 읽지 않는다
+        except Exception:
+            pass
+
+    async def emit(self, event, data=None):
+        await self.ws.send("42" + json.dumps([event] if data is None else [event, data]))
+
+    async def wait(self, event, n=1, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while self.got.get(event, 0) < n:
+            if time.monotonic() > deadline:
+                raise TimeoutError("waiting for %s" % event)
+            await asyncio.sleep(0.01)
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+        try:
+            await asyncio.wait_for(self.ws.close(), 1)
+        except Exception:
+            pass
+
+
+def cpu_seconds(pid):
+    with open("/proc/%d/stat" % pid) as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def scrape(url, names):
+    text = urllib.request.urlopen(url + "/metrics").read().decode()
+    out = {}
+    for line in text.splitlines():
+        for name in names:
+            if line.startswith("liar_" + name):
+                key, value = line.rsplit(" ", 1)
+                out[key[len("liar_"):]] = float(value)
+    return out
+
+
+async def table(url, honest, slow, vote):
+    room = create_room(url)
+    host = Raw(url)
+    players = [host] + [Raw(url) for _ in range(honest)] + [Raw(url, slow=True) for _ in range(slow)]
+    for i, p in enumerate(players):
+        await p.open()
+        await p.emit("register", {"name": "p%d" % i, "room": room})
+        await p.wait("session")
+    await host.emit("claim_host", {"code": HOST_CODE})
+    await host.wait("host_granted")
+    await host.emit("start_game")
+    if vote:
+        await host.emit("start_vote1")
+        await host.wait("open_vote")
+    else:
+        await host.wait("hint_turn")
+    return players
+
+
+async def flood(flooder, event, payloads, rate, seconds):
+    interval = 1.0 / rate
+    t_end = time.perf_counter() + seconds
+    sent = 0
+    next_at = time.perf_counter()
+    while time.perf_counter() < t_end:
+        await flooder.emit(event, payloads[sent % 2])
+        sent += 1
+        next_at += interval
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    return sent
+
+
+async def run_case(args, env, slow):
+    os.environ.update(env)
+    port = free_port()
+    proc = start_server(port)
+    url = "http://127.0.0.1:%d" % port
+    players = []
+    try:
+        players = await table(url, args.players - 1 - slow, slow, vote=not slow)
+        host, honest = players[0], players[1]
+        if slow:
+            # 1차 힌트 안에서 발언자를 번갈아 바꾼다 (단계를 넘기는 버튼은 앞 단계에서만 먹힌다)
+            event, payloads, watch = "hint_next", [{"index": 0}, {"index": 1}], "hint_turn"
+        else:
+            event, payloads, watch = "cast_vote", [{"target": players[2].pid}, {"target": players[3].pid}], "vote_progress"
+        before = honest.got.get(watch, 0)
+        rss0, cpu0 = read_rss(proc.pid), cpu_seconds(proc.pid)
+        sent = await flood(host, event, payloads, args.flood_rate, args.slow_seconds if slow else args.seconds)
+        await asyncio.sleep(1.0)
+        out = {
+            "env": env,
+            "event": event,
+            "sent": sent,
+            "server_cpu_s": cpu_seconds(proc.pid) - cpu0,
+            "honest_received": {watch: honest.got.get(watch, 0) - before},
+            "rss_before": rss0,
+            "rss_after": read_rss(proc.pid),
+            "metrics": scrape(url, ("throttled_total", "outbox_")),
+        }
+    finally:
+        for p in players:
+            await p.close()
+        proc.terminate()
+        proc.wait()
+    return out
+
+
+async def run(args):
+    base = {"VOTE_FLUSH_MS": "0", "METRICS": "1"}
+    report = {"flood": [], "slow": []}
+    for limit in ("0", "1"):
+        report["flood"].append(await run_case(args, dict(base, RATE_LIMIT=limit), 0))
+    # 느린 소켓: 폭주는 제한 없이 그대로 흘려서 송신 큐만 본다 (상한 사실상 없음 / 기본값)
+    for soft, hard in (("1000000000", "1000000000"), ("32", "256")):
+        env = dict(base, RATE_LIMIT="0", OUTBOX_SOFT=soft, OUTBOX_HARD=hard)
+        report["slow"].append(await run_case(args, env, args.slow))
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=8)
+    ap.add_argument("--slow", type=int, default=4)
+    ap.add_argument("--flood-rate", type=float, default=1000)
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--slow-seconds", type=float, default=40)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    report = {"config": {"players": args.players, "slow": args.slow, "flood_rate": args.flood_rate,
+                         "seconds": args.seconds, "slow_seconds": args.slow_seconds, "mode": os.environ.get("ASYNC_MODE", "eventlet")},
+              "result": asyncio.run(run(args))}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""저널 비용과 재시작 복구 시간 측정.
+
+overhead: cast_vote 처리 시간을 저널 끔/켬으로 비교하고, 허브를 돌리면서
+          group commit이 몇 건씩 묶여 fsync되는지 기록한다.
+recovery: --rooms 개의 방(6명, 2라운드 진행 중)을 저널로 만든 뒤
+          (a) 저널만 재생, (b) 스냅샷 + 꼬리 재생으로 복구하는 시간을 잰다.
+
+    python bench/journal_recovery.py --rooms 1000 --out bench_journal.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+WORK = tempfile.mkdtemp(prefix="liar-journal-bench-")
+os.environ["JOURNAL_DIR"] = os.path.join(WORK, "app")
+os.environ["STATS_DB"] = ""
+os.environ["RATE_LIMIT"] = "0"  # 한 클라이언트가 몰아서 보내는 벤치라 소켓별 제한은 끈다
+
+import app as server  # noqa: E402
+from app import app, socketio, HOST_CODE  # noqa: E402
+from liar.journal import Journal, dump_room, recover, replay  # noqa: E402
+from liar.rooms import RoomRegistry  # noqa: E402
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def summarize(samples):
+    return {"n": len(samples), "p50_us": percentile(samples, 0.5) * 1e6, "p99_us": percentile(samples, 0.99) * 1e6}
+
+
+# ------------ overhead ------------
+def make_table(players):
+    gs = server.ROOMS.create()
+    server.journal("room", gs.code)
+    clients = []
+    for i in range(players):
+        c = socketio.test_client(app)
+        c.emit("register", {"name": "p%d" % i, "room": gs.code, "token": "%s-%d" % (gs.code, i)})
+        clients.append(c)
+    clients[0].emit("claim_host", {"code": HOST_CODE})
+    clients[0].emit("start_game")
+    clients[0].emit("start_vote1")
+    for c in clients:
+        c.get_received()
+    pids = list(gs.players)
+    return gs, clients, pids
+
+
+def vote_round(tables, samples):
+    for gs, clients, pids in tables:
+        for i, c in enumerate(clients):
+            target = random.choice([p for j, p in enumerate(pids) if j != i])
+            t0 = time.perf_counter()
+            c.emit("cast_vote", {"target": target})
+            samples.append(time.perf_counter() - t0)
+        for c in clients:
+            c.get_received()
+        socketio.sleep(0)
+
+
+def measure_overhead(tables, rounds):
+    journal = server.JOURNAL
+    out = {}
+    for label, enabled in (("journal_off", False), ("journal_on", True)):
+        server.JOURNAL = journal if enabled else None
+        samples = []
+        for _ in range(rounds):
+            vote_round(tables, samples)
+            socketio.sleep(0.005)
+        out[label] = summarize(samples)
+    server.JOURNAL = journal
+
+    # 기록 하나를 쌓는 비용 (append만)
+    n = 100000
+    t0 = time.perf_counter()
+    for i in range(n):
+        server.journal("vote", "BENCH", "vote1", 1, 2)
+    out["append_us"] = (time.perf_counter() - t0) / n * 1e6
+    journal.pending = []
+    socketio.sleep(journal.interval * 3)
+    out["group_commit"] = journal.stats()
+    return out
+
+
+# ------------ recovery ------------
+def synth_room(rng, code, players=6):
+    pids = list(range(1, players + 1))
+    recs = [["room", code]]
+    for i, pid in enumerate(pids):
+        recs.append(["join", code, pid, "player%d" % i, "%s-t%d" % (code, i)])
+    recs.append(["host", code, pids[0]])
+    scores = {pid: 0 for pid in pids}
+    for rnd in (1, 2):
+        roles = {pid: "citizen" for pid in pids}
+        roles[rng.choice(pids)] = "liar"
+        order = rng.sample(pids, len(pids))
+        recs.append(["round", code, rnd, "음식", "김치찌개", list(roles.items()), order])
+        for idx in range(len(pids)):
+            recs.append(["phase", code, "hint1", idx])
+        recs.append(["phase", code, "discussion", len(pids) - 1])
+        recs.append(["phase", code, "vote1", len(pids) - 1])
+        for voter in pids:
+            recs.append(["vote", code, "vote1", voter, rng.choice([p for p in pids if p != voter])])
+        if rnd == 1:
+            for pid in pids:
+                scores[pid] += 1 if roles[pid] == "citizen" else 0
+            recs.append(["result", code, list(scores.items()), {"winner": "citizens"}])
+    return recs
+
+
+def measure_recovery(n_rooms, seed):
+    rng = random.Random(seed)
+    codes = ["R%05d" % i for i in range(n_rooms)]
+    per_room = [synth_room(rng, code) for code in codes]
+    out = {"rooms": n_rooms, "records": sum(len(r) for r in per_room)}
+
+    # (a) 저널만
+    path = os.path.join(WORK, "journal_only")
+    j = Journal(path)
+    for recs in per_room:
+        for rec in recs:
+            j.append(rec)
+    j.flush()
+    out["journal_bytes"] = j.bytes
+    t0 = time.perf_counter()
+    rooms = recover(Journal(path), RoomRegistry())
+    out["journal_only_ms"] = (time.perf_counter() - t0) * 1000
+    assert len(rooms) == n_rooms
+
+    # (b) 앞쪽 기록은 스냅샷으로, 마지막 투표 단계만 꼬리로 남긴다
+    path = os.path.join(WORK, "snapshot_tail")
+    j = Journal(path)
+    state, tail = {}, []
+    for recs in per_room:
+        cut = len(recs) - 7
+        replay(state, recs[:cut])
+        tail.extend(recs[cut:])
+    j.snapshot([dump_room(gs) for gs in state.values()])
+    for rec in tail:
+        j.append(rec)
+    j.flush()
+    t0 = time.perf_counter()
+    rooms = recover(Journal(path), RoomRegistry())
+    out["snapshot_tail_ms"] = (time.perf_counter() - t0) * 1000
+    out["snapshot_tail_records"] = len(tail)
+    assert len(rooms) == n_rooms
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rooms", type=int, default=1000)
+    ap.add_argument("--tables", type=int, default=20, help="overhead 측정용 테이블 수")
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    try:
+        server.ensure_background_tasks()
+        tables = [make_table(args.players) for _ in range(args.tables)]
+        report = {
+            "overhead": measure_overhead(tables, args.rounds),
+            "recovery": measure_recovery(args.rooms, args.seed),
+        }
+    finally:
+        shutil.rmtree(WORK, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
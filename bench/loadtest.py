@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""Socket.IO 부하 테스트 / 지연 측정.
+
+로컬 서버(app.py)를 띄우고 --tables 개의 테이블에 --players 명씩 가상
+클라이언트를 붙여 전체 게임(등록 → 호스트 → 3라운드 → 최종 점수)을 돌린다.
+명령을 보낸 순간부터 각 클라이언트가 결과 이벤트를 받기까지의 시간을
+이벤트 종류별 p50/p95/p99로 집계하고, 초당 메시지 수와 서버 RSS를 JSON으로 남긴다.
+
+    pip install -r bench/requirements.txt
+    python bench/loadtest.py --tables 20 --players 6 --out bench_load.json
+    python bench/loadtest.py --url http://127.0.0.1:10000   # 이미 떠 있는 서버 (gunicorn 등)
+    python bench/loadtest.py --compare old.json --out new.json  # p95 회귀 비교
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import socketio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST_CODE = os.environ.get("HOST_CODE", "9999")
+
+
+# ------------ Stats ------------
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}  # event -> [seconds]
+        self.messages = 0
+
+    def record(self, event, seconds):
+        with self.lock:
+            self.messages += 1
+            if seconds is not None:
+                self.latency.setdefault(event, []).append(seconds)
+
+    def summary(self):
+        out = {}
+        for event, samples in sorted(self.latency.items()):
+            samples.sort()
+            pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] * 1000
+            out[event] = {"n": len(samples), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+        return out
+
+
+# ------------ Simulated table ------------
+class Table:
+    def __init__(self, url, room, players, stats, timeout):
+        self.url = url
+        self.room = room
+        self.stats = stats
+        self.timeout = timeout
+        self.cond = threading.Condition()
+        self.counts = {}
+        self.last = {}
+        self.sent_at = None
+        self.clients = []
+        self.pids = {}
+        self.role = {}
+        for i in range(players):
+            self.clients.append(self._make_client("bot%d" % i))
+
+    def _make_client(self, name):
+        sio = socketio.Client(reconnection=False)
+        sio.bench_name = name
+
+        def on_any(event, data=None):
+            now = time.perf_counter()
+            sent = self.sent_at
+            self.stats.record(event, (now - sent) if sent is not None else None)
+            with self.cond:
+                self.counts[event] = self.counts.get(event, 0) + 1
+                self.last[(sio.bench_name, event)] = data
+                self.cond.notify_all()
+            if event == "role_info":
+                self.role[sio.bench_name] = data.get("role")
+            elif event == "session":
+                self.pids[sio.bench_name] = data.get("pid")
+
+        sio.on("*", on_any)
+        return sio
+
+    def send(self, client, event, data=None):
+        with self.cond:
+            self.counts = {}
+        self.sent_at = time.perf_counter()
+        if data is None:
+            client.emit(event)
+        else:
+            client.emit(event, data)
+
+    def wait(self, event, n):
+        deadline = time.monotonic() + self.timeout
+        with self.cond:
+            while self.counts.get(event, 0) < n:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise TimeoutError("%s: waiting for %d x %s, got %d" % (
+                        self.room, n, event, self.counts.get(event, 0)))
+                self.cond.wait(left)
+
+    def wait_any(self, events, n):
+        deadline = time.monotonic() + self.timeout
+        with self.cond:
+            while True:
+                for event in events:
+                    if self.counts.get(event, 0) >= n:
+                        return event
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise TimeoutError("%s: waiting for %s" % (self.room, events))
+                self.cond.wait(left)
+
+    # ------------ game script ------------
+    def connect(self):
+        # url 목록이면 자리마다 돌아가며 (워커 여러 개: 한 테이블이 여러 워커에 걸치게, bench/scale_workers.py)
+        urls = self.url if isinstance(self.url, list) else [self.url]
+        for i, c in enumerate(self.clients):
+            c.connect(urls[i % len(urls)], transports=["websocket"])
+
+    def run(self):
+        n = len(self.clients)
+        host = self.clients[0]
+        for i, c in enumerate(self.clients):
+            self.send(c, "register", {"name": c.bench_name, "room": self.room})
+            self.wait("lobby_state", 1)  # 등록한 본인에게만 스냅샷
+        self.send(host, "claim_host", {"code": HOST_CODE})
+        self.wait("host_granted", 1)
+
+        self.send(host, "start_game")
+        self.wait("hint_order", n)
+        while True:
+            self.hint_phase(host, n)
+            self.send(host, "start_vote1")
+            self.wait("open_vote", n)
+            self.vote_phase(n)
+            self.send(host, "close_vote1")
+            self.wait("vote_closed", n)
+
+            self.send(host, "start_hint2")
+            self.wait("hint_order", n)
+            self.hint_phase(host, n)
+            self.send(host, "start_vote2")
+            self.wait("open_vote", n)
+            self.vote_phase(n)
+            self.send(host, "close_vote2")
+            got = self.wait_any(["liar_selected", "round_result"], n)
+            if got == "liar_selected":
+                liar = next(c for c in self.clients if self.role.get(c.bench_name) == "liar")
+                self.send(liar, "liar_guess", {"guess": "모르겠다"})
+                self.wait("round_result", n)
+
+            self.send(host, "next_round")
+            got = self.wait_any(["hint_order", "final_scores"], n)
+            if got == "final_scores":
+                return
+
+    def hint_phase(self, host, n):
+        for idx in range(n):
+            self.send(host, "hint_next", {"index": idx})
+            self.wait("hint_turn", n)
+
+    def vote_phase(self, n):
+        names = [c.bench_name for c in self.clients]
+        for c in self.clients:
+            target = random.choice([x for x in names if x != c.bench_name])
+            self.send(c, "cast_vote", {"target": self.pids[target]})
+        # vote_progress는 묶음 전송이라 개수가 일정하지 않다: 모두에게 한 번 이상 도착하면 진행
+        self.wait("vote_progress", n)
+
+    def close(self):
+        for c in self.clients:
+            c.disconnect()
+
+
+# ------------ Server process ------------
+def free_port():
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def start_server(port, extra_env=None):
+    env = dict(os.environ, **(extra_env or {}))
+    # 자동 진행 타이머가 스크립트와 겹치지 않도록 충분히 길게
+    env.update(PORT=str(port), HOST_CODE=HOST_CODE,
+               HINT_SECONDS="3600", DISCUSSION_SECONDS="3600", GUESS_SECONDS="3600")
+    # 스크립트는 사람보다 훨씬 빨리 누르므로 소켓별 이벤트 제한은 끈다 (bench/flood.py는 켜고 잰다)
+    env.setdefault("RATE_LIMIT", "0")
+    # 매번 빈 저널로 시작 (이전 실행의 방이 복구되지 않도록)
+    env.setdefault("JOURNAL_DIR", tempfile.mkdtemp(prefix="liar-journal-"))
+    # 봇 게임이 실제 리더보드(var/stats.sqlite3)에 쌓이지 않도록 전적 기록은 끈다
+    env.setdefault("STATS_DB", "")
+    proc = subprocess.Popen([sys.executable, "app.py"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def read_rss(pid):
+    out = {}
+    try:
+        with open("/proc/%d/status" % pid) as f:
+            for line in f:
+                if line.startswith(("VmRSS", "VmHWM")):
+                    key, value = line.split(":")
+                    out[key.lower() + "_kb"] = int(value.split()[0])
+    except OSError:
+        pass
+    return out
+
+
+def create_room(url):
+    # /join 폼으로 새 방을 만들고, 리다이렉트된 로비 페이지에서 방 코드를 읽는다
+    import requests
+    r = requests.post(url + "/join", data={"name": "bench"})
+    marker = 'id="room-code">'
+    i = r.text.index(marker) + len(marker)
+    return r.text[i:r.text.index("<", i)]
+
+
+def compare(old, new, threshold):
+    regressions = []
+    for event, cur in new["events"].items():
+        prev = old.get("events", {}).get(event)
+        if prev and prev["p95_ms"] > 0 and cur["p95_ms"] > prev["p95_ms"] * (1 + threshold):
+            regressions.append({"event": event, "old_p95_ms": prev["p95_ms"], "new_p95_ms": cur["p95_ms"]})
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tables", type=int, default=10)
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--url", help="이미 실행 중인 서버 주소 (없으면 app.py를 직접 띄움)")
+    ap.add_argument("--pid", type=int, help="--url 사용 시 RSS를 읽을 서버 PID")
+    ap.add_argument("--timeout", type=float, default=20.0)
+    ap.add_argument("--out")
+    ap.add_argument("--compare", help="이전 결과 JSON과 p95 비교")
+    ap.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 p95 증가율")
+    args = ap.parse_args()
+
+    proc = None
+    url, pid = args.url, args.pid
+    if url is None:
+        port = free_port()
+        proc = start_server(port)
+        url, pid = "http://127.0.0.1:%d" % port, proc.pid
+
+    stats = Stats()
+    try:
+        tables = [Table(url, create_room(url), args.players, stats, args.timeout) for _ in range(args.tables)]
+        for t in tables:
+            t.connect()
+        rss_idle = read_rss(pid) if pid else {}
+
+        errors = []
+
+        def play(t):
+            try:
+                t.run()
+            except Exception as e:
+                errors.append(repr(e))
+
+        t0 = time.perf_counter()
+        threads = [threading.Thread(target=play, args=(t,)) for t in tables]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - t0
+        rss = read_rss(pid) if pid else {}
+        for t in tables:
+            t.close()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    report = {
+        "config": {"tables": args.tables, "players": args.players, "url": url},
+        "wall_s": wall,
+        "messages": stats.messages,
+        "msgs_per_sec": stats.messages / wall if wall else 0,
+        "events": stats.summary(),
+        "server_memory": {"connected": rss_idle, "after_games": rss},
+        "errors": errors,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["regressions"] = compare(json.load(f), report, args.threshold)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+    if errors or report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
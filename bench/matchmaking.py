@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""빠른 시작 대기열(liar/matchmaking.py) 비용과 테이블까지 걸리는 시간.
+
+ops:       --waiting 명(혼자/파티 섞어서)을 줄 세우는 join, 그중 10%가 나가는 leave,
+           전부 테이블로 묶는 pack의 건당 비용. 대기 인원과 무관하게 일정한지 본다.
+sim:       가짜 시계로 초당 --rates 명씩 도착시키고 MATCH_INTERVAL마다 pack: 테이블까지 걸린 시간
+           p50/p95/최대, 테이블 크기 분포, 스파이가 생기는(7명 이상) 테이블 비율.
+e2e:       app.py를 띄우고 --e2e-players 개의 Socket.IO 클라이언트가 queue → matched → /join 대신
+           register → 자동 시작(role_info)까지 실제로 걸린 시간.
+
+    python bench/matchmaking.py --waiting 50000 --rates 1,10,100 --out bench_match.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from liar.matchmaking import MatchQueue  # noqa: E402
+
+PARTY_SIZES = (1, 2, 3, 4)
+PARTY_WEIGHTS = (0.7, 0.2, 0.07, 0.03)
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else None
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def enqueue_party(q, rng, serial, size):
+    # 파티: 파티장이 보류 티켓을 만들고 나머지가 코드로 들어온 뒤 ready
+    first = "s%d" % serial
+    ticket = q.join(first, first, first, hold=size > 1)
+    for i in range(1, size):
+        sid = "s%d.%d" % (serial, i)
+        q.join(sid, sid, sid, party=ticket.code)
+    if size > 1:
+        q.ready(first)
+    return [first] + ["s%d.%d" % (serial, i) for i in range(1, size)]
+
+
+def run_ops(args):
+    rng = random.Random(args.seed)
+    q = MatchQueue(args.table_size, 3, args.max_wait, clock=Clock(), rng=rng)
+    sids = []
+    t0 = time.perf_counter()
+    serial = 0
+    while len(q) < args.waiting:
+        serial += 1
+        sids.extend(enqueue_party(q, rng, serial, rng.choices(PARTY_SIZES, PARTY_WEIGHTS)[0]))
+    join_s = time.perf_counter() - t0
+    leaving = rng.sample(sids, len(sids) // 10)
+    t0 = time.perf_counter()
+    for sid in leaving:
+        q.leave(sid)
+    leave_s = time.perf_counter() - t0
+    waiting = q.waiting
+    t0 = time.perf_counter()
+    tables = q.pack()
+    pack_s = time.perf_counter() - t0
+    q.clock.now += args.max_wait
+    tables += q.pack()
+    return {
+        "players": len(sids),
+        "join_us": round(join_s / len(sids) * 1e6, 2),
+        "leave_us": round(leave_s / len(leaving) * 1e6, 2),
+        "pack_waiting": waiting,
+        "pack_tables": len(tables),
+        "pack_us_per_table": round(pack_s / max(1, len(tables)) * 1e6, 2),
+        "left_unseated": q.waiting,
+    }
+
+
+def run_sim(args, rate):
+    # 도착은 포아송, 파티 크기는 PARTY_WEIGHTS, 그중 5%는 테이블이 잡히기 전에 떠난다
+    rng = random.Random(args.seed)
+    clock = Clock()
+    q = MatchQueue(args.table_size, 3, args.max_wait, clock=clock, rng=rng)
+    sizes = {}
+    serial = 0
+    party_rate = rate / sum(s * w for s, w in zip(PARTY_SIZES, PARTY_WEIGHTS))  # 사람 기준 rate → 파티 도착률
+    next_arrival = rng.expovariate(party_rate)
+    tick = 0.0
+    pack_cost = []
+    while clock.now < args.sim_seconds:
+        tick += args.interval
+        while next_arrival <= tick:
+            clock.now = next_arrival
+            serial += 1
+            members = enqueue_party(q, rng, serial, rng.choices(PARTY_SIZES, PARTY_WEIGHTS)[0])
+            if rng.random() < 0.05:
+                q.leave(members[-1])
+            next_arrival += rng.expovariate(party_rate)
+        clock.now = tick
+        t0 = time.perf_counter()
+        for seats in q.pack():
+            sizes[len(seats)] = sizes.get(len(seats), 0) + 1
+        pack_cost.append(time.perf_counter() - t0)
+    waited = list(q.waited)
+    tables = sum(sizes.values())
+    return {
+        "arrivals_per_sec": rate,
+        "tables": tables,
+        "seated": q.matched,
+        "still_waiting": q.waiting,
+        "wait_s_p50": round(percentile(waited, 0.5), 2),
+        "wait_s_p95": round(percentile(waited, 0.95), 2),
+        "wait_s_max": round(max(waited), 2),
+        "table_sizes": dict(sorted(sizes.items())),
+        "spy_tables": round(sum(n for s, n in sizes.items() if s >= 7) / float(tables), 3) if tables else None,
+        "pack_us_p99": round(percentile(pack_cost, 0.99) * 1e6, 1),
+    }
+
+
+def run_e2e(args):
+    import socketio
+    import loadtest
+    port = loadtest.free_port()
+    url = "http://127.0.0.1:%d" % port
+    proc = loadtest.start_server(port, {"JOURNAL_DIR": "", "STATS_DB": "", "MATCH_MAX_WAIT": str(args.max_wait),
+                                        "MATCH_TABLE_SIZE": str(args.table_size)})
+    lock = threading.Lock()
+    matched, started = [], []
+    clients = []
+    try:
+        for i in range(args.e2e_players):
+            c = socketio.Client(reconnection=False)
+            token = "e2e-%d" % i
+            t = {}
+
+            def on_matched(d, c=c, t=t, token=token):
+                t["matched"] = time.perf_counter()
+                with lock:
+                    matched.append(t["matched"] - t["queued"])
+                # 브라우저는 /join으로 페이지를 옮기지만, 여기서는 같은 소켓으로 바로 앉는다
+                c.emit("register", {"name": token, "room": d["room"], "token": token})
+
+            def on_role(d, t=t):
+                if "started" not in t:
+                    t["started"] = time.perf_counter()
+                    with lock:
+                        started.append(t["started"] - t["queued"])
+
+            c.on("matched", on_matched)
+            c.on("role_info", on_role)
+            c.connect(url, transports=["websocket"])
+            clients.append((c, t, token))
+        for c, t, token in clients:
+            t["queued"] = time.perf_counter()
+            c.emit("queue", {"name": token, "token": token})
+            time.sleep(args.e2e_gap)
+        deadline = time.monotonic() + args.max_wait + 10
+        while len(started) < len(clients) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        for c, _, _ in clients:
+            c.disconnect()
+        proc.terminate()
+        proc.wait()
+    return {
+        "players": len(clients),
+        "arrival_gap_ms": args.e2e_gap * 1000,
+        "matched": len(matched),
+        "started": len(started),
+        "to_table_ms_p50": round(percentile(matched, 0.5) * 1000, 1) if matched else None,
+        "to_table_ms_max": round(max(matched) * 1000, 1) if matched else None,
+        "to_game_ms_p50": round(percentile(started, 0.5) * 1000, 1) if started else None,
+        "to_game_ms_max": round(max(started) * 1000, 1) if started else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--waiting", type=int, default=50000)
+    ap.add_argument("--rates", default="1,10,100", help="초당 도착 인원 (쉼표로 여러 개)")
+    ap.add_argument("--sim-seconds", type=float, default=600)
+    ap.add_argument("--table-size", type=int, default=7)
+    ap.add_argument("--max-wait", type=float, default=20.0)
+    ap.add_argument("--interval", type=float, default=0.5, help="app.py MATCH_INTERVAL")
+    ap.add_argument("--e2e-players", type=int, default=70, help="0이면 e2e 생략")
+    ap.add_argument("--e2e-gap", type=float, default=0.01, help="e2e 클라이언트 사이 도착 간격(초)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "ops": run_ops(args),
+        "sim": [run_sim(args, float(r)) for r in args.rates.split(",")],
+    }
+    if args.e2e_players:
+        report["e2e"] = run_e2e(args)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""계측(liar.metrics) 오버헤드 측정.
+
+handler: 같은 cast_vote를 계측 래퍼 있음/없음으로 처리 시간 비교
+send   : --fanout 명에게 가는 방 방송 1회의 서버 쪽 비용을 전송 카운터 있음/없음으로 비교
+scrape : --rooms 개 방이 떠 있을 때 /metrics 한 번 만드는 시간
+
+    python bench/metrics_overhead.py --out bench_metrics.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JOURNAL_DIR", "")
+os.environ.setdefault("STATS_DB", "")
+os.environ["METRICS"] = "1"
+os.environ["RATE_LIMIT"] = "0"  # 한 클라이언트가 몰아서 보내는 벤치라 소켓별 제한은 끈다
+
+import app as server  # noqa: E402
+from app import app, socketio, HOST_CODE, METRICS  # noqa: E402
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def summarize(samples):
+    return {"n": len(samples), "p50_us": percentile(samples, 0.5) * 1e6,
+            "p99_us": percentile(samples, 0.99) * 1e6}
+
+
+def make_table(players):
+    gs = server.ROOMS.create()
+    clients = []
+    for i in range(players):
+        c = socketio.test_client(app)
+        c.emit("register", {"name": "p%d" % i, "room": gs.code})
+        clients.append(c)
+    clients[0].emit("claim_host", {"code": HOST_CODE})
+    clients[0].emit("start_game")
+    clients[0].emit("start_vote1")
+    for c in clients:
+        c.get_received()
+    return gs, clients
+
+
+def measure_handlers(tables, rounds):
+    handlers = socketio.server.handlers["/"]
+    wrapped = dict(handlers)
+    plain = {event: getattr(fn, "__wrapped__", fn) for event, fn in handlers.items()}
+    out = {}
+    for label, table in (("plain", plain), ("instrumented", wrapped)):
+        handlers.clear()
+        handlers.update(table)
+        samples = []
+        for _ in range(rounds):
+            for gs, clients in tables:
+                pids = list(gs.players)
+                for c in clients:
+                    me = gs.pid_of_sid[socketio.server.manager.sid_from_eio_sid(c.eio_sid, "/")]
+                    t0 = time.perf_counter()
+                    c.emit("cast_vote", {"target": random.choice([p for p in pids if p != me])})
+                    samples.append(time.perf_counter() - t0)
+                for c in clients:
+                    c.get_received()
+        out[label] = summarize(samples)
+    handlers.clear()
+    handlers.update(wrapped)
+    out["overhead_p50_us"] = out["instrumented"]["p50_us"] - out["plain"]["p50_us"]
+    return out
+
+
+def measure_send(fanout, iterations):
+    gs = server.ROOMS.create()
+    manager = socketio.server.manager
+    sids = []
+    for i in range(fanout):
+        sid = manager.connect("metrics-%s-%d" % (gs.code, i), "/")
+        manager.enter_room(sid, "/", gs.code)
+        sids.append(sid)
+    payload = {"phase": "vote1", "votes": [[1, 2]], "counts": [[2, 1]], "voted": 3, "top": [2], "max": 1}
+
+    def noop(eio_sid, pkt):
+        pass
+
+    out = {"fanout": fanout}
+    saved = socketio.server._send_eio_packet
+    for label, send in (("plain", noop), ("counted", METRICS.wrap_send(noop))):
+        socketio.server._send_eio_packet = send
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            socketio.emit("vote_progress", payload, to=gs.code)
+        out[label + "_us_per_emit"] = (time.perf_counter() - t0) / iterations * 1e6
+    socketio.server._send_eio_packet = saved
+    for sid in sids:
+        manager.disconnect(sid, "/")
+    return out
+
+
+def measure_scrape(rooms, iterations):
+    for _ in range(rooms - len(server.ROOMS)):
+        gs = server.ROOMS.create()
+        for i in range(6):
+            gs.players[gs.new_pid()] = {"name": "p%d" % i, "score": 0, "is_host": False, "away": False}
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        text = METRICS.render()
+    return {"rooms": len(server.ROOMS), "ms_per_scrape": (time.perf_counter() - t0) / iterations * 1000,
+            "bytes": len(text)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tables", type=int, default=20)
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--fanout", type=int, default=50)
+    ap.add_argument("--rooms", type=int, default=1000)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    tables = [make_table(args.players) for _ in range(args.tables)]
+    report = {
+        "handler": measure_handlers(tables, args.rounds),
+        "send": measure_send(args.fanout, 2000),
+        "scrape": measure_scrape(args.rooms, 20),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
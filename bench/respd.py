@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""로컬 테스트/벤치용 Redis 대역 서버 (RESP2, asyncio, 한 프로세스 메모리).
+
+STORE_URL=redis://... 로 여러 워커를 돌려 볼 때 실제 Redis 대신 쓴다. 이 앱과 python-socketio의
+RedisManager가 쓰는 명령만: PING ECHO SELECT CLIENT GET SET(NX/XX/EX/PX) MGET DEL EXISTS EXPIRE
+PUBLISH SUBSCRIBE UNSUBSCRIBE, 그리고 EVAL/EVALSHA/SCRIPT LOAD는 이 앱의 Lua 스크립트만
+(liar/store.py의 본문 SHA1로 알아보고 같은 일을 파이썬으로 한다). 영속성/복제/트랜잭션은 없다.
+
+    python bench/respd.py --port 6379
+    STORE_URL=redis://127.0.0.1:6379/0 PORT=10001 python app.py
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from liar.store import RENEW_SCRIPT  # noqa: E402
+
+
+class Error(Exception):
+    def __init__(self, message, code="ERR"):
+        super().__init__(message)
+        self.code = code
+
+
+def encode(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Error):
+        return b"-%s %s\r\n" % (value.code.encode(), str(value).encode())
+    if value is True:
+        return b"+OK\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+
+
+class Store:
+    def __init__(self):
+        self.data = {}  # key -> value (bytes)
+        self.expires = {}  # key -> monotonic deadline
+        self.channels = {}  # channel -> set(Client)
+        self.published = 0
+
+    def _alive(self, key):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return key in self.data
+
+    def get(self, key):
+        return self.data.get(key) if self._alive(key) else None
+
+    def set(self, key, value, args):
+        nx = xx = False
+        ttl = None
+        i = 0
+        while i < len(args):
+            opt = args[i].upper()
+            if opt == b"NX":
+                nx = True
+            elif opt == b"XX":
+                xx = True
+            elif opt in (b"EX", b"PX"):
+                i += 1
+                ttl = int(args[i]) / (1 if opt == b"EX" else 1000.0)
+            else:
+                raise Error("syntax error")
+            i += 1
+        exists = self._alive(key)
+        if (nx and exists) or (xx and not exists):
+            return None
+        self.data[key] = value
+        if ttl is not None:
+            self.expires[key] = time.monotonic() + ttl
+        else:
+            self.expires.pop(key, None)
+        return True
+
+    def delete(self, keys):
+        n = 0
+        for key in keys:
+            if self._alive(key):
+                del self.data[key]
+                self.expires.pop(key, None)
+                n += 1
+        return n
+
+    def expire(self, key, seconds):
+        if not self._alive(key):
+            return 0
+        self.expires[key] = time.monotonic() + seconds
+        return 1
+
+    def renew_owned(self, keys, args):
+        # RENEW_SCRIPT: 값이 worker인 키만 연장, 아닌 키의 번호(1부터)
+        worker, seconds = args[0], int(args[1])
+        lost = []
+        for i, key in enumerate(keys, 1):
+            if self.get(key) == worker:
+                self.expire(key, seconds)
+            else:
+                lost.append(i)
+        return lost
+
+    def publish(self, channel, message):
+        subs = self.channels.get(channel, ())
+        frame = encode([b"message", channel, message])
+        for client in subs:
+            client.writer.write(frame)
+        self.published += 1
+        return len(subs)
+
+
+def sha1(script):
+    return hashlib.sha1(script if isinstance(script, bytes) else script.encode()).hexdigest().encode()
+
+
+SCRIPTS = {sha1(RENEW_SCRIPT): Store.renew_owned}
+
+
+class Client:
+    def __init__(self, store, writer):
+        self.store = store
+        self.writer = writer
+        self.subscribed = set()
+
+    def call(self, args):
+        cmd = args[0].upper()
+        rest = args[1:]
+        s = self.store
+        if cmd == b"PING":
+            return [b"pong", b""] if self.subscribed else "PONG"
+        if cmd == b"ECHO":
+            return rest[0]
+        if cmd in (b"SELECT", b"CLIENT"):
+            return True
+        if cmd == b"GET":
+            return s.get(rest[0])
+        if cmd == b"MGET":
+            return [s.get(k) for k in rest]
+        if cmd == b"SET":
+            return s.set(rest[0], rest[1], rest[2:])
+        if cmd == b"DEL":
+            return s.delete(rest)
+        if cmd == b"EXISTS":
+            return sum(1 for k in rest if s._alive(k))
+        if cmd == b"EXPIRE":
+            return s.expire(rest[0], int(rest[1]))
+        if cmd == b"SCRIPT" and rest[0].upper() == b"LOAD":
+            sha = sha1(rest[1])
+            if sha not in SCRIPTS:
+                raise Error("only this app's scripts are supported")
+            return sha
+        if cmd in (b"EVAL", b"EVALSHA"):
+            sha = sha1(rest[0]) if cmd == b"EVAL" else rest[0].lower()
+            if sha not in SCRIPTS:
+                raise Error("No matching script.", "NOSCRIPT")
+            n = int(rest[1])
+            return SCRIPTS[sha](s, rest[2:2 + n], rest[2 + n:])
+        if cmd == b"PUBLISH":
+            return s.publish(rest[0], rest[1])
+        if cmd == b"SUBSCRIBE":
+            out = []
+            for ch in rest:
+                self.subscribed.add(ch)
+                s.channels.setdefault(ch, set()).add(self)
+                out.append(encode([b"subscribe", ch, len(self.subscribed)]))
+            return RawReply(b"".join(out))
+        if cmd == b"UNSUBSCRIBE":
+            out = []
+            for ch in rest or list(self.subscribed):
+                self.subscribed.discard(ch)
+                s.channels.get(ch, set()).discard(self)
+                out.append(encode([b"unsubscribe", ch, len(self.subscribed)]))
+            return RawReply(b"".join(out))
+        raise Error("unknown command '%s'" % cmd.decode(errors="replace"))
+
+    def close(self):
+        for ch in self.subscribed:
+            self.store.channels.get(ch, set()).discard(self)
+
+
+class RawReply(bytes):
+    pass
+
+
+async def read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()  # 인라인 명령 (redis-cli 없이 nc로 칠 때)
+    args = []
+    for _ in range(int(line[1:])):
+        size = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(size + 2))[:-2])
+    return args
+
+
+def serve(store):
+    async def handle(reader, writer):
+        client = Client(store, writer)
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                try:
+                    reply = client.call(args)
+                except Error as e:
+                    reply = e
+                except (IndexError, ValueError):
+                    reply = Error("wrong number of arguments")
+                writer.write(reply if isinstance(reply, RawReply) else encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            client.close()
+            writer.close()
+    return handle
+
+
+async def main_async(host, port):
+    server = await asyncio.start_server(serve(Store()), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=6379)
+    args = ap.parse_args()
+    try:
+        asyncio.run(main_async(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
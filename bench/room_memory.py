@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""방/플레이어 메모리: 빈 방 하나, 앉은 플레이어 한 명이 차지하는 바이트.
+
+idle:  --rooms 개(기본 10만)의 빈 방을 만들고 방당 바이트.
+seated: 그중 --seated-rooms 개 방에 --players 명씩 register로 앉힌 뒤 (로비 명단 방송까지 끝낸 상태)
+        플레이어당 바이트. 같은 사람들이 끊고(mark_away) 새 소켓/새 이름으로 --churn 번 다시 들어온 뒤
+        플레이어당 바이트도 같이 본다 (사람 수는 그대로인데 늘어나면 어딘가 옛 색인이 남는 것).
+
+tracemalloc으로 app.py와 liar/ 안에서 잡은 메모리만 센다 (Socket.IO 매니저의 방 목록 등은 제외).
+다른 체크아웃(예: git worktree로 꺼낸 이전 커밋)을 --tree로 주면 그 코드의 배치로 재서 비교할 수 있다.
+
+    git worktree add /tmp/liar-base <이전 커밋>
+    python bench/room_memory.py --tree /tmp/liar-base --out bench_memory_base.json
+    python bench/room_memory.py --out bench_memory.json
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(tree):
+    sys.path.insert(0, tree)
+    os.environ["JOURNAL_DIR"] = ""
+    os.environ["STATS_DB"] = ""
+    os.environ["RATE_LIMIT"] = "0"
+    os.environ["METRICS"] = "0"
+    os.environ["RECONNECT_GRACE"] = "3600"
+    import app
+    logging.getLogger("engineio.server").setLevel(logging.ERROR)  # 소켓 없는 sid로 보내는 경고
+    return app
+
+
+def ours(tree):
+    # 인코딩한 패킷(liar/wire.py)은 방 상태가 아니라 전송 쪽이라 뺀다
+    root = os.path.realpath(tree)
+    return [tracemalloc.Filter(True, os.path.join(root, "app.py")),
+            tracemalloc.Filter(True, os.path.join(root, "liar", "*")),
+            tracemalloc.Filter(False, os.path.join(root, "liar", "wire.py"))]
+
+
+def traced(filters):
+    gc.collect()
+    snap = tracemalloc.take_snapshot().filter_traces(filters)
+    return snap, sum(s.size for s in snap.statistics("filename"))
+
+
+def top_sites(tree, before, after, per, n=8):
+    # 가장 많이 늘어난 할당 위치 (단위당 바이트)
+    root = os.path.realpath(tree)
+    return [["%s:%d" % (os.path.relpath(d.traceback[0].filename, root), d.traceback[0].lineno),
+             round(d.size_diff / per, 1)] for d in after.compare_to(before, "lineno")[:n]]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rooms", type=int, default=100000)
+    ap.add_argument("--seated-rooms", type=int, default=10000)
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--churn", type=int, default=3, help="끊고 새 이름으로 다시 들어오는 횟수 (사람마다)")
+    ap.add_argument("--tree", default=HERE, help="잴 체크아웃 (기본: 이 저장소)")
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    A = load_app(args.tree)
+    filters = ours(args.tree)
+    manager = A.socketio.server.manager
+    # 가짜 소켓은 미리 매니저에 등록해 둔다 (재는 구간 밖)
+    seats = args.seated_rooms * args.players
+    sids = [manager.connect("m%d" % i, "/") for i in range(seats * (1 + args.churn))]
+
+    tracemalloc.start()
+    base, base_size = traced(filters)
+    t0 = time.perf_counter()
+    rooms = [A.ROOMS.create().code for _ in range(args.rooms)]
+    create_s = time.perf_counter() - t0
+    idle, idle_size = traced(filters)
+
+    next_sid = iter(sids)
+    seated = []
+    for code in rooms[:args.seated_rooms]:
+        for i in range(args.players):
+            sid, token = next(next_sid), "%s-%d" % (code, i)
+            A.register(sid, {"name": "player%d" % i, "room": code, "token": token})
+            seated.append([code, sid, token, i])
+    A.SCHED.run_due(time.monotonic() + 60)  # 로비 명단 방송까지
+    full, full_size = traced(filters)
+
+    for n in range(args.churn):
+        for seat in seated:
+            code, sid, token, i = seat
+            A.disconnect(sid)
+            seat[1] = next(next_sid)
+            A.register(seat[1], {"name": "player%d-%d" % (i, n + 1), "room": code, "token": token})
+        A.SCHED.run_due(time.monotonic() + 60)
+    churned, churned_size = traced(filters)
+    tracemalloc.stop()
+
+    players = sum(len(A.ROOMS.rooms[code].players) for code in rooms[:args.seated_rooms])
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "python": sys.version.split()[0],
+        "create_us_per_room": round(create_s / args.rooms * 1e6, 2),
+        "bytes_per_idle_room": round((idle_size - base_size) / float(args.rooms), 1),
+        "idle_room_sites": top_sites(args.tree, base, idle, args.rooms),
+        "players": players,
+        "bytes_per_player": round((full_size - idle_size) / float(seats), 1),
+        "player_sites": top_sites(args.tree, idle, full, seats),
+        "bytes_per_player_after_churn": round((churned_size - idle_size) / float(seats), 1),
+        "churn_sites": top_sites(args.tree, full, churned, seats),
+        "total_mb": round((churned_size - base_size) / 1048576.0, 1),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
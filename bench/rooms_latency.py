@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""방 개수(1 → 1,000)에 따른 이벤트 처리 지연 측정.
+
+각 방에 3명씩 앉히고 투표 단계까지 진행한 뒤, 표본 방들에서
+cast_vote / hint_next 처리 시간을 잰다. 결과는 JSON으로 출력.
+
+    python bench/rooms_latency.py --rooms 1 10 100 1000 --out bench_rooms.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JOURNAL_DIR", "")  # 저널 없이 순수 처리 비용만
+os.environ.setdefault("STATS_DB", "")
+os.environ["RATE_LIMIT"] = "0"  # 한 클라이언트가 몰아서 보내는 벤치라 소켓별 제한은 끈다
+
+from app import app, socketio, ROOMS, HOST_CODE  # noqa: E402
+
+
+def make_room():
+    gs = ROOMS.create()
+    clients = []
+    for i in range(3):
+        c = socketio.test_client(app)
+        c.emit("register", {"name": "p%d" % i, "room": gs.code})
+        clients.append(c)
+    clients[0].emit("claim_host", {"code": HOST_CODE})
+    clients[0].emit("start_game")
+    clients[0].emit("start_vote1")
+    for c in clients:
+        c.get_received()
+    return gs, clients
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def measure(tables, iterations):
+    vote, hint = [], []
+    for _ in range(iterations):
+        for gs, clients in tables:
+            host, voter = clients[0], clients[1]
+            target = gs.pid_of_sid[socketio.server.manager.sid_from_eio_sid(host.eio_sid, "/")]
+            t0 = time.perf_counter()
+            voter.emit("cast_vote", {"target": target})
+            vote.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            host.emit("hint_next", {"index": 0})
+            hint.append(time.perf_counter() - t0)
+        for _, clients in tables:
+            for c in clients:
+                c.get_received()
+    return {
+        "cast_vote": summarize(vote),
+        "hint_next": summarize(hint),
+    }
+
+
+def summarize(samples):
+    return {
+        "n": len(samples),
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rooms", type=int, nargs="+", default=[1, 10, 100, 1000])
+    ap.add_argument("--sample", type=int, default=10, help="측정에 쓰는 방 개수")
+    ap.add_argument("--iterations", type=int, default=50)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    live = []
+    report = []
+    for n in sorted(args.rooms):
+        while len(live) < n:
+            live.append(make_room())
+        row = {"rooms": len(ROOMS)}
+        row.update(measure(live[:args.sample], args.iterations))
+        report.append(row)
+        print("%5d rooms  cast_vote p50 %.1fus  hint_next p50 %.1fus" % (
+            row["rooms"], row["cast_vote"]["p50_us"], row["hint_next"]["p50_us"]))
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
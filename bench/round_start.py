@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""라운드 시작 비용 마이크로 벤치마크 (3 / 10 / 50 / 200명).
+
+before: 예전 방식 — 플레이어마다 role_info dict를 새로 만들고 sid별로 emit (N회 직렬화/전송)
+after : app.send(ENGINE.begin_round) — 역할 채널(라이어/스파이/시민)마다 한 번씩 emit
+        (서버가 첫 hint_turn까지 바로 보내므로 emit이 하나 더 있다)
+
+실제 소켓 대신 가짜 참가자를 매니저에 등록하고 전송 함수만 바꿔 끼워
+서버 쪽 비용(payload 생성, 직렬화, 방 순회)만 잰다.
+
+    python bench/round_start.py --players 3 10 50 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JOURNAL_DIR", "")  # 저널 없이 순수 처리 비용만
+os.environ.setdefault("STATS_DB", "")
+
+import app as server  # noqa: E402
+from app import socketio  # noqa: E402
+from liar.rooms import Player  # noqa: E402
+
+
+def legacy_round_start(gs):
+    for pid, info in gs.players.items():
+        role = gs.roles.get(pid)
+        target_sid = gs.sid_of[pid]
+        if role == "liar":
+            socketio.emit("role_info", {"role": "라이어", "topic": gs.category, "keyword": None}, to=target_sid)
+        elif role == "spy":
+            socketio.emit("role_info", {"role": "스파이", "topic": gs.category, "keyword": gs.secret_word}, to=target_sid)
+        else:
+            socketio.emit("role_info", {"role": "시민", "topic": gs.category, "keyword": gs.secret_word}, to=target_sid)
+    socketio.emit("game_started", {"round": gs.round_num}, to=gs.code)
+    socketio.emit("hint_order", {
+        "order": [{"pid": p, "name": gs.players[p].name} for p in gs.order],
+        "phase": gs.phase,
+        "round": gs.round_num
+    }, to=gs.code)
+
+
+def new_round_start(gs):
+    server.send(gs, server.ENGINE.begin_round(gs))
+
+
+def legacy_full(gs):
+    # 역할/제시어/순서는 같은 엔진으로 정하고 보내는 것만 예전 방식
+    server.ENGINE.begin_round(gs)
+    legacy_round_start(gs)
+
+
+class Wire:
+    # 실제 소켓 대신 서버가 내보내는 패킷만 센다 (직렬화/방 순회 비용은 그대로 측정됨)
+    def __init__(self):
+        self.emits = 0
+        self.deliveries = 0
+
+    def __enter__(self):
+        self._send = socketio.server._send_eio_packet
+        self._emit = socketio.emit
+        socketio.server._send_eio_packet = self.send
+        socketio.emit = self.emit
+        return self
+
+    def __exit__(self, *exc):
+        socketio.server._send_eio_packet = self._send
+        socketio.emit = self._emit
+
+    def send(self, eio_sid, pkt):
+        self.deliveries += 1
+
+    def emit(self, *args, **kwargs):
+        self.emits += 1
+        return self._emit(*args, **kwargs)
+
+
+def measure(n, iterations):
+    gs = server.ROOMS.create()
+    manager = socketio.server.manager
+    sids = []
+    for i in range(n):
+        sid = manager.connect("bench-%s-%d" % (gs.code, i), "/")
+        manager.enter_room(sid, "/", gs.code)
+        server.ROOMS.join(sid, gs.code)
+        pid = gs.new_pid()
+        gs.players[pid] = Player("p%03d" % i)
+        gs.sid_of[pid] = sid
+        gs.pid_of_sid[sid] = pid
+        sids.append(sid)
+    gs.round_num, gs.phase = 1, "hint1"
+
+    row = {"players": n}
+    for label, fn in (("before", legacy_full), ("after", new_round_start)):
+        with Wire() as wire:
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                fn(gs)
+            elapsed = (time.perf_counter() - t0) / iterations
+        row[label] = {
+            "us_per_round": elapsed * 1e6,
+            "emits_per_round": wire.emits / iterations,
+            "deliveries_per_round": wire.deliveries / iterations,
+        }
+    server.cancel_phase_timer(gs)
+    for sid in sids:
+        manager.disconnect(sid, "/")
+    return row
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, nargs="+", default=[3, 10, 50, 200])
+    ap.add_argument("--iterations", type=int, default=50)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    report = [measure(n, args.iterations) for n in args.players]
+    for row in report:
+        print("%4d players  before %8.1fus (%d emits)  after %8.1fus (%d emits)" % (
+            row["players"], row["before"]["us_per_round"], row["before"]["emits_per_round"],
+            row["after"]["us_per_round"], row["after"]["emits_per_round"]))
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""워커 여러 개(STORE_URL) 확장 벤치.
+
+Redis 대역(bench/respd.py, --redis로 실제 Redis 주소를 줄 수도 있음)과 app.py 워커 N개를 띄우고,
+bench/loadtest.py 테이블의 자리들을 워커에 돌아가며 붙여(한 테이블이 여러 워커에 걸침) 전체 게임을 돌린다.
+워커 수마다 초당 메시지, 이벤트별 p95, 워커별 CPU 사용 시간, 방 작업 전달 횟수를 남긴다.
+비교 기준으로 저장소 없는 워커 하나(지금까지의 배포)도 같이 잰다.
+
+워커가 CPU 코어보다 많으면 확장은 재지 못하고 조정 비용만 보인다: 결과의 cpu_count를 같이 볼 것.
+
+    python bench/scale_workers.py --workers 1,2,4 --tables 20 --out bench_scale.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import loadtest  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def cpu_seconds(pid):
+    # /proc/<pid>/stat의 utime + stime (clock tick)
+    try:
+        with open("/proc/%d/stat" % pid) as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / float(os.sysconf("SC_CLK_TCK"))
+    except OSError:
+        return None
+
+
+def start_respd(port):
+    proc = subprocess.Popen([sys.executable, os.path.join(HERE, "respd.py"), "--port", str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    return proc
+
+
+def metric(url, name):
+    # /metrics 텍스트에서 값 하나 (라벨 있는 건 합)
+    total = 0.0
+    for line in requests.get(url + "/metrics").text.splitlines():
+        if line.startswith(name) and not line.startswith("#"):
+            total += float(line.rsplit(" ", 1)[1])
+    return total
+
+
+def run_once(args, workers, store_url):
+    env = {"JOURNAL_DIR": "", "STATS_DB": "", "STORE_URL": store_url or ""}
+    procs, urls = [], []
+    try:
+        for _ in range(workers):
+            port = loadtest.free_port()
+            procs.append(loadtest.start_server(port, env))
+            urls.append("http://127.0.0.1:%d" % port)
+        stats = loadtest.Stats()
+        # 방은 워커에 고르게 만들고, 자리는 모든 워커에 돌아가며
+        tables = [loadtest.Table(urls, loadtest.create_room(urls[i % len(urls)]), args.players, stats, args.timeout)
+                  for i in range(args.tables)]
+        for t in tables:
+            t.connect()
+        cpu0 = [cpu_seconds(p.pid) for p in procs]
+        errors = []
+
+        def play(t):
+            try:
+                t.run()
+            except Exception as e:
+                errors.append(repr(e))
+
+        t0 = time.perf_counter()
+        threads = [threading.Thread(target=play, args=(t,)) for t in tables]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - t0
+        cpu = [round(cpu_seconds(p.pid) - c, 2) for p, c in zip(procs, cpu0)]
+        forwarded = sum(metric(u, "liar_cluster_forwarded_total") for u in urls) if store_url else 0
+        for t in tables:
+            t.close()
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+    events = stats.summary()
+    return {
+        "workers": workers,
+        "store": bool(store_url),
+        "wall_s": round(wall, 2),
+        "messages": stats.messages,
+        "msgs_per_sec": round(stats.messages / wall, 1),
+        "p95_ms": {e: round(v["p95_ms"], 2) for e, v in events.items()},
+        "worker_cpu_s": cpu,
+        "forwarded": int(forwarded),
+        "errors": errors,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", default="1,2,4")
+    ap.add_argument("--tables", type=int, default=20)
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--redis", help="이미 떠 있는 Redis 주소 (없으면 bench/respd.py)")
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    respd = None
+    store_url = args.redis
+    if store_url is None:
+        port = loadtest.free_port()
+        respd = start_respd(port)
+        store_url = "redis://127.0.0.1:%d/0" % port
+    try:
+        runs = [run_once(args, 1, None)]
+        for n in [int(x) for x in args.workers.split(",")]:
+            runs.append(run_once(args, n, store_url))
+    finally:
+        if respd is not None:
+            respd.terminate()
+            respd.wait()
+
+    report = {
+        "config": {"tables": args.tables, "players": args.players, "store": store_url},
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
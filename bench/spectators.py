@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""관전자 채널 벤치: 한 테이블에 관전자 --spectators 명을 붙였을 때.
+
+play   : 플레이어 채널 방송 지연 (한 명이 표를 바꿀 때 vote_progress가 플레이어 전원에게 도착하기까지).
+         관전자 없는 테이블과 관전자 5,000명이 붙은 테이블을 같은 서버에서 비교한다.
+watch  : 관전자가 받은 spectate 스냅샷 수/초, 틱 하나가 관전자 전원에게 퍼지는 데 걸린 시간, 스냅샷 크기,
+         그리고 관전자에게 spectate 말고 다른 이벤트(role_info 등)가 왔는지.
+memory : 관전자 연결 전후 서버 RSS
+
+관전자는 가벼운 asyncio 웹소켓 클라이언트 (Engine.IO v4 텍스트 프레임을 직접),
+플레이어는 bench/backends.py의 Fleet (python-socketio 클라이언트).
+
+    pip install -r bench/requirements.txt
+    python bench/spectators.py --spectators 5000 --out bench_spectators.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from websockets.asyncio.client import connect
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from backends import Fleet, summarize  # noqa: E402
+from loadtest import create_room, free_port, read_rss, start_server  # noqa: E402
+
+
+class Audience:
+    def __init__(self, url, room, n):
+        self.ws_url = url.replace("http://", "ws://") + "/socket.io/?EIO=4&transport=websocket"
+        self.room = room
+        self.n = n
+        self.arrivals = []  # spectate 도착 시각
+        self.sizes = []
+        self.other = {}  # spectate 말고 받은 이벤트 -> 횟수
+        self.ready = 0
+        self.errors = []
+        self.all_ready = asyncio.Event()
+        self.tasks = []
+        self.connect_times = []
+
+    def _settled(self):
+        if self.ready + len(self.errors) == self.n:
+            self.all_ready.set()
+
+    async def one(self, gate):
+        try:
+            await self._watch(gate)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors.append(repr(e))
+            self._settled()
+
+    async def _watch(self, gate):
+        async with gate:
+            t0 = time.perf_counter()
+            ws = await connect(self.ws_url, max_size=None, ping_interval=None)
+            await ws.recv()  # 0{...} open
+            await ws.send("40")
+            while not (await ws.recv()).startswith("40"):
+                pass
+            await ws.send('42["watch",{"room":"%s"}]' % self.room)
+            self.connect_times.append(time.perf_counter() - t0)
+        first = True
+        async for msg in ws:
+            if msg == "2":
+                await ws.send("3")
+                continue
+            if not msg.startswith("42"):
+                continue
+            event = json.loads(msg[2:])[0]
+            if event == "spectate":
+                self.arrivals.append(time.perf_counter())
+                self.sizes.append(len(msg.encode("utf-8")))
+                if first:
+                    first = False
+                    self.ready += 1
+                    self._settled()
+            elif event != "connected":
+                self.other[event] = self.other.get(event, 0) + 1
+
+    async def start(self, concurrency):
+        gate = asyncio.Semaphore(concurrency)
+        t0 = time.perf_counter()
+        self.tasks = [asyncio.create_task(self.one(gate)) for _ in range(self.n)]
+        await asyncio.wait_for(self.all_ready.wait(), 600)
+        wall = time.perf_counter() - t0
+        return {"spectators": self.ready, "errors": self.errors[:5], "n_errors": len(self.errors),
+                "wall_s": wall, "connects_per_sec": self.ready / wall,
+                "connect": summarize(self.connect_times)}
+
+    def reset(self):
+        self.arrivals = []
+        self.sizes = []
+
+    def ticks(self):
+        # 도착 시각을 틱 단위로 묶는다 (틱 간격보다 훨씬 짧은 틈으로 끊음)
+        groups = []
+        for t in sorted(self.arrivals):
+            if groups and t - groups[-1][-1] < 0.15:
+                groups[-1].append(t)
+            else:
+                groups.append([t])
+        return groups
+
+    async def close(self):
+        for t in self.tasks:
+            t.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+def play_fanout(url, players, rounds):
+    fleet = Fleet(url, players)
+    try:
+        fleet.connect(min(players, 10))
+        fleet.register(create_room(url))
+        return fleet.fanout(rounds)
+    finally:
+        fleet.close()
+
+
+async def run(args):
+    os.environ["VOTE_FLUSH_MS"] = "0"  # 표 하나에 방송 하나: 플레이어 채널 지연을 그대로 보려고
+    os.environ["METRICS"] = "0"
+    os.environ["SPECTATOR_HZ"] = str(args.hz)
+    port = free_port()
+    proc = start_server(port)
+    url = "http://127.0.0.1:%d" % port
+    loop = asyncio.get_running_loop()
+    out = {"rss_idle": read_rss(proc.pid)}
+    audience = None
+    try:
+        # 1) 관전자 없는 테이블
+        out["play_no_spectators"] = await loop.run_in_executor(None, play_fanout, url, args.players, args.rounds)
+
+        # 2) 관전자가 붙은 테이블: 플레이어가 먼저 앉고 관전자가 붙은 뒤 같은 측정
+        fleet = Fleet(url, args.players)
+        fleet.connect(min(args.players, 10))
+        room = create_room(url)
+        await loop.run_in_executor(None, fleet.register, room)
+        audience = Audience(url, room, args.spectators)
+        out["audience_connect"] = await audience.start(args.concurrency)
+        out["rss_with_spectators"] = read_rss(proc.pid)
+        await asyncio.sleep(2.0 / args.hz)
+        audience.reset()
+        t0 = time.perf_counter()
+        out["play_with_spectators"] = await loop.run_in_executor(None, fleet.fanout, args.rounds)
+        await asyncio.sleep(2.0 / args.hz)  # 마지막 틱까지
+        window = time.perf_counter() - t0
+        fleet.close()
+
+        ticks = audience.ticks()
+        spread = [g[-1] - g[0] for g in ticks]
+        out["watch"] = {
+            "window_s": window,
+            "snapshots": len(audience.arrivals),
+            "ticks": len(ticks),
+            "per_spectator_per_sec": len(audience.arrivals) / max(1, audience.ready) / window,
+            "tick_spread": summarize(spread),
+            "snapshot_bytes": {"mean": sum(audience.sizes) / max(1, len(audience.sizes)),
+                               "max": max(audience.sizes or [0])},
+            "other_events": audience.other,
+        }
+    finally:
+        if audience is not None:
+            await audience.close()
+        proc.terminate()
+        proc.wait()
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spectators", type=int, default=5000)
+    ap.add_argument("--players", type=int, default=8)
+    ap.add_argument("--rounds", type=int, default=30)
+    ap.add_argument("--hz", type=float, default=2.0)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    report = {"config": {"spectators": args.spectators, "players": args.players, "rounds": args.rounds,
+                         "hz": args.hz, "mode": os.environ.get("ASYNC_MODE", "eventlet")},
+              "result": asyncio.run(run(args))}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
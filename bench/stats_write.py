@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""플레이어 전적 DB(liar/stats.py) 쓰기/순위표 비용.
+
+write: eventlet 허브 위에서 라운드/게임 기록 --records 개를 핸들러처럼 쌓고(append),
+       PlayerStats.tick이 interval마다 묶어서 SQLite에 쓴다. 쓰기를
+         none   : 쌓기만 하고 버림 (기준)
+         inline : 허브 스레드에서 바로
+         tpool  : eventlet.tpool (app.py와 같음)
+       세 가지로 돌리면서 1ms마다 깨어나는 그린렛의 지각(= 그동안 다른 핸들러가 기다린 시간)을 잰다.
+leaderboard: 다 쓴 뒤 상위 100명 조회를 인덱스 사용 / 인덱스 없이(NOT INDEXED) / 캐시 적중으로 비교.
+
+    python bench/stats_write.py --records 1000000 --names 50000 --out bench_stats.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import eventlet
+from eventlet import tpool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from liar.stats import BOARDS, COUNTERS, TOP_K, PlayerStats  # noqa: E402
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def feed(stats, rng, records, names, players=6, rounds=3, chunk=500):
+    # 한 게임 = players명 x rounds 라운드 + 게임 기록 하나. chunk개마다 허브에 양보 (핸들러 여러 번 분량)
+    names = ["player%d" % i for i in range(names)]
+    n = 0
+    while n < records:
+        seats = rng.sample(names, players)
+        for _ in range(rounds):
+            liar = rng.randrange(players)
+            citizens_win = rng.random() < 0.5
+            for i, name in enumerate(seats):
+                role = "liar" if i == liar else "citizen"
+                won = citizens_win == (role == "citizen")
+                stats.add_round(name, role, won, (2 if role == "liar" else 1) if won else 0,
+                                (rng.random() < 0.3) if role == "liar" and not citizens_win else None,
+                                2 if role == "citizen" else 0, rng.randint(0, 2) if role == "citizen" else 0)
+                n += 1
+                if n % chunk == 0:
+                    eventlet.sleep(0)
+        stats.add_game("B%05d" % (n % 100000), rounds, [[name, rng.randint(0, 6)] for name in seats])
+        n += 1
+
+
+def run_write(mode, args, path):
+    if mode == "none":
+        stats = PlayerStats(path, offload=lambda fn, batch: None, interval=args.interval)
+    else:
+        stats = PlayerStats(path, offload=tpool.execute if mode == "tpool" else None, interval=args.interval)
+    late = []
+    done = []
+
+    def ticker():
+        while not done:
+            t0 = time.perf_counter()
+            eventlet.sleep(0.001)
+            late.append(time.perf_counter() - t0 - 0.001)
+
+    def flusher():
+        while not done:
+            eventlet.sleep(stats.interval)
+            stats.tick()
+
+    rng = random.Random(args.seed)
+    threads = [eventlet.spawn(ticker), eventlet.spawn(flusher)]
+    t0 = time.perf_counter()
+    feed(stats, rng, args.records, args.names)
+    fed = time.perf_counter() - t0
+    stats.tick()  # 남은 것 마저
+    wall = time.perf_counter() - t0
+    done.append(True)
+    for th in threads:
+        th.wait()
+    out = {
+        "mode": mode,
+        "records": args.records,
+        "feed_s": round(fed, 2),
+        "wall_s": round(wall, 2),
+        "records_per_sec": round(args.records / wall),
+        "batches": stats.batches,
+        "batch_write_ms_p50": round(percentile(stats.write_ms, 0.5), 1) if stats.write_ms else None,
+        "batch_write_ms_max": round(max(stats.write_ms), 1) if stats.write_ms else None,
+        "hub_late_ms_p99": round(percentile(late, 0.99) * 1000, 2),
+        "hub_late_ms_max": round(max(late) * 1000, 2),
+    }
+    return out, stats
+
+
+def run_leaderboard(stats, repeat=200):
+    out = {"players": stats._query("SELECT COUNT(*) FROM players")[0][0],
+           "games": stats._query("SELECT COUNT(*) FROM games")[0][0]}
+    cols = ", ".join(COUNTERS)
+    for by, order in sorted(BOARDS.items()):
+        timings = {}
+        for label, hint in (("indexed", ""), ("not_indexed", "NOT INDEXED")):
+            sql = "SELECT name, %s FROM players %s ORDER BY %s LIMIT %d" % (cols, hint, order, TOP_K)
+            samples = []
+            for _ in range(20):
+                t0 = time.perf_counter()
+                stats._query(sql)
+                samples.append(time.perf_counter() - t0)
+            timings[label + "_ms"] = round(percentile(samples, 0.5) * 1000, 3)
+        stats.leaderboard(by)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            stats.leaderboard(by, 10)
+        timings["cached_us"] = round((time.perf_counter() - t0) / repeat * 1e6, 2)
+        out[by] = timings
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=1000000)
+    ap.add_argument("--names", type=int, default=50000)
+    ap.add_argument("--interval", type=float, default=1.0, help="묶음 쓰기 간격(초), app.py STATS_FLUSH_MS")
+    ap.add_argument("--modes", default="none,inline,tpool")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    work = tempfile.mkdtemp(prefix="liar-stats-bench-")
+    try:
+        report = {"config": {k: v for k, v in vars(args).items() if k != "out"}, "write": []}
+        for mode in args.modes.split(","):
+            result, stats = run_write(mode, args, os.path.join(work, mode + ".sqlite3"))
+            report["write"].append(result)
+            if mode != "none":
+                report["leaderboard"] = run_leaderboard(stats)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""서버 타이머 스케줄러(liar.scheduler) 부하 측정.
+
+N개의 타이머를 --spread 초 구간에 흩뿌려 걸어두고(절반은 중간에 취소),
+발화 지연(jitter) 분포와 그동안 쓴 CPU 시간을 JSON으로 출력한다.
+
+    python bench/timer_jitter.py --timers 10000 --spread 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import eventlet
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from liar.scheduler import TimerScheduler  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--timers", type=int, default=10000)
+    ap.add_argument("--spread", type=float, default=5.0)
+    ap.add_argument("--cancel-ratio", type=float, default=0.5)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    sched = TimerScheduler()
+
+    def loop():
+        # 서버의 every(SCHED.next_delay, SCHED.run_due)와 같은 모양
+        while True:
+            eventlet.sleep(sched.next_delay())
+            sched.run_due()
+    eventlet.spawn(loop)
+    noop = lambda: None
+
+    handles = [sched.call_later(random.uniform(0, args.spread), noop) for _ in range(args.timers)]
+    for t in random.sample(handles, int(len(handles) * args.cancel_ratio)):
+        sched.cancel(t)
+    expected = len(sched)
+
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    while sched.fired < expected:
+        eventlet.sleep(0.1)
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+
+    report = {
+        "timers": args.timers,
+        "fired": sched.fired,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_pct": 100.0 * cpu / wall,
+        "jitter": sched.jitter_stats(),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
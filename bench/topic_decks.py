@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""주제 덱 메모리/속도 측정: 방 수가 늘어도 방당 메모리가 일정한지 확인.
+
+    python bench/topic_decks.py --rooms 100 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from liar.topic_bank import TopicBank, TopicDeck  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rooms", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--draws", type=int, default=30, help="방마다 뽑는 횟수 (라운드 수)")
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    bank = TopicBank(os.path.join(ROOT, "data", "topics.py"), os.path.join(ROOT, "data", "packs", "*.json"))
+    index = bank.current
+    report = []
+    for n in args.rooms:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        decks = [TopicDeck() for _ in range(n)]
+        t0 = time.perf_counter()
+        for d in decks:
+            for _ in range(args.draws):
+                d.draw(index)
+        elapsed = time.perf_counter() - t0
+        used = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+        report.append({
+            "rooms": n,
+            "bytes_per_room": used / n,
+            "us_per_draw": elapsed / (n * args.draws) * 1e6,
+        })
+        del decks
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
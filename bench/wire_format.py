@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""전송 형식(JSON / MessagePack) 비교.
+
+bytes: --players 명 테이블에서 한 라운드(힌트 2바퀴, 투표 2번, 결과)를 서버 안에서 돌리며
+       형식별로 실제 전송된 바이트를 이벤트 종류별로 센다.
+cpu  : 같은 라운드에서 나간 패킷들을 형식별로 인코딩/디코딩하는 시간.
+
+    python bench/wire_format.py --players 6 --out bench_wire.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JOURNAL_DIR", "")
+os.environ.setdefault("STATS_DB", "")
+os.environ["METRICS"] = "0"
+os.environ["RATE_LIMIT"] = "0"  # 한 클라이언트가 몰아서 보내는 벤치라 소켓별 제한은 끈다
+# 타이머가 끼어들지 않도록 넉넉하게, 투표 현황은 바로 보낸다
+for key in ("HINT_SECONDS", "DISCUSSION_SECONDS", "GUESS_SECONDS"):
+    os.environ[key] = "3600"
+os.environ["VOTE_FLUSH_MS"] = "0"
+
+import app as server  # noqa: E402
+from app import app, socketio, HOST_CODE  # noqa: E402
+from liar.wire import WirePacket, event_name, msgpack  # noqa: E402
+
+
+def play_round(players, seed, fmt):
+    rng = random.Random(seed)
+    gs = server.ROOMS.create()
+    manager = socketio.server.manager
+    clients = [socketio.test_client(app) for _ in range(players)]
+    for i, c in enumerate(clients):
+        c.emit("register", {"name": "플레이어%d" % i, "room": gs.code, "token": "%s-%d" % (gs.code, i)})
+    clients[0].emit("claim_host", {"code": HOST_CODE})
+    # 로비 변경 묶음이 다 나간 뒤부터 센다
+    socketio.sleep(server.LOBBY_FLUSH_SECONDS * 3)
+
+    pid_of = {c.eio_sid: gs.pid_of_sid[manager.sid_from_eio_sid(c.eio_sid, "/")] for c in clients}
+    if fmt == "msgpack":
+        manager.msgpack_eio.update(pid_of)
+
+    counts, sent = {}, []
+
+    def record(eio_sid, pkt):
+        data = pkt.data
+        size = len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+        name = event_name(data)
+        n, b = counts.get(name, (0, 0))
+        counts[name] = (n + 1, b + size)
+        sent.append(data)
+
+    def votes():
+        pids = list(gs.players)
+        for c in clients:
+            me = pid_of[c.eio_sid]
+            c.emit("cast_vote", {"target": rng.choice([p for p in pids if p != me])})
+            socketio.sleep(0)
+
+    saved = socketio.server._send_eio_packet
+    socketio.server._send_eio_packet = record
+    try:
+        host = clients[0]
+        host.emit("start_game")
+        for i in range(players):
+            host.emit("hint_next", {"index": i})
+        host.emit("start_discussion")
+        host.emit("start_vote1")
+        votes()
+        socketio.sleep(0.02)
+        host.emit("close_vote1")
+        host.emit("start_hint2")
+        for i in range(players):
+            host.emit("hint_next", {"index": i})
+        host.emit("start_vote2")
+        votes()
+        socketio.sleep(0.02)
+        host.emit("close_vote2")
+        if gs.phase == "liar_guess":
+            liar = next(c for c in clients if pid_of[c.eio_sid] == gs.liar_pid)
+            liar.emit("liar_guess", {"guess": "?"})
+        socketio.sleep(0.02)
+    finally:
+        socketio.server._send_eio_packet = saved
+        manager.msgpack_eio.difference_update(pid_of)
+        for c in clients:
+            c.disconnect()
+    return counts, sent
+
+
+def summarize(counts):
+    events = {name: {"messages": n, "bytes": b} for name, (n, b) in
+              sorted(counts.items(), key=lambda kv: -kv[1][1])}
+    return {"bytes_per_round": sum(b for _, b in counts.values()),
+            "messages_per_round": sum(n for n, _ in counts.values()),
+            "events": events}
+
+
+def measure_cpu(sent, repeat):
+    # 같은 패킷들을 형식별로 인코딩(서버) / 디코딩(수신 측) 하는 시간
+    packets = [WirePacket(encoded_packet=data) for data in sent]
+    out = {"packets": len(packets)}
+    for label, enc in (("json", lambda p: p.encode()), ("msgpack", lambda p: p.encode_msgpack())):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            blobs = [enc(p) for p in packets]
+        encode_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for b in blobs:
+                WirePacket(encoded_packet=b)
+        decode_s = time.perf_counter() - t0
+        n = repeat * len(packets)
+        out[label] = {"encode_us": encode_s / n * 1e6, "decode_us": decode_s / n * 1e6}
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=6)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    report = {"players": args.players}
+    counts, sent = play_round(args.players, args.seed, "json")
+    report["json"] = summarize(counts)
+    if msgpack is not None:
+        counts, _ = play_round(args.players, args.seed, "msgpack")
+        report["msgpack"] = summarize(counts)
+        report["msgpack_vs_json"] = report["msgpack"]["bytes_per_round"] / report["json"]["bytes_per_round"]
+        report["cpu"] = measure_cpu([d for d in sent if isinstance(d, str)], args.repeat)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
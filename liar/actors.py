@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import threading
+import traceback
+from collections import deque
+
+
+class RoomActors:
+    # 방마다 우편함 하나 (액터). 같은 방으로 가는 일(소켓 이벤트, 타이머, 관전 스냅샷)은
+    # 도착한 순서대로 한 번에 하나씩 처리되고, 다른 방끼리는 서로 기다리지 않는다.
+    #
+    # 따로 일꾼을 띄우지 않는다: 우편함이 비어 있으면 보낸 쪽이 그 자리에서 처리하고
+    # (보통의 경우, 추가 비용은 dict 조회 한 번), 누가 이미 그 방 일을 하고 있으면 넣어 두기만 한다.
+    # 그러면 지금 처리 중인 쪽이 자기 일을 마친 뒤 쌓인 것까지 비운다. 방 안에서 자기 방으로
+    # 다시 보내는 것도 같은 규칙이라, 처리 중에 끼어들지 않고 순서 맨 뒤에 붙는다.
+    #
+    # lock은 우편함 dict/deque를 만지는 동안만 잡는다 (일 자체는 잠금 밖). 허브/이벤트 루프
+    # 하나에서만 돌 때는 경합이 없고, OS 스레드 여러 개가 일을 보내도 방 상태는 한 번에 한 스레드만.
+    # direct=True면 우편함 없이 바로 실행 (비교 벤치용).
+    def __init__(self, direct=False, lock=None):
+        self.direct = direct
+        self.lock = lock or threading.Lock()
+        self.boxes = {}  # key -> deque[(fn, args)] (그 방 일을 누군가 처리하는 동안만 존재)
+        self.processed = 0
+        self.deferred = 0  # 다른 일이 끝나기를 기다렸던 일
+        self.errors = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def tell(self, key, fn, *args):
+        # 지금 여기서 처리했으면 True, 앞선 일 뒤에 줄 세웠으면 False
+        if self.direct:
+            self._call(fn, args)
+            return True
+        with self.lock:
+            box = self.boxes.get(key)
+            if box is not None:
+                box.append((fn, args))
+                self.deferred += 1
+                if len(box) > self.max_depth:
+                    self.max_depth = len(box)
+                return False
+            box = self.boxes[key] = deque()
+        while True:
+            self._call(fn, args)
+            with self.lock:
+                if not box:
+                    del self.boxes[key]
+                    return True
+                fn, args = box.popleft()
+
+    def _call(self, fn, args):
+        # 한 일이 실패해도 같은 방의 다음 일은 계속 (타이머 스케줄러와 같은 취급)
+        try:
+            fn(*args)
+        except Exception:
+            self.errors += 1
+            traceback.print_exc()
+        self.processed += 1
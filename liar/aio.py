@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# ASYNC_MODE=asgi 용: python-socketio AsyncServer를 flask_socketio.SocketIO처럼 쓸 수 있게 맞춘 얇은 층.
+# 게임 로직(app.py)은 그대로 동기 함수이고, 이벤트 루프 스레드 하나에서만 돈다
+# (eventlet 허브에서 그린렛들이 번갈아 돌던 것과 같은 모델). 그래서 잠금이 필요 없다.
+import asyncio
+import contextvars
+import io
+import sys
+import traceback
+
+import socketio
+from flask import request as flask_request
+
+from liar.wire import AsyncWireManager
+
+_sid = contextvars.ContextVar("sid", default=None)
+_current = None  # 지금 떠 있는 AsyncSocketIO (emit/join_room/leave_room이 찾아 씀)
+
+
+class _Request:
+    # 소켓 핸들러 안에서는 request.sid, 나머지(HTTP 라우트의 form/args 등)는 Flask request 그대로
+    @property
+    def sid(self):
+        return _sid.get()
+
+    def __getattr__(self, name):
+        return getattr(flask_request, name)
+
+
+request = _Request()
+
+
+def emit(event, data=None, to=None, room=None, **kwargs):
+    # 핸들러 안에서 대상 없이 부르면 보낸 사람에게 (flask_socketio.emit과 같다)
+    _current.emit(event, data, to=to or room or _sid.get(), **kwargs)
+
+
+def join_room(room, sid=None, namespace="/"):
+    _current.server.manager.basic_enter_room(sid or _sid.get(), namespace, room)
+
+
+def leave_room(room, sid=None, namespace="/"):
+    _current.server.manager.basic_leave_room(sid or _sid.get(), namespace, room)
+
+
+class AsyncSocketIO:
+    def __init__(self, app, **kwargs):
+        global _current
+        kwargs.setdefault("client_manager", AsyncWireManager())
+        self.app = app
+        self.server = socketio.AsyncServer(async_mode="asgi", **kwargs)
+        # Flask 라우트도 같은 루프에서 바로 실행한다 (짧은 템플릿 렌더링뿐이라 스레드로 넘기지 않음, offload_routes 제외)
+        self.http = WSGIApp(app)
+        self.asgi_app = socketio.ASGIApp(self.server, other_asgi_app=self.http)
+        _current = self
+
+    def offload_routes(self, prefixes, executor):
+        # 디스크를 읽는 라우트(예: 전적 DB)는 루프 대신 executor 스레드에서 통째로 실행한다
+        self.http.offloaded.extend((prefix, executor) for prefix in prefixes)
+
+    def on(self, event, namespace="/"):
+        def decorator(fn):
+            def handler(sid, *args):
+                if event == "connect":
+                    args = ()  # (environ, auth): app.py 핸들러는 인자를 받지 않는다
+                elif event == "disconnect":
+                    args = args[:1]  # (reason,) — 예전 버전처럼 아무것도 안 주면 빈 채로
+                token = _sid.set(sid)
+                try:
+                    return fn(*args)
+                finally:
+                    _sid.reset(token)
+            self.server.on(event, handler, namespace=namespace)
+            return fn
+        return decorator
+
+    def emit(self, event, data=None, to=None, room=None, skip_sid=None, namespace="/"):
+        # 동기 코드에서 바로 부를 수 있는 emit: 받을 사람과 인코딩은 지금 정하고
+        # 실제 전송만 태스크 하나에 맡긴다. 태스크는 만든 순서대로 시작하고, 소켓 큐가
+        # 무제한이라 중간에 양보하지 않으므로 같은 소켓으로 가는 메시지 순서가 유지된다.
+        out = self.server.manager.fanout(event, data, namespace, to or room, skip_sid)
+        if out:
+            asyncio.get_running_loop().create_task(self._send_all(out))
+
+    def emit_spread(self, event, data, room, chunk, namespace="/"):
+        # 큰 채널용: chunk개 보낼 때마다 루프를 양보한다. 그 사이 다른 emit이 끼어들 수 있으니
+        # 이 채널로는 다른 이벤트를 보내지 않는 경우에만 (관전 스냅샷)
+        out = self.server.manager.fanout(event, data, namespace, room)
+        if out:
+            asyncio.get_running_loop().create_task(self._send_all(out, chunk))
+
+    async def _send_all(self, out, chunk=None):
+        send = self.server._send_eio_packet
+        for i, (eio_sid, pkt) in enumerate(out):
+            if chunk and i and i % chunk == 0:
+                await asyncio.sleep(0)
+            try:
+                await send(eio_sid, pkt)
+            except Exception:
+                # 그 사이 끊긴 소켓 등: 나머지 사람에게는 계속 보낸다
+                pass
+
+    def sleep(self, seconds=0):
+        return self.server.sleep(seconds)
+
+    def start_background_task(self, target, *args, **kwargs):
+        return self.server.start_background_task(target, *args, **kwargs)
+
+    def every(self, interval, fn, *args):
+        # interval: 초, 또는 다음 대기 시간을 돌려주는 함수 (타이머 스케줄러)
+        async def loop():
+            while True:
+                await asyncio.sleep(interval() if callable(interval) else interval)
+                try:
+                    fn(*args)
+                except Exception:
+                    traceback.print_exc()
+        return self.server.start_background_task(loop)
+
+    def run(self, app=None, host="0.0.0.0", port=10000):
+        import uvicorn
+        uvicorn.run(self.asgi_app, host=host, port=port, log_level="warning")
+
+
+class WSGIApp:
+    # 최소 WSGI → ASGI 어댑터 (HTTP만). 응답은 한 번에 모아서 보낸다.
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self.offloaded = []  # [(경로 접두사, executor)]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        environ = self.environ(scope, body)
+        executor = next((ex for prefix, ex in self.offloaded if scope["path"].startswith(prefix)), None)
+        if executor is None:
+            status, headers, chunks = self.respond(environ)
+        else:
+            status, headers, chunks = await asyncio.get_running_loop().run_in_executor(executor, self.respond, environ)
+        await send({
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+        })
+        await send({"type": "http.response.body", "body": chunks})
+
+    def respond(self, environ):
+        status_headers = []
+
+        def start_response(status, headers, exc_info=None):
+            status_headers[:] = [status, headers]
+
+        result = self.wsgi_app(environ, start_response)
+        try:
+            chunks = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return status_headers[0], status_headers[1], chunks
+
+    @staticmethod
+    def environ(scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": "HTTP/%s" % scope.get("http_version", "1.1"),
+            "REMOTE_ADDR": client[0],
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1")
+            value = value.decode("latin-1")
+            if name == "content-type":
+                key = "CONTENT_TYPE"
+            elif name == "content-length":
+                key = "CONTENT_LENGTH"
+            else:
+                key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = environ[key] + "," + value if key in environ else value
+        return environ
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 사항: 없으면 gzip만
+    brotli = None
+
+
+class Asset:
+    # 파일 하나의 내용 해시 이름과 미리 압축해 둔 변형들
+    __slots__ = ("name", "hashed", "mimetype", "etag", "variants")
+
+    def __init__(self, name, data):
+        digest = hashlib.sha256(data).hexdigest()
+        stem, ext = os.path.splitext(name)
+        self.name = name
+        self.hashed = "%s.%s%s" % (stem, digest[:10], ext)
+        self.mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.etag = digest[:16]
+        self.variants = {"identity": data, "gzip": gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(data, quality=11)
+
+    def pick(self, accept):
+        # 브라우저가 받는 것 중 가장 작은 변형 (br → gzip → 원본). accept: werkzeug Accept
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accept[encoding] > 0:
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+class AssetBundle:
+    # static/ 파일을 내용 해시가 붙은 이름으로 서빙한다.
+    # 이름이 내용과 함께 바뀌므로 브라우저는 1년 동안 캐시해도 되고,
+    # 압축은 요청마다 하지 않고 파일이 바뀔 때 한 번만 한다.
+    def __init__(self, root, names):
+        self.root = root
+        self.names = tuple(names)
+        self.by_name = {}
+        self.by_hashed = {}
+        self._mtimes = None
+        self._lock = threading.Lock()
+        self.check()
+
+    def _stat(self):
+        out = {}
+        for name in self.names:
+            try:
+                out[name] = os.stat(os.path.join(self.root, name)).st_mtime_ns
+            except OSError:
+                pass
+        return out
+
+    def check(self):
+        mtimes = self._stat()
+        if mtimes == self._mtimes:
+            return False
+        with self._lock:
+            for name, mtime in mtimes.items():
+                if self._mtimes and self._mtimes.get(name) == mtime:
+                    continue
+                with open(os.path.join(self.root, name), "rb") as f:
+                    asset = Asset(name, f.read())
+                self.by_name[name] = asset
+                # 예전 이름도 남겨 둔다: 캐시된 페이지가 옛 해시로 요청해도 받을 수 있게
+                self.by_hashed[asset.hashed] = asset
+            self._mtimes = mtimes
+        return True
+
+    def url_name(self, name):
+        asset = self.by_name.get(name)
+        return asset.hashed if asset else None
+
+    def get(self, hashed):
+        return self.by_hashed.get(hashed)
+
+    def stats(self):
+        return {name: {enc: len(data) for enc, data in a.variants.items()}
+                for name, a in self.by_name.items()}
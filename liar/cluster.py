@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import os
+import socket
+import time
+import traceback
+
+
+def worker_id():
+    return "%s-%d" % (socket.gethostname(), os.getpid())
+
+
+class Cluster:
+    # 여러 워커(프로세스)가 방을 나눠 맡는다 (liar/store.py).
+    # 방마다 주인 워커 하나가 상태를 메모리에 들고 그 방 우편함(liar/actors.py)을 돌린다.
+    # 다른 워커에 붙은 플레이어의 이벤트는 방 작업(함수 이름 + JSON 인자) 그대로 주인의 inbox 채널로 넘긴다.
+    #
+    # 주인 조회는 로컬 캐시에서: 주인이 바뀌거나 방이 사라지면 'owners' 채널로 무효화하고,
+    # 주인이 죽어서 무효화를 못 보낸 경우를 위해 항목은 ttl의 절반이 지나면 다시 확인한다.
+    # 그래서 cast_vote/hint_next 같은 이벤트마다 저장소를 조회하지 않는다 (주인 워커에서는 네트워크 0회).
+    # 주인은 바뀐 방 문서를 flush 때 묶어서 저장하고 주인 표시를 연장한다. 주인이 사라지면
+    # 다음으로 그 방을 찾는 워커가 마지막 문서로 이어받는다 (adopt). 연장할 때 주인 표시가 이미 다른 워커 것이면
+    # (이 워커가 ttl보다 오래 멈춰 있던 사이 이어받았다) 그 방을 owned에서 빼고 evict로 로컬 상태를 버린다.
+    def __init__(self, store, worker=None, ttl=15, clock=time.monotonic):
+        self.store = store
+        self.worker = worker or worker_id()
+        self.ttl = ttl
+        self.clock = clock
+        self.shared = store.shared
+        self.owners = {}  # code -> (owner, fetched_at)
+        self.owned = set()
+        self.dirty = set()
+        self.tasks = {}  # 이름 -> 방 작업 함수 (다른 워커가 이름으로 부른다)
+        self.deliver = None  # (code, fn, args) -> 이 워커 우편함에 넣기
+        self.adopt = None  # (doc) -> 저장소 문서로 방을 이 워커에 세우기
+        self.evict = None  # (code) -> 다른 워커로 넘어간 방을 이 워커에서 내리기
+        self.last_renew = clock()
+        self.forwarded = 0
+        self.received = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.adopted = 0
+        self.lost = 0
+
+    def task(self, fn):
+        self.tasks[fn.__name__] = fn
+        return fn
+
+    def inbox(self, worker=None):
+        return "w:" + (worker or self.worker)
+
+    # ------------ ownership ------------
+    def claim(self, code):
+        # 새 방: 다른 워커가 같은 코드를 이미 쓰고 있으면 False
+        if self.store.claim(code, self.worker, self.ttl) != self.worker:
+            return False
+        self.owned.add(code)
+        self.owners[code] = (self.worker, self.clock())
+        return True
+
+    def release(self, code):
+        self.owned.discard(code)
+        self.dirty.discard(code)
+        self.owners.pop(code, None)
+        self.store.drop(code)
+        if self.shared:
+            self.store.publish("owners", [code])
+
+    def owner_of(self, code):
+        now = self.clock()
+        hit = self.owners.get(code)
+        if hit is not None and now - hit[1] < self.ttl / 2.0:
+            self.cache_hits += 1
+            return hit[0]
+        self.cache_misses += 1
+        owner = self.store.owner(code)
+        if owner is None:
+            owner = self._adopt(code)
+        if owner is None:
+            self.owners.pop(code, None)
+        else:
+            self.owners[code] = (owner, now)
+        return owner
+
+    def _adopt(self, code):
+        # 주인 표시가 만료된 방: 문서가 남아 있으면 이 워커가 이어받는다
+        doc = self.store.load(code)
+        if doc is None:
+            return None
+        owner = self.store.claim(code, self.worker, self.ttl)
+        if owner == self.worker:
+            self.owned.add(code)
+            self.adopted += 1
+            self.adopt(doc)
+            self.store.publish("owners", [code])
+        return owner
+
+    # ------------ messages ------------
+    def forward(self, code, fn, args, hops=0):
+        owner = self.owner_of(code)
+        if owner is None:
+            return False
+        if owner == self.worker:
+            self.deliver(code, fn, args)
+            return True
+        if fn.__name__ not in self.tasks:
+            return False  # 타이머 등 이 워커 안에서만 도는 작업: 방이 떠났으면 버린다
+        self.forwarded += 1
+        self.store.publish(self.inbox(owner), [code, fn.__name__, list(args), hops])
+        return True
+
+    def on_message(self, channel, message):
+        try:
+            if channel == "owners":
+                self.owners.pop(message[0], None)
+                return
+            code, name, args, hops = message
+            self.received += 1
+            if code in self.owned:
+                self.deliver(code, self.tasks[name], args)
+            elif hops < 2:
+                # 그사이 주인이 바뀌었다: 캐시를 버리고 다시 찾아서 넘긴다
+                self.owners.pop(code, None)
+                self.forward(code, self.tasks[name], args, hops + 1)
+        except Exception:
+            traceback.print_exc()
+
+    def listen(self):
+        self.store.listen([self.inbox(), "owners"], self.on_message)
+
+    # ------------ write-behind ------------
+    def touch(self, code):
+        if self.shared:
+            self.dirty.add(code)
+
+    def flush(self, dump):
+        # ttl/3마다 주인 표시를 연장하고 (빼앗긴 방은 내린다), 아직 이 워커 것인 방의 바뀐 문서를 한 번에 저장한다
+        now = self.clock()
+        if self.owned and now - self.last_renew > self.ttl / 3.0:
+            self.last_renew = now
+            for code in self.store.renew(self.worker, list(self.owned), self.ttl):
+                self._lose(code)
+        if self.dirty:
+            dirty, self.dirty = self.dirty, set()
+            docs = {}
+            for code in dirty:
+                doc = dump(code)
+                if doc is not None:
+                    docs[code] = doc
+            if docs:
+                self.store.save(docs)
+
+    def _lose(self, code):
+        # 새 주인의 문서를 덮어쓰지 않도록 저장도 하지 않는다. 이후 이 방 작업은 forward로 새 주인에게
+        self.owned.discard(code)
+        self.dirty.discard(code)
+        self.owners.pop(code, None)
+        self.lost += 1
+        if self.evict is not None:
+            self.evict(code)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+import random
+from enum import StrEnum
+
+from liar.tally import VoteTally
+
+
+# 단계와 역할은 정해진 값 몇 개뿐이라 enum 멤버 하나씩만 두고 방마다 그것을 가리킨다
+# (저널/저장소에서 읽은 문자열도 멤버로 바꿔 두므로 방마다 문자열 사본이 생기지 않는다).
+# StrEnum이라 == "vote1" 비교, JSON/MessagePack 인코딩은 그대로 문자열.
+class Phase(StrEnum):
+    # 한 판의 흐름. discussion/vote1은 건너뛸 수 있고(호스트), liar_guess는 라이어가 지목됐을 때만.
+    LOBBY = "lobby"
+    HINT1 = "hint1"
+    DISCUSSION = "discussion"
+    VOTE1 = "vote1"
+    HINT2 = "hint2"
+    VOTE2 = "vote2"
+    LIAR_GUESS = "liar_guess"
+    RESULTS = "results"
+    SUMMARY = "summary"
+
+
+class Role(StrEnum):
+    LIAR = "liar"
+    SPY = "spy"
+    CITIZEN = "citizen"
+
+
+SPY_MIN_PLAYERS = 7
+MIN_PLAYERS = 3
+
+
+# ------------ Rules (Engine과 밸런스 시뮬레이터의 numpy 배치가 같이 쓰는 순수 함수) ------------
+def assign_roles(pids, rng=random):
+    # 라이어 한 명, 7명 이상이면 나머지 중 스파이 한 명
+    liar = rng.choice(pids)
+    spy = None
+    if len(pids) >= SPY_MIN_PLAYERS:
+        spy = rng.choice([p for p in pids if p != liar])
+    roles = {}
+    for pid in pids:
+        if pid == liar:
+            roles[pid] = Role.LIAR
+        elif pid == spy:
+            roles[pid] = Role.SPY
+        else:
+            roles[pid] = Role.CITIZEN
+    return roles, liar, spy
+
+
+def pick_accused(tops, rng=random):
+    # 2차 투표 최다 득표자. 동률이면 그중 무작위, 표가 없으면 None
+    if not tops:
+        return None
+    if len(tops) == 1:
+        return tops[0]
+    return rng.choice(sorted(tops))
+
+
+def round_winner(liar_selected, liar_guessed_correct):
+    # 시민 승리: 라이어를 정확히 지목했고 라이어가 제시어를 못 맞힘. 나머지는 라이어팀 승리
+    if liar_selected and not liar_guessed_correct:
+        return "citizens"
+    return "liar_team"
+
+
+def score_deltas(roles, winner):
+    # 시민 승리 → 시민 전원 +1 / 라이어팀 승리 → 라이어 +2, 스파이 +1
+    if winner == "citizens":
+        return {pid: 1 for pid, role in roles.items() if role == "citizen"}
+    return {pid: 2 if role == "liar" else 1 for pid, role in roles.items() if role in ("liar", "spy")}
+
+
+# ------------ Payloads ------------
+def role_info_payload(gs, role):
+    return {
+        "role": role,
+        "topic": gs.category,
+        "keyword": None if role == "liar" else gs.secret_word
+    }
+
+
+def hint_order_payload(gs):
+    return {
+        "order": gs.order,
+        "phase": gs.phase,
+        "round": gs.round_num
+    }
+
+
+def open_vote_payload(gs, phase):
+    return {
+        "phase": phase,
+        "players": list(gs.players)
+    }
+
+
+def current_tally(gs):
+    return gs.votes1 if gs.phase == "vote1" else gs.votes2
+
+
+def vote_progress_payload(gs, tally, votes, touched):
+    # 모두 pid: votes는 [투표자, 대상] 쌍, counts는 [대상, 득표수] 쌍 (touched: 득표수가 바뀐 대상)
+    return {
+        "phase": gs.phase,
+        "votes": votes,
+        "counts": [[t, tally.count(t)] for t in touched if t in gs.players],
+        "voted": len(tally),
+        "top": tally.leaders(),
+        "max": tally.top
+    }
+
+
+def scoreboard_payload(gs):
+    # [pid, 점수] 쌍, 점수 높은 순
+    ranked = sorted(gs.players.items(), key=lambda kv: (-kv[1].score, kv[1].name))
+    return {"scores": [[pid, info.score] for pid, info in ranked]}
+
+
+# ------------ State machine ------------
+SENDER = "sender"  # 이벤트 받는 쪽: None은 테이블 전체, Role은 그 역할인 사람들, SENDER는 명령을 보낸 사람
+
+# 호스트가 넘기는 단계는 바로 앞 단계에서만 (늦게/두 번 누른 것이 서버 타이머가 넘긴 단계를 되돌리지 않도록)
+AFTER = {
+    Phase.DISCUSSION: (Phase.HINT1,),
+    Phase.VOTE1: (Phase.HINT1, Phase.DISCUSSION),
+    Phase.HINT2: (Phase.DISCUSSION, Phase.VOTE1),
+    Phase.VOTE2: (Phase.DISCUSSION, Phase.VOTE1, Phase.HINT2),
+}
+
+
+class Engine:
+    # 한 테이블의 규칙만 담은 상태 기계. 방 상태(GameState)를 받아 바꾸고 보낼 이벤트
+    # [(event, payload, to)]를 돌려준다. 소켓/타이머/저널/전적은 모른다 (app.py가 이벤트를 보며 처리).
+    # 잘못된 단계의 명령은 조용히 무시한다 (빈 목록). 같은 seed와 같은 명령 순서면 항상 같은 결과.
+    # 시간 초과도 명령이다: 발언은 next_hint(다음 index), 토론은 open_vote(vote1), 정답은 guess(라이어, None).
+    def __init__(self, seed=None, rng=None, draw_topic=None):
+        self.rng = rng or random.Random(seed)
+        self.draw_topic = draw_topic or (lambda gs, rng: ("주제", "제시어"))
+
+    # ------------ rounds ------------
+    def start(self, gs):
+        # 게임 처음부터 (진행 중이면 다시). 점수는 방에 남는다
+        if len(gs.players) < MIN_PLAYERS:
+            return [("error", {"message": "최소 3명 이상이 필요합니다."}, SENDER)]
+        gs.round_num = 0
+        gs.final_scores = None
+        return self.begin_round(gs)
+
+    def next_round(self, gs):
+        # 결과 화면에서만. 마지막 라운드였으면 요약 (이미 요약이면 무시: 전적이 두 번 쌓이지 않게)
+        if gs.phase != Phase.RESULTS:
+            return []
+        if gs.round_num >= gs.max_rounds:
+            gs.phase = Phase.SUMMARY
+            gs.final_scores = scoreboard_payload(gs)
+            return [("final_scores", gs.final_scores, None)]
+        if len(gs.players) < MIN_PLAYERS:
+            return [("error", {"message": "최소 3명 이상이 필요합니다."}, SENDER)]
+        return self.begin_round(gs)
+
+    def begin_round(self, gs):
+        # 단계 확인 없이 새 라운드: 역할, 제시어, 1차 힌트 순서
+        gs.roles, gs.liar_pid, gs.spy_pid = assign_roles(list(gs.players), self.rng)
+        gs.category, gs.secret_word = self.draw_topic(gs, self.rng)
+        gs.round_num += 1
+        gs.votes1 = VoteTally()
+        gs.votes2 = VoteTally()
+        gs.last_result = None
+        # 역할 정보는 역할마다 한 번 (테이블 크기와 무관하게 최대 3개)
+        events = [("role_info", role_info_payload(gs, role), role)
+                  for role in Role if role is not Role.SPY or gs.spy_pid is not None]
+        events.append(("game_started", {"round": gs.round_num}, None))
+        return events + self._begin_hints(gs, Phase.HINT1)
+
+    # ------------ hints ------------
+    def _begin_hints(self, gs, phase):
+        gs.phase = phase
+        gs.order = list(gs.players)
+        self.rng.shuffle(gs.order)
+        gs.hint_index = -1
+        return [("hint_order", hint_order_payload(gs), None)] + self.next_hint(gs, 0)
+
+    def next_hint(self, gs, idx):
+        # idx번째 사람부터 (나간 사람은 건너뛴다). 발언이 모두 끝나면 다음 단계로.
+        # 이미 지난/지금 차례로는 돌아가지 않는다: 타이머가 넘긴 뒤 늦게 온 '다음 차례'나
+        # '1차 힌트'(index 0)가 같은 사람을 다시 세우거나 라운드를 처음으로 되돌리지 않게
+        if gs.phase not in (Phase.HINT1, Phase.HINT2) or idx <= gs.hint_index:
+            return []
+        return self._hint(gs, idx)
+
+    def _hint(self, gs, idx):
+        while idx < len(gs.order) and gs.order[idx] not in gs.players:
+            idx += 1
+        if idx >= len(gs.order):
+            if gs.phase == Phase.HINT1:
+                return self.start_discussion(gs)
+            return self.open_vote(gs, Phase.VOTE2)
+        gs.hint_index = idx
+        # 이름은 보내지 않는다: 클라이언트가 로비 명단(pid -> 이름)에서 찾아 쓴다
+        return [("hint_turn", {"index": idx, "pid": gs.order[idx]}, None)]
+
+    def start_discussion(self, gs):
+        if gs.phase not in AFTER[Phase.DISCUSSION]:
+            return []
+        gs.phase = Phase.DISCUSSION
+        return [("start_timer", {"phase": gs.phase}, None)]
+
+    def start_hint2(self, gs):
+        if gs.phase not in AFTER[Phase.HINT2]:
+            return []
+        return self._begin_hints(gs, Phase.HINT2)
+
+    # ------------ votes ------------
+    def open_vote(self, gs, phase):
+        phase = Phase(phase)
+        if gs.phase not in AFTER[phase]:
+            return []
+        gs.phase = phase
+        return [("open_vote", open_vote_payload(gs, phase), None)]
+
+    def cast_vote(self, gs, voter, target):
+        if gs.phase not in (Phase.VOTE1, Phase.VOTE2) or voter not in gs.players or target not in gs.players:
+            return []
+        if target == voter:
+            return [("error", {"message": "자기 자신에게는 투표할 수 없습니다."}, SENDER)]
+        tally = current_tally(gs)
+        prev = tally.cast(voter, target)
+        if prev == target:
+            return []
+        touched = [target] if prev is None else [target, prev]
+        return [("vote_progress", vote_progress_payload(gs, tally, [[voter, target]], touched), None)]
+
+    def close_vote(self, gs, phase):
+        if gs.phase != phase:
+            return []
+        tally = current_tally(gs)
+        tops = tally.leaders()
+        events = [("vote_closed", {"phase": gs.phase, "top": tops, "max": tally.top}, None)]
+        if gs.phase == Phase.VOTE1:
+            # 1차 투표는 참고용: 결과와 상관없이 호스트가 2차 힌트로 넘긴다
+            return events
+        # 2차 투표 최다 득표자가 라이어면 정답 기회, 아니면 라이어팀 승리
+        accused = pick_accused(tops, self.rng)
+        if accused is not None and accused == gs.liar_pid:
+            gs.phase = Phase.LIAR_GUESS
+            return events + [("liar_selected", {"liar_pid": gs.liar_pid, "category": gs.category}, None)]
+        return events + self._finish(gs, False, None, accused)
+
+    # ------------ result ------------
+    def guess(self, gs, pid, word):
+        if gs.phase != Phase.LIAR_GUESS or pid != gs.liar_pid:
+            return []
+        return self._finish(gs, True, word == gs.secret_word, gs.liar_pid)
+
+    def _finish(self, gs, selected, correct, accused):
+        winner = round_winner(selected, correct)
+        # 이미 나간 사람은 건너뛴다
+        for pid, delta in score_deltas(gs.roles, winner).items():
+            if pid in gs.players:
+                gs.players[pid].score += delta
+        gs.phase = Phase.RESULTS
+        gs.last_result = {
+            "winner": winner,
+            "liar_selected": selected,
+            "liar_guessed_correct": correct,
+            "secret_word": gs.secret_word,
+            "category": gs.category,
+            "accused": accused
+        }
+        return [("round_result", gs.last_result, None)]
+
+    def resume(self, gs):
+        # 복구 직후: 진행 중이던 시간제 단계를 처음부터 다시 알린다
+        if gs.phase in (Phase.HINT1, Phase.HINT2):
+            return self._hint(gs, max(gs.hint_index, 0))
+        if gs.phase == Phase.DISCUSSION:
+            return [("start_timer", {"phase": gs.phase}, None)]
+        if gs.phase == Phase.LIAR_GUESS and gs.liar_pid in gs.players:
+            return [("liar_selected", {"liar_pid": gs.liar_pid, "category": gs.category}, None)]
+        return []
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from collections import deque
+from itertools import islice
+
+
+class EventLog:
+    # 방 단위 고정 크기 링 버퍼. 방송한 이벤트에 순번(seq)을 붙여 최근 maxlen개만 보관한다.
+    # 재접속한 클라이언트가 마지막으로 본 seq를 보내면 놓친 것만 골라 다시 보낼 수 있다.
+    # 빈 deque도 블록 하나(수백 바이트)를 잡으므로 버퍼는 첫 방송 때 만든다 (그전엔 빈 튜플).
+    __slots__ = ("seq", "maxlen", "buf")
+
+    def __init__(self, maxlen=256):
+        self.seq = 0
+        self.maxlen = maxlen
+        self.buf = ()  # (seq, event, payload)
+
+    def append(self, event, payload):
+        self.seq += 1
+        if not self.buf:
+            self.buf = deque(maxlen=self.maxlen)
+        self.buf.append((self.seq, event, payload))
+        return self.seq
+
+    def first_seq(self):
+        return self.buf[0][0] if self.buf else self.seq + 1
+
+    def since(self, last_seq):
+        # last_seq 이후 이벤트 목록. 버퍼 밖으로 밀려났으면 None (스냅샷으로 대체)
+        if last_seq is None or last_seq > self.seq:
+            return None
+        if last_seq == self.seq:
+            return []
+        start = last_seq + 1 - self.first_seq()
+        if start < 0:
+            return None
+        return [(event, payload) for _, event, payload in islice(self.buf, start, None)]
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+import glob
+import json
+import logging
+import os
+import time
+from collections import deque
+
+from liar.engine import Phase, Role
+from liar.rooms import GameState, Player
+from liar.tally import VoteTally
+
+SNAPSHOT_NAME = "snapshot.json"
+SEGMENT_PATTERN = "journal-%08d.log"
+
+log = logging.getLogger(__name__)
+
+
+# ------------ Append-only journal (group commit) ------------
+class Journal:
+    # 상태 변경 기록을 한 줄짜리 JSON으로 모아 두었다가 interval마다 한 번에 write + fsync.
+    # 디스크 I/O는 offload(예: eventlet.tpool.execute)로 OS 스레드에서 돌려 허브를 막지 않는다.
+    # offload는 넘겨받은 순서대로 실행해야 한다 (tpool처럼 끝날 때까지 기다리거나,
+    # asyncio 모드처럼 스레드 하나짜리 executor에 넣고 바로 돌아오거나).
+    def __init__(self, dirpath, offload=None, interval=0.02, clock=time.perf_counter):
+        self.dirpath = dirpath
+        self.offload = offload or (lambda fn, *args: fn(*args))
+        self.interval = interval
+        self.clock = clock
+        self.pending = []
+        self.segment = 0
+        self.fh = None
+        self.fh_segment = None
+        self.last_snapshot = clock()
+        self.lsn = 0  # 지금까지 append된 기록 수
+        self.commits = 0
+        self.committed = 0
+        self.bytes = 0
+        self.commit_ms = deque(maxlen=10000)
+        self.snapshots = 0
+        self.failures = 0
+        os.makedirs(dirpath, exist_ok=True)
+
+    def append(self, rec):
+        self.lsn += 1
+        self.pending.append(rec)
+
+    # ------------ writing ------------
+    def _offload(self, fn, *args):
+        # offload가 결과를 기다리지 않을 수도 있다 (asyncio의 executor.submit은 아무도 읽지 않는 Future):
+        # 쓰기 실패(fsync 오류, 디스크 가득, 권한)는 그 스레드 안에서 남기고 센다
+        def run():
+            try:
+                fn(*args)
+            except Exception:
+                self.failures += 1
+                if self.fh is not None:
+                    self.fh.close()  # 다음 쓰기는 파일을 새로 연다
+                    self.fh = None
+                log.exception("journal %s failed", fn.__name__)
+        self.offload(run)
+
+    def _segment_path(self, segment):
+        return os.path.join(self.dirpath, SEGMENT_PATTERN % segment)
+
+    def _segments(self):
+        out = []
+        for path in glob.glob(os.path.join(self.dirpath, "journal-*.log")):
+            try:
+                out.append(int(os.path.basename(path)[8:-4]))
+            except ValueError:
+                continue
+        return sorted(out)
+
+    def _write(self, data, segment, records):
+        # offload 스레드에서 실행: 파일 핸들은 여기서만 만진다
+        t0 = self.clock()
+        if self.fh is not None and self.fh_segment != segment:
+            self.fh.close()
+            self.fh = None
+        if self.fh is None:
+            self.fh = open(self._segment_path(segment), "ab")
+            self.fh_segment = segment
+        self.fh.write(data)
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+        self.commit_ms.append((self.clock() - t0) * 1000)
+        self.commits += 1
+        self.committed += records
+        self.bytes += len(data)
+
+    def flush(self):
+        # 쌓인 기록 전체를 한 번의 write/fsync로 (group commit)
+        if not self.pending:
+            return 0
+        batch, self.pending = self.pending, []
+        data = "".join(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for rec in batch).encode("utf-8")
+        # 세그먼트 번호는 지금 값으로 넘긴다: offload가 나중에 실행돼도 제자리에 쓰이도록
+        self._offload(self._write, data, self.segment, len(batch))
+        return len(batch)
+
+    def _write_snapshot(self, state, keep_from):
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+        path = os.path.join(self.dirpath, SNAPSHOT_NAME)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        # 스냅샷이 디스크에 자리 잡은 뒤에야 그 이전 세그먼트를 지운다
+        for segment in self._segments():
+            if segment < keep_from:
+                os.remove(self._segment_path(segment))
+        self.snapshots += 1
+
+    def snapshot(self, rooms):
+        # rooms: dump_room()으로 떠 둔 dict 목록. 새 세그먼트로 넘어간 뒤
+        # "이 세그먼트부터 다시 재생하면 된다"는 표시와 함께 원자적으로 교체한다.
+        self.flush()
+        self.segment += 1
+        state = {"segment": self.segment, "lsn": self.lsn, "rooms": rooms}
+        self._offload(self._write_snapshot, state, self.segment)
+
+    def tick(self, dump=None, snapshot_interval=60):
+        # interval마다 한 번: group commit, 주기가 되면 스냅샷
+        try:
+            self.flush()
+            if dump is not None and self.clock() - self.last_snapshot >= snapshot_interval:
+                self.last_snapshot = self.clock()
+                self.snapshot(dump())
+        except Exception:
+            log.exception("journal tick failed")
+
+    def stats(self):
+        samples = sorted(self.commit_ms)
+        pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+        return {
+            "records": self.committed,
+            "commits": self.commits,
+            "records_per_commit": self.committed / self.commits if self.commits else 0.0,
+            "bytes": self.bytes,
+            "commit_p50_ms": pick(0.50),
+            "commit_p99_ms": pick(0.99),
+            "snapshots": self.snapshots,
+            "failures": self.failures,
+        }
+
+    # ------------ reading ------------
+    def load(self):
+        # (스냅샷 방 목록, 그 뒤 기록들). 마지막 줄이 쓰다 만 채로 끊겼으면 거기서 멈춘다.
+        rooms, start = [], 0
+        path = os.path.join(self.dirpath, SNAPSHOT_NAME)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            rooms, start = state["rooms"], state["segment"]
+        records = []
+        segments = [s for s in self._segments() if s >= start]
+        for segment in segments:
+            with open(self._segment_path(segment), "rb") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+        # 이어서 쓸 세그먼트는 항상 새 파일 (잘린 꼬리 뒤에 덧붙이지 않도록)
+        self.segment = max(segments + [start]) + 1
+        return rooms, records
+
+
+# ------------ Room (de)serialization ------------
+def dump_room(gs):
+    # 재시작 후 게임을 이어가는 데 필요한 것만. 모두 새 객체라 다른 스레드에서 직렬화해도 안전.
+    # last_result/final_scores는 방송할 때 "seq"가 붙는 살아 있는 dict라 복사한다
+    # (안의 목록은 만든 뒤로 바뀌지 않으므로 한 단계 복사로 충분하다).
+    # pid(정수)를 키로 쓰는 dict는 JSON에서 문자열 키가 되므로 [pid, 값] 쌍 목록으로 저장한다.
+    return {
+        "code": gs.code,
+        "next_pid": gs.next_pid,
+        "players": [[pid, p.name, p.score] for pid, p in gs.players.items()],
+        "sessions": dict(gs.sessions),
+        "host_pid": gs.host_pid,
+        "phase": gs.phase,
+        "round_num": gs.round_num,
+        "category": gs.category,
+        "secret_word": gs.secret_word,
+        "roles": list(gs.roles.items()),
+        "order": list(gs.order),
+        "hint_index": gs.hint_index,
+        "votes1": list(gs.votes1.votes.items()),
+        "votes2": list(gs.votes2.votes.items()),
+        "last_result": dict(gs.last_result) if gs.last_result is not None else None,
+        "final_scores": dict(gs.final_scores) if gs.final_scores is not None else None,
+    }
+
+
+def load_room(d):
+    gs = GameState(d["code"])
+    gs.next_pid = d["next_pid"]
+    for pid, name, score in d["players"]:
+        gs.players[pid] = Player(name, score, away=True)
+    gs.sessions = dict(d["sessions"])
+    _set_host(gs, d["host_pid"])
+    _set_round(gs, d["round_num"], d["category"], d["secret_word"], d["roles"], d["order"])
+    gs.phase = Phase(d["phase"])
+    gs.hint_index = d["hint_index"]
+    for voter, target in d["votes1"]:
+        gs.votes1.cast(voter, target)
+    for voter, target in d["votes2"]:
+        gs.votes2.cast(voter, target)
+    gs.last_result = d["last_result"]
+    gs.final_scores = d["final_scores"]
+    return gs
+
+
+def settle_room(gs):
+    # 다시 세운 방 마무리: 로비 명단, 나간 사람을 뺀 발언 순서, 소켓 채널은 재접속 때 다시
+    for pid in sorted(gs.players):
+        gs.roster.add(pid, gs.players[pid].name)
+    gs.roster.set_host(gs.host_pid)
+    gs.roster.take_delta()
+    gs.order = [pid for pid in gs.order if pid in gs.players]
+    gs.role_channel = {}
+
+
+def _set_host(gs, pid):
+    if gs.host_pid in gs.players:
+        gs.players[gs.host_pid].is_host = False
+    gs.host_pid = pid if pid in gs.players else None
+    if gs.host_pid:
+        gs.players[gs.host_pid].is_host = True
+
+
+def _set_round(gs, round_num, category, word, roles, order):
+    gs.round_num = round_num
+    gs.category = category
+    gs.secret_word = word
+    gs.roles = {pid: Role(role) for pid, role in roles}
+    gs.liar_pid = next((p for p, r in gs.roles.items() if r is Role.LIAR), None)
+    gs.spy_pid = next((p for p, r in gs.roles.items() if r is Role.SPY), None)
+    gs.order = list(order)
+
+
+# ------------ Replay ------------
+# 기록 형식: [op, room_code, ...]
+def _op_room(rooms, code):
+    rooms[code] = GameState(code)
+
+def _op_drop(rooms, code):
+    rooms.pop(code, None)
+
+def _op_join(gs, pid, name, token):
+    if pid in gs.players:
+        gs.players[pid].name = name
+    else:
+        gs.players[pid] = Player(name, away=True)
+    gs.sessions[token] = pid
+    gs.next_pid = max(gs.next_pid, pid)
+
+def _op_leave(gs, pid):
+    if pid == gs.host_pid:
+        gs.host_pid = None
+    gs.players.pop(pid, None)
+    for token in [t for t, p in gs.sessions.items() if p == pid]:
+        del gs.sessions[token]
+    gs.roles.pop(pid, None)
+    for tally in (gs.votes1, gs.votes2):
+        tally.retract(pid)
+        tally.drop_target(pid)
+
+def _op_round(gs, round_num, category, word, roles, order):
+    _set_round(gs, round_num, category, word, roles, order)
+    gs.votes1 = VoteTally()
+    gs.votes2 = VoteTally()
+    gs.phase = Phase.HINT1
+    gs.hint_index = -1
+    gs.last_result = None
+    if round_num == 1:
+        gs.final_scores = None
+
+def _op_phase(gs, phase, hint_index, order=None):
+    gs.phase = Phase(phase)
+    gs.hint_index = hint_index
+    if order is not None:
+        gs.order = list(order)
+
+def _op_vote(gs, phase, voter, target):
+    (gs.votes1 if phase == "vote1" else gs.votes2).cast(voter, target)
+
+def _op_result(gs, scores, result):
+    for pid, score in scores:
+        if pid in gs.players:
+            gs.players[pid].score = score
+    gs.last_result = result
+    gs.phase = Phase.RESULTS
+
+def _op_final(gs, final_scores):
+    gs.final_scores = final_scores
+    gs.phase = Phase.SUMMARY
+
+ROOM_OPS = {"room": _op_room, "drop": _op_drop}
+GAME_OPS = {
+    "join": _op_join,
+    "leave": _op_leave,
+    "host": _set_host,
+    "round": _op_round,
+    "phase": _op_phase,
+    "vote": _op_vote,
+    "result": _op_result,
+    "final": _op_final,
+}
+
+
+def replay(rooms, records):
+    for rec in records:
+        op, code, args = rec[0], rec[1], rec[2:]
+        if op in ROOM_OPS:
+            ROOM_OPS[op](rooms, code, *args)
+            continue
+        gs = rooms.get(code)
+        if gs is not None and op in GAME_OPS:
+            GAME_OPS[op](gs, *args)
+
+
+def recover(journal, registry):
+    # 스냅샷 + 꼬리 기록으로 방을 다시 세운다. 복구된 플레이어는 모두 '자리 비움' 상태.
+    snapshot, records = journal.load()
+    rooms = {}
+    for d in snapshot:
+        rooms[d["code"]] = load_room(d)
+    replay(rooms, records)
+    for gs in rooms.values():
+        settle_room(gs)
+    registry.rooms.update(rooms)
+    return list(rooms.values())
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import inspect
+import time
+
+from liar.wire import event_name
+
+
+class RateLimiter:
+    # 소켓(sid)마다, 이벤트마다 토큰 버킷 하나. 초당 rate개씩 차고 최대 burst개까지 모인다.
+    # 토큰이 없으면 핸들러를 부르지 않고 조용히 버린다 (잘못된 단계의 명령과 같은 취급).
+    # 호스트 전용 이벤트는 별도 표(host_limits)를 쓴다.
+    def __init__(self, limits, host_limits=None, default=(5.0, 10), clock=time.monotonic):
+        self.limits = dict(limits)
+        self.host_limits = dict(host_limits or {})
+        self.default = default
+        self.clock = clock
+        self.buckets = {}  # sid -> {event: [tokens, last]}
+        self.throttled = {}  # event -> count
+
+    def limit_for(self, event):
+        return self.host_limits.get(event) or self.limits.get(event) or self.default
+
+    def allow(self, sid, event):
+        rate, burst = self.limit_for(event)
+        now = self.clock()
+        buckets = self.buckets.setdefault(sid, {})
+        b = buckets.get(event)
+        if b is None:
+            buckets[event] = [burst - 1, now]
+            return True
+        tokens = min(burst, b[0] + (now - b[1]) * rate)
+        b[1] = now
+        if tokens < 1:
+            b[0] = tokens
+            self.throttled[event] = self.throttled.get(event, 0) + 1
+            return False
+        b[0] = tokens - 1
+        return True
+
+    def forget(self, sid):
+        self.buckets.pop(sid, None)
+
+    def wrap(self, event, fn):
+        def handler(sid, *args):
+            if not self.allow(sid, event):
+                return None
+            return fn(sid, *args)
+        handler.__wrapped__ = fn
+        return handler
+
+    def instrument(self, server):
+        # 등록된 핸들러를 감싼다 (connect/disconnect 제외)
+        for namespace, handlers in server.handlers.items():
+            for event, fn in list(handlers.items()):
+                if event not in ("connect", "disconnect"):
+                    handlers[event] = self.wrap(event, fn)
+
+
+class Outbox:
+    # 소켓별 송신 큐 상한 (느린 모바일 클라이언트가 서버 메모리를 키우지 못하게).
+    # 큐가 soft개를 넘으면 다음 것으로 대체되는 메시지(droppable)는 버리고,
+    # hard개를 넘으면 그 소켓을 끊는다: 클라이언트가 다시 붙으면서 last_seq로 놓친 것만 받아 간다.
+    def __init__(self, soft=32, hard=256, droppable=("spectate", "lobby_delta")):
+        self.soft = soft
+        self.hard = hard
+        self.droppable = frozenset(droppable)
+        self.dropped = {}  # event -> count
+        self.kicked = 0
+        self.kicking = set()
+        self._last_pkt = None
+        self._last_name = None
+
+    def _name(self, pkt):
+        if pkt is not self._last_pkt:
+            self._last_pkt = pkt
+            self._last_name = event_name(pkt.data)
+        return self._last_name
+
+    def _refuse(self, server, eio_sid, pkt):
+        # 보내지 않을 패킷이면 True. 큐 길이만 보고, 이름은 넘쳤을 때만 꺼낸다
+        sock = server.eio.sockets.get(eio_sid)
+        if sock is None:
+            return False
+        size = sock.queue.qsize()
+        if size < self.soft:
+            return False
+        name = self._name(pkt)
+        if name not in self.droppable and size < self.hard:
+            return False
+        self.dropped[name] = self.dropped.get(name, 0) + 1
+        if size >= self.hard and eio_sid not in self.kicking:
+            self.kicking.add(eio_sid)
+            self.kicked += 1
+            # 보내는 도중(방송 루프 안)에 disconnect 핸들러가 돌지 않게 따로 끊는다
+            server.start_background_task(self._kick, server, eio_sid)
+        return True
+
+    def install(self, server):
+        send = server._send_eio_packet
+        if inspect.iscoroutinefunction(server.eio.send):
+            async def _kick(server, eio_sid):
+                sock = server.eio.sockets.pop(eio_sid, None)
+                self.kicking.discard(eio_sid)
+                if sock is not None:
+                    await sock.close(wait=False, abort=True)
+
+            async def send_packet(eio_sid, pkt):
+                if not self._refuse(server, eio_sid, pkt):
+                    await send(eio_sid, pkt)
+        else:
+            def _kick(server, eio_sid):
+                sock = server.eio.sockets.pop(eio_sid, None)
+                self.kicking.discard(eio_sid)
+                if sock is not None:
+                    sock.close(wait=False, abort=True)
+
+            def send_packet(eio_sid, pkt):
+                if not self._refuse(server, eio_sid, pkt):
+                    return send(eio_sid, pkt)
+        self._kick = _kick
+        send_packet.__wrapped__ = send
+        server._send_eio_packet = send_packet
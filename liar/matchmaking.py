@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+import bisect
+import random
+import time
+from collections import deque
+
+from liar.rooms import ROOM_CODE_ALPHABET
+
+PARTY_CODE_LENGTH = 4
+
+
+class Ticket:
+    # 대기열의 한 줄: 혼자 또는 파티 (파티는 한 테이블에 같이 앉는다). members[0]이 파티장
+    __slots__ = ("code", "members", "held", "since", "alive")
+
+    def __init__(self, code, held, since):
+        self.code = code
+        self.members = []  # [(sid, name, token)]
+        self.held = held  # 파티장이 '매칭 시작'을 누르기 전 (대기열에 아직 없음)
+        self.since = since
+        self.alive = True
+
+    def __len__(self):
+        return len(self.members)
+
+
+class MatchQueue:
+    # 빠른 시작 대기열. 파티 크기별 deque(오래된 순)에 티켓을 넣고, pack()이 테이블을 만든다:
+    #   가장 오래 기다린 티켓부터 자리를 잡고, 남은 자리는 들어가는 가장 큰 파티부터 채운다.
+    # 테이블 하나에 크기별 deque 앞부분만 보므로 O(table_size) (대기 인원 수와 무관).
+    # 나가기/끊김은 티켓에 표시만 하고 deque에서는 앞에 왔을 때 버린다.
+    # 자리를 다 못 채워도 가장 오래 기다린 티켓이 max_wait를 넘으면 min_size 이상으로 출발한다.
+    def __init__(self, table_size=7, min_size=3, max_wait=20.0, clock=time.monotonic, rng=random):
+        self.table_size = table_size
+        self.min_size = min_size
+        self.max_wait = max_wait
+        self.clock = clock
+        self.rng = rng
+        self.buckets = [deque() for _ in range(table_size + 1)]  # 파티 크기 -> 티켓
+        self.ticket_of = {}  # sid -> Ticket
+        self.parties = {}  # 파티 코드 -> Ticket (모으는 중이거나 대기 중)
+        self.waiting = 0  # 대기열에 있는 인원 (held 제외)
+        self.tables = 0
+        self.matched = 0
+        self.waited = deque(maxlen=10000)  # 테이블에 앉기까지 걸린 시간 (사람마다)
+
+    def __len__(self):
+        return len(self.ticket_of)
+
+    def _new_code(self):
+        while True:
+            code = "".join(self.rng.choice(ROOM_CODE_ALPHABET) for _ in range(PARTY_CODE_LENGTH))
+            if code not in self.parties:
+                return code
+
+    # ------------ joining / leaving ------------
+    def join(self, sid, name, token, party=None, hold=False):
+        # party: 이미 있는 파티 코드면 그 파티에, 아니면 새 티켓 (hold면 파티장이 ready할 때까지 보류).
+        # 들어간 티켓을 돌려준다. 파티가 가득 찼거나 이미 대기열에 올라갔으면 None
+        self.leave(sid)
+        if party:
+            ticket = self.parties.get(party)
+            if ticket is None or not ticket.held or len(ticket) >= self.table_size:
+                return None
+        else:
+            ticket = Ticket(self._new_code(), hold, self.clock())
+            self.parties[ticket.code] = ticket
+        ticket.members.append((sid, name, token))
+        self.ticket_of[sid] = ticket
+        if not ticket.held and len(ticket) == 1:
+            self._enqueue(ticket)
+        return ticket
+
+    def ready(self, sid):
+        # 파티장만: 모은 파티를 대기열에 올린다
+        ticket = self.ticket_of.get(sid)
+        if ticket is None or not ticket.held or ticket.members[0][0] != sid:
+            return None
+        ticket.held = False
+        ticket.since = self.clock()
+        self._enqueue(ticket)
+        return ticket
+
+    def leave(self, sid):
+        # 티켓에서 빠진다. 바뀐 티켓(남은 사람에게 알릴 것)을 돌려준다
+        ticket = self.ticket_of.pop(sid, None)
+        if ticket is None:
+            return None
+        queued = not ticket.held and ticket.alive
+        if queued:
+            self._dequeue(ticket)
+        ticket.members = [m for m in ticket.members if m[0] != sid]
+        if not ticket.members:
+            self.parties.pop(ticket.code, None)
+            return None
+        if queued:
+            # 남은 파티원은 같은 자리(대기 시작 시각)로 크기만 바꿔 다시 줄 선다
+            rest = Ticket(ticket.code, False, ticket.since)
+            rest.members = ticket.members
+            for m in rest.members:
+                self.ticket_of[m[0]] = rest
+            self.parties[rest.code] = rest
+            self._enqueue(rest)
+            return rest
+        return ticket
+
+    def _enqueue(self, ticket):
+        # 크기별 deque는 대기 시작 순서를 지킨다 (_head/_oldest가 앞만 본다).
+        # 새 티켓은 맨 뒤, 파티원이 빠져 크기가 바뀐 티켓은 원래 시각 자리로 끼워 넣는다
+        bucket = self.buckets[len(ticket)]
+        if not bucket or bucket[-1].since <= ticket.since:
+            bucket.append(ticket)
+        else:
+            bucket.insert(bisect.bisect_right(bucket, ticket.since, key=lambda t: t.since), ticket)
+        self.waiting += len(ticket)
+
+    def _dequeue(self, ticket):
+        # deque에서는 지우지 않는다 (앞에 오면 버림)
+        ticket.alive = False
+        self.waiting -= len(ticket)
+
+    # ------------ packing ------------
+    def _head(self, size):
+        bucket = self.buckets[size]
+        while bucket and not bucket[0].alive:
+            bucket.popleft()
+        return bucket[0] if bucket else None
+
+    def _oldest(self):
+        best = None
+        for size in range(1, self.table_size + 1):
+            t = self._head(size)
+            if t is not None and (best is None or t.since < best.since):
+                best = t
+        return best
+
+    def _take(self, ticket):
+        self.buckets[len(ticket)].popleft()
+        self._dequeue(ticket)
+
+    def _put_back(self, taken):
+        for ticket in reversed(taken):
+            ticket.alive = True
+            self.waiting += len(ticket)
+            self.buckets[len(ticket)].appendleft(ticket)
+
+    def _fill(self, first):
+        # first부터 앉히고, 남은 자리는 들어가는 가장 큰 파티부터 (크기가 같으면 오래된 순)
+        taken = [first]
+        self._take(first)
+        left = self.table_size - len(first)
+        size = left
+        while left and size:
+            t = self._head(size) if size <= left else None
+            if t is None:
+                size -= 1
+                continue
+            self._take(t)
+            taken.append(t)
+            left -= size
+        return taken, left
+
+    def pack(self, now=None):
+        # 만들 수 있는 테이블을 모두: [[(sid, name, token), ...]] (첫 사람이 가장 오래 기다린 티켓의 파티장)
+        now = self.clock() if now is None else now
+        tables = []
+        while True:
+            first = self._oldest()
+            if first is None:
+                break
+            overdue = now - first.since >= self.max_wait
+            taken, left = self._fill(first)
+            if left and not (overdue and self.table_size - left >= self.min_size):
+                self._put_back(taken)
+                break
+            seats = []
+            for ticket in taken:
+                self.parties.pop(ticket.code, None)
+                for m in ticket.members:
+                    self.ticket_of.pop(m[0], None)
+                    self.waited.append(now - ticket.since)
+                seats.extend(ticket.members)
+            self.tables += 1
+            self.matched += len(seats)
+            tables.append(seats)
+        return tables
+
+    def position(self, ticket):
+        # 대략적인 안내용: 지금 대기열 인원, 그리고 한 테이블 크기
+        return {"party": ticket.code, "members": [m[1] for m in ticket.members], "held": ticket.held,
+                "waiting": self.waiting, "table_size": self.table_size}
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+import bisect
+import inspect
+import logging
+import time
+from collections import deque
+
+from liar.wire import event_name
+
+# 핸들러 지연 버킷(초): 대부분 1ms 안쪽이라 아래쪽을 촘촘하게
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+BLOCK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+log = logging.getLogger(__name__)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{%s}" % ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                             for k, v in labels)
+
+
+def raised_in(exc, code):
+    # 예외가 code(앱이 쓴 함수)의 프레임 안까지 들어갔다 나왔는지.
+    # 아니면 함수에 들어가기도 전에 난 것 (인자 개수가 안 맞는 호출, 감싼 쪽의 문제)
+    tb = exc.__traceback__
+    while tb is not None:
+        if tb.tb_frame.f_code is code:
+            return True
+        tb = tb.tb_next
+    return False
+
+
+class Metrics:
+    # 소켓 핸들러/전송을 감싸서 호출 수, 지연 히스토그램, 보낸 메시지 수/바이트를 이벤트별로 센다.
+    # 허브 감시 루프는 자기 자신이 늦게 깨어나는 정도로 허브가 막혔는지 판단하고,
+    # 그 사이 threshold보다 오래 걸린 핸들러를 범인으로 기록한다.
+    def __init__(self, prefix="liar", block_threshold=0.1, clock=time.perf_counter):
+        self.prefix = prefix
+        self.block_threshold = block_threshold
+        self.clock = clock
+        self.calls = {}  # event -> count
+        self.errors = {}
+        self.latency = {}  # event -> Histogram
+        self.sent = {}  # event -> delivered packets
+        self.sent_bytes = {}
+        self.hub_blocks = {}  # handler (or "unknown") -> count
+        self.hub_block_seconds = Histogram(BLOCK_BUCKETS)
+        self.slow = deque(maxlen=64)  # (event, seconds) handlers that ran longer than the threshold
+        self.gauges = []  # (name, help, fn, label, kind) — fn returns a number, or {label_value: number} if label
+        self._last_pkt = None
+        self._last_name = None
+        self._last_size = 0
+        self._hub_last = None
+
+    # ------------ instrumentation ------------
+    def wrap(self, event, fn):
+        hist = self.latency.setdefault(event, Histogram(LATENCY_BUCKETS))
+        self.calls.setdefault(event, 0)
+        clock = self.clock
+        # Flask-SocketIO의 _handler(sid, *args) 안쪽, 앱이 쓴 함수
+        code = getattr(inspect.unwrap(fn), "__code__", None)
+
+        def handler(*args):
+            t0 = clock()
+            try:
+                return fn(*args)
+            except Exception as e:
+                if code is None or raised_in(e, code):
+                    self.errors[event] = self.errors.get(event, 0) + 1
+                else:
+                    # 앱 함수에 닿지도 못한 호출 (예: disconnect에 reason을 넘겼는데 받지 않는 함수):
+                    # 호출로도 오류로도 세지 않는다. 다시 부르는지는 부르는 쪽이 정한다
+                    t0 = None
+                raise
+            finally:
+                if t0 is not None:
+                    dt = clock() - t0
+                    self.calls[event] += 1
+                    hist.observe(dt)
+                    if dt > self.block_threshold:
+                        self.slow.append((event, dt))
+        handler.__wrapped__ = fn
+        return handler
+
+    def wrap_send(self, send):
+        # 방송은 같은 패킷 객체를 참가자마다 다시 보내므로, 이벤트 이름/크기는 패킷당 한 번만 계산
+        def send_packet(eio_sid, pkt):
+            if pkt is not self._last_pkt:
+                data = pkt.data
+                self._last_pkt = pkt
+                self._last_name = event_name(data)
+                self._last_size = len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+            name = self._last_name
+            self.sent[name] = self.sent.get(name, 0) + 1
+            self.sent_bytes[name] = self.sent_bytes.get(name, 0) + self._last_size
+            return send(eio_sid, pkt)
+        send_packet.__wrapped__ = send
+        return send_packet
+
+    def instrument(self, server):
+        # 이미 등록된 @socketio.on 핸들러 전부와 패킷 전송 함수를 감싼다
+        for namespace, handlers in server.handlers.items():
+            for event, fn in list(handlers.items()):
+                handlers[event] = self.wrap(event, fn)
+        server._send_eio_packet = self.wrap_send(server._send_eio_packet)
+
+    def gauge(self, name, help, fn, label=None):
+        self.gauges.append((name, help, fn, label, "gauge"))
+
+    def counter(self, name, help, fn, label=None):
+        # 다른 곳에서 세는 누적 값을 그대로 내보낼 때 (fn은 gauge와 같은 모양)
+        self.gauges.append((name, help, fn, label, "counter"))
+
+    # ------------ hub watchdog ------------
+    def check_hub(self, interval=0.05):
+        # interval마다 불려야 하는데 그보다 늦게 불렸으면 그만큼 허브(이벤트 루프)가 막혀 있었던 것
+        now = self.clock()
+        last, self._hub_last = self._hub_last, now
+        if last is None:
+            return
+        late = now - last - interval
+        if late > self.block_threshold:
+            self.record_block(late)
+        else:
+            self.slow.clear()
+
+    def record_block(self, seconds):
+        culprit = max(self.slow, key=lambda s: s[1])[0] if self.slow else "unknown"
+        self.slow.clear()
+        self.hub_blocks[culprit] = self.hub_blocks.get(culprit, 0) + 1
+        self.hub_block_seconds.observe(seconds)
+        log.warning("hub blocked for %.0fms (handler: %s)", seconds * 1000, culprit)
+
+    # ------------ Prometheus text format ------------
+    def render(self):
+        p = self.prefix
+        out = []
+
+        def family(name, kind, help):
+            out.append("# HELP %s_%s %s" % (p, name, help))
+            out.append("# TYPE %s_%s %s" % (p, name, kind))
+
+        def sample(name, labels, value):
+            out.append("%s_%s%s %s" % (p, name, _labels(labels), _num(value)))
+
+        def histogram(name, labels, h):
+            acc = 0
+            for bound, n in zip(h.bounds + ("+Inf",), h.counts):
+                acc += n
+                sample(name + "_bucket", labels + [("le", bound)], acc)
+            sample(name + "_sum", labels, h.sum)
+            sample(name + "_count", labels, h.count)
+
+        family("handler_calls_total", "counter", "Socket.IO handler invocations.")
+        for event, n in sorted(self.calls.items()):
+            sample("handler_calls_total", [("event", event)], n)
+        family("handler_errors_total", "counter", "Socket.IO handler exceptions.")
+        for event, n in sorted(self.errors.items()):
+            sample("handler_errors_total", [("event", event)], n)
+        family("handler_seconds", "histogram", "Socket.IO handler latency.")
+        for event, h in sorted(self.latency.items()):
+            histogram("handler_seconds", [("event", event)], h)
+        family("messages_sent_total", "counter", "Packets delivered to clients, per event.")
+        for event, n in sorted(self.sent.items()):
+            sample("messages_sent_total", [("event", event)], n)
+        family("message_bytes_total", "counter", "Payload bytes delivered to clients, per event.")
+        for event, n in sorted(self.sent_bytes.items()):
+            sample("message_bytes_total", [("event", event)], n)
+        family("hub_blocked_total", "counter", "Times the event loop was blocked past the threshold.")
+        for culprit, n in sorted(self.hub_blocks.items()):
+            sample("hub_blocked_total", [("handler", culprit)], n)
+        family("hub_blocked_seconds", "histogram", "Event loop stall duration.")
+        histogram("hub_blocked_seconds", [], self.hub_block_seconds)
+
+        for name, help, fn, label, kind in self.gauges:
+            value = fn()
+            family(name, kind, help)
+            if label:
+                for key, v in sorted(value.items()):
+                    sample(name, [(label, key)], v)
+            else:
+                sample(name, [], value)
+        return "\n".join(out) + "\n"
+
+
+def _num(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
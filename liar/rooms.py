@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import random
+import time
+
+from liar.engine import Phase
+from liar.eventlog import EventLog
+from liar.roster import Roster
+from liar.tally import VoteTally
+from liar.topic_bank import TopicDeck
+
+# 헷갈리는 글자(0/O, 1/I) 제외
+ROOM_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+ROOM_CODE_LENGTH = 5
+
+
+# ------------ In-Memory Game State (reset on server restart) ------------
+class Player:
+    # 방 안의 한 자리. 슬롯만 있는 객체라 dict처럼 자리마다 키 테이블을 들고 다니지 않는다
+    __slots__ = ("name", "score", "is_host", "away")
+
+    def __init__(self, name, score=0, is_host=False, away=False):
+        self.name = name
+        self.score = score
+        self.is_host = is_host
+        self.away = away
+
+
+class GameState:
+    # 열린 채로 쉬는 방이 많아도 가볍도록 __slots__ (인스턴스 dict 없음)
+    __slots__ = (
+        "code", "created_at", "touched_at", "deck", "match",
+        "players", "host_pid", "sessions", "sid_of", "pid_of_sid", "away_timers", "next_pid",
+        "events", "roster", "lobby_flush",
+        "phase", "round_num", "max_rounds", "category", "secret_word", "order", "hint_index", "timer", "timer_info",
+        "roles", "role_channel", "liar_pid", "spy_pid", "votes1", "votes2", "vote_pending", "vote_flush",
+        "last_result", "final_scores",
+    )
+
+    def __init__(self, code=None):
+        self.code = code
+        self.created_at = time.monotonic()
+        self.touched_at = self.created_at
+        self.deck = TopicDeck()  # survives reset_all so words don't repeat across games
+        self.match = None  # 빠른 시작으로 만든 방: {'tokens': 앉을 사람들, 'host': 서버가 정한 호스트} (시작하면 None)
+        self.reset_all()
+
+    def reset_all(self):
+        self.players = {}  # pid (small int, per room) -> Player
+        self.host_pid = None
+        # 세션: 브라우저 토큰 -> pid, 그리고 현재 연결된 소켓과의 양방향 매핑
+        self.sessions = {}
+        self.sid_of = {}  # pid -> sid
+        self.pid_of_sid = {}  # sid -> pid
+        self.away_timers = {}  # pid -> grace-period timer (TimerScheduler handle)
+        self.next_pid = 0
+        self.events = EventLog()  # sequenced room broadcasts for resuming clients
+        self.roster = Roster()  # ordered, versioned lobby roster
+        self.lobby_flush = None
+        self.phase = Phase.LOBBY
+        self.round_num = 0
+        self.max_rounds = 3
+        self.category = None
+        self.secret_word = None
+        self.order = []  # speaking order (pids), sent as-is in hint_order
+        self.hint_index = -1
+        self.timer = None  # pending phase timer (TimerScheduler handle)
+        self.timer_info = None  # (event, payload, deadline_ms) of the running countdown, for snapshots
+        self.roles = {}  # pid -> Role
+        self.role_channel = {}  # pid -> role sub-room the player's socket sits in
+        self.liar_pid = None
+        self.spy_pid = None
+        self.votes1 = VoteTally()  # voter_pid -> target_pid (running tally)
+        self.votes2 = VoteTally()
+        self.vote_pending = {}  # merged vote_progress not yet broadcast ("votes": voter_pid -> target)
+        self.vote_flush = None
+        self.last_result = None  # dict summary of last round
+        self.final_scores = None
+
+    def game_started(self):
+        return self.round_num > 0
+
+    def touch(self):
+        self.touched_at = time.monotonic()
+
+    def new_pid(self):
+        # 방 안에서만 유일한 작은 정수: sid 문자열(20자)보다 프레임마다 훨씬 짧다
+        self.next_pid += 1
+        return self.next_pid
+
+
+# ------------ Room Registry ------------
+class RoomRegistry:
+    # code -> GameState, 그리고 sid -> code 역인덱스.
+    # 모든 조회가 dict 한 번이라 방 개수와 무관하게 O(1).
+    def __init__(self, idle_ttl=600):
+        self.idle_ttl = idle_ttl
+        self.rooms = {}
+        self.code_by_sid = {}
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def _new_code(self):
+        while True:
+            code = "".join(random.choice(ROOM_CODE_ALPHABET) for _ in range(ROOM_CODE_LENGTH))
+            if code not in self.rooms:
+                return code
+
+    def create(self):
+        code = self._new_code()
+        gs = GameState(code)
+        self.rooms[code] = gs
+        return gs
+
+    def get(self, code):
+        if not code:
+            return None
+        return self.rooms.get(str(code).strip().upper())
+
+    def join(self, sid, code):
+        gs = self.get(code)
+        if gs is None:
+            return None
+        self.bind(sid, gs.code)
+        gs.touch()
+        return gs
+
+    def bind(self, sid, code):
+        # 역인덱스만: 다른 워커가 맡은 방에 앉는 소켓도 (STORE_URL)
+        prev = self.code_by_sid.get(sid)
+        if prev is not None and prev != code:
+            self.leave(sid)
+        self.code_by_sid[sid] = code
+
+    def leave(self, sid):
+        code = self.code_by_sid.pop(sid, None)
+        gs = self.rooms.get(code) if code else None
+        if gs is not None:
+            gs.touch()
+        return gs
+
+    def collect_idle(self, now=None):
+        # 아무도 없는 채로 idle_ttl 이상 지난 방 정리
+        now = time.monotonic() if now is None else now
+        dead = [code for code, gs in self.rooms.items()
+                if not gs.players and now - gs.touched_at > self.idle_ttl]
+        for code in dead:
+            del self.rooms[code]
+        return dead
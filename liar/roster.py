@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import bisect
+
+
+def entry(key):
+    # 정렬 키 -> 클라이언트에 보내는 명단 한 줄
+    return {"pid": key[2], "name": key[1], "is_host": not key[0]}
+
+
+class Roster:
+    # 로비 명단을 정렬된 상태로 유지한다 (호스트 먼저, 그다음 이름순).
+    # 변경마다 version을 1씩 올리고, 아직 방송하지 않은 변경(delta)을 pending에 쌓는다.
+    # 한 사람은 정렬 키 튜플 (not is_host, name, pid) 하나뿐: keys와 by_pid가 같은 튜플을 가리킨다.
+    __slots__ = ("version", "keys", "by_pid", "host_pid", "pending", "pending_from")
+
+    def __init__(self):
+        self.version = 0
+        self.keys = []  # 정렬 키 목록
+        self.by_pid = {}  # pid -> 정렬 키
+        self.host_pid = None
+        self.pending = []
+        self.pending_from = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _insert(self, key):
+        self.by_pid[key[2]] = key
+        bisect.insort(self.keys, key)
+
+    def _remove(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def _op(self, op):
+        if not self.pending:
+            self.pending_from = self.version
+        self.version += 1
+        op["v"] = self.version
+        self.pending.append(op)
+
+    def add(self, pid, name):
+        key = self.by_pid.get(pid)
+        if key is not None:
+            if key[1] == name:
+                return False
+            # 이름만 바뀐 경우: 자리만 옮기고 player_joined로 덮어쓴다 (호스트 유지)
+            self._remove(key)
+            key = (key[0], name, pid)
+        else:
+            key = (pid != self.host_pid, name, pid)
+        self._insert(key)
+        self._op({"type": "player_joined", "player": entry(key)})
+        return True
+
+    def remove(self, pid):
+        key = self.by_pid.pop(pid, None)
+        if key is None:
+            return False
+        self._remove(key)
+        self._op({"type": "player_left", "pid": pid})
+        if pid == self.host_pid:
+            self.set_host(None)
+        return True
+
+    def set_host(self, pid):
+        if pid == self.host_pid:
+            return False
+        for s, flag in ((self.host_pid, False), (pid, True)):
+            key = self.by_pid.get(s)
+            if key is not None:
+                self._remove(key)
+                self._insert((not flag, key[1], s))
+        self.host_pid = pid
+        self._op({"type": "host_changed", "host_pid": pid, "host_name": self.host_name()})
+        return True
+
+    def host_name(self):
+        key = self.by_pid.get(self.host_pid)
+        return key[1] if key else None
+
+    def players(self):
+        return [entry(k) for k in self.keys]
+
+    def snapshot(self):
+        return {
+            "version": self.version,
+            "players": self.players(),
+            "host_pid": self.host_pid,
+            "host_name": self.host_name(),
+        }
+
+    def take_delta(self):
+        # 쌓인 변경을 하나의 메시지로 꺼낸다 (없으면 None)
+        if not self.pending:
+            return None
+        delta = {"from": self.pending_from, "to": self.version, "ops": self.pending}
+        self.pending = []
+        return delta
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import heapq
+import itertools
+import time
+import traceback
+from collections import deque
+
+
+class Timer:
+    __slots__ = ("deadline", "fn", "args", "cancelled")
+
+    def __init__(self, deadline, fn, args):
+        self.deadline = deadline
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerScheduler:
+    # 모든 방의 타이머를 힙 하나 + 그린렛 하나로 처리한다.
+    # 타이머마다 잠자는 그린렛을 띄우지 않으므로 1만 개여도 깨어나는 횟수는
+    # 초당 최대 1/tick 번으로 고정된다. 취소는 표시만 해두고(lazy) 꺼낼 때 버린다.
+    def __init__(self, clock=time.monotonic, tick=0.05):
+        self.clock = clock
+        self.tick = tick
+        self._heap = []
+        self._seq = itertools.count()
+        self._cancelled = 0
+        self.fired = 0
+        self.lateness = deque(maxlen=10000)  # 최근 발화 지연(초)
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled
+
+    def call_at(self, deadline, fn, *args):
+        t = Timer(deadline, fn, args)
+        heapq.heappush(self._heap, (deadline, next(self._seq), t))
+        return t
+
+    def call_later(self, delay, fn, *args):
+        return self.call_at(self.clock() + delay, fn, *args)
+
+    def cancel(self, timer):
+        if timer is not None and not timer.cancelled:
+            timer.cancel()
+            self._cancelled += 1
+            # 취소된 항목이 절반을 넘으면 힙을 다시 만들어 메모리를 묶어둔다
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [e for e in self._heap if not e[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def run_due(self, now=None):
+        now = self.clock() if now is None else now
+        fired = 0
+        # 콜백 안의 cancel()이 힙을 새로 만들 수 있으므로 매번 self._heap을 다시 본다
+        while self._heap and self._heap[0][0] <= now:
+            _, _, t = heapq.heappop(self._heap)
+            if t.cancelled:
+                self._cancelled -= 1
+                continue
+            # 힙에서 빠졌으므로 이후 cancel()은 아무 일도 하지 않아야 한다
+            t.cancelled = True
+            self.lateness.append(now - t.deadline)
+            try:
+                t.fn(*t.args)
+            except Exception:
+                traceback.print_exc()
+            fired += 1
+        self.fired += fired
+        return fired
+
+    def next_delay(self, now=None):
+        now = self.clock() if now is None else now
+        if not self._heap:
+            return self.tick
+        return min(max(self._heap[0][0] - now, 0), self.tick)
+
+    def jitter_stats(self):
+        samples = sorted(self.lateness)
+        if not samples:
+            return {"n": 0}
+        pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))]
+        return {
+            "n": len(samples),
+            "p50_ms": pick(0.50) * 1000,
+            "p99_ms": pick(0.99) * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# 점수 밸런스 몬테카를로: 봇 투표 정책으로 라운드를 대량으로 돌려 역할별 승률/기대 점수를 잰다.
+# 라운드 결과를 가르는 건 2차 투표와 라이어의 정답 맞히기뿐이라 (1차 투표는 참고용),
+# 그 두 가지만 모델링한다. numpy가 있으면 라운드 수십만 개를 배열 한 번에 처리하고,
+# 없으면 같은 모델을 파이썬 루프로 돈다. 파이썬 루프는 서버 방 핸들러가 모는 것과 같은
+# Engine에 봇 테이블 하나를 올려 호스트/타이머와 같은 명령 순서로 한 라운드씩 판정하므로,
+# numpy 배치 결과와 나란히 돌려 두 결과가 같은 분포인지 확인하는 기준이기도 하다.
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy는 선택 사항: 없으면 느린 루프
+    np = None
+
+from liar.engine import SPY_MIN_PLAYERS, Engine, Phase
+from liar.rooms import GameState, Player
+
+# p_detect: 시민이 라이어에게 표를 줄 확률 (None이면 시민도 아무나 찍음)
+# guess: 지목된 라이어가 제시어를 맞힐 확률
+# coordinated: 라이어와 스파이가 같은 시민 한 명에게 몰아서 투표
+POLICIES = {
+    "random": {"p_detect": None, "guess": 0.1, "coordinated": False},
+    "informed": {"p_detect": 0.5, "guess": 0.3, "coordinated": False},
+    "coordinated": {"p_detect": 0.5, "guess": 0.3, "coordinated": True},
+}
+BATCH = 200000
+
+
+def policy_for(name, p_detect=None, guess=None):
+    policy = dict(POLICIES[name])
+    if p_detect is not None:
+        policy["p_detect"] = p_detect
+    if guess is not None:
+        policy["guess"] = guess
+    return policy
+
+
+# ------------ 결과 정리 ------------
+def report(players, rounds, citizens, not_caught, caught_guessed):
+    liar_team = rounds - citizens
+    rate = liar_team / rounds
+    has_spy = players >= SPY_MIN_PLAYERS
+    # 라운드당 기대 점수 (역할별), 자리 하나의 기대 점수 (역할은 매 라운드 무작위)
+    points = {"liar": 2 * rate, "citizen": citizens / rounds}
+    if has_spy:
+        points["spy"] = rate
+    n_citizens = players - 1 - (1 if has_spy else 0)
+    per_seat = (points["liar"] + points.get("spy", 0.0) + n_citizens * points["citizen"]) / players
+    return {
+        "players": players,
+        "spy": has_spy,
+        "rounds": rounds,
+        "liar_team_win_rate": rate,
+        "liar_not_caught_rate": not_caught / rounds,
+        "liar_caught_but_guessed_rate": caught_guessed / rounds,
+        "citizens_win_rate": citizens / rounds,
+        "stderr": (rate * (1 - rate) / rounds) ** 0.5,
+        "points_per_round": points,
+        "points_per_seat": per_seat,
+    }
+
+
+# ------------ numpy (배치) ------------
+def simulate_np(players, rounds, policy, seed=None, batch=BATCH):
+    rng = np.random.default_rng(seed)
+    n = players
+    seats = np.arange(n)
+    citizens = not_caught = caught_guessed = 0
+    done = 0
+    while done < rounds:
+        r = min(batch, rounds - done)
+        rows = np.arange(r)
+        liar = rng.integers(n, size=r)
+        is_liar = seats[None, :] == liar[:, None]
+        citizen = ~is_liar
+        spy = None
+        if n >= SPY_MIN_PLAYERS:
+            spy = (liar + 1 + rng.integers(n - 1, size=r)) % n
+            citizen &= seats[None, :] != spy[:, None]
+
+        # 기본: 자기 말고 아무나
+        target = (seats[None, :] + 1 + rng.integers(n - 1, size=(r, n))) % n
+        if policy["p_detect"] is not None:
+            detect = citizen & (rng.random((r, n)) < policy["p_detect"])
+            target = np.where(detect, liar[:, None], target)
+        if policy["coordinated"] and spy is not None:
+            # 라이어/스파이를 뺀 n-2명 중 한 명: k번째 시민 자리로 옮긴다
+            lo, hi = np.minimum(liar, spy), np.maximum(liar, spy)
+            decoy = rng.integers(n - 2, size=r)
+            decoy += decoy >= lo
+            decoy += decoy >= hi
+            target[rows, liar] = decoy
+            target[rows, spy] = decoy
+
+        counts = np.bincount((rows[:, None] * n + target).ravel(), minlength=r * n).reshape(r, n)
+        tops = counts == counts.max(axis=1, keepdims=True)
+        # 동률이면 그중 무작위 (pick_accused와 같은 분포)
+        accused = np.argmax(np.where(tops, rng.random((r, n)), -1.0), axis=1)
+        caught = accused == liar
+        guessed = rng.random(r) < policy["guess"]
+
+        citizens += int(np.count_nonzero(caught & ~guessed))
+        not_caught += int(np.count_nonzero(~caught))
+        caught_guessed += int(np.count_nonzero(caught & guessed))
+        done += r
+    return report(players, rounds, citizens, not_caught, caught_guessed)
+
+
+# ------------ 파이썬 루프 ------------
+def bot_votes(pids, liar, spy, policy, rng):
+    votes = {}
+    decoy = None
+    if policy["coordinated"] and spy is not None:
+        decoy = rng.choice([p for p in pids if p not in (liar, spy)])
+    for voter in pids:
+        if decoy is not None and voter in (liar, spy):
+            votes[voter] = decoy
+        elif voter not in (liar, spy) and policy["p_detect"] is not None and rng.random() < policy["p_detect"]:
+            votes[voter] = liar
+        else:
+            votes[voter] = rng.choice([p for p in pids if p != voter])
+    return votes
+
+
+def simulate_py(players, rounds, policy, seed=None):
+    rng = random.Random(seed)
+    engine = Engine(rng=rng)
+    gs = GameState("SIM")
+    for pid in range(1, players + 1):
+        gs.players[pid] = Player("bot%d" % pid)
+    gs.max_rounds = rounds + 1  # 요약 없이 계속 다음 라운드
+    pids = list(gs.players)
+    citizens = not_caught = caught_guessed = 0
+    engine.start(gs)
+    for _ in range(rounds):
+        # 힌트는 발언 없이 끝까지 넘기고, 1차 투표는 참고용이라 표 없이 닫는다
+        engine.next_hint(gs, len(gs.order))
+        engine.open_vote(gs, Phase.VOTE1)
+        engine.close_vote(gs, Phase.VOTE1)
+        engine.start_hint2(gs)
+        engine.next_hint(gs, len(gs.order))
+        for voter, target in bot_votes(pids, gs.liar_pid, gs.spy_pid, policy, rng).items():
+            engine.cast_vote(gs, voter, target)
+        engine.close_vote(gs, Phase.VOTE2)
+        if gs.phase == Phase.LIAR_GUESS:
+            engine.guess(gs, gs.liar_pid, gs.secret_word if rng.random() < policy["guess"] else None)
+        result = gs.last_result
+        if result["winner"] == "citizens":
+            citizens += 1
+        elif result["liar_selected"]:
+            caught_guessed += 1
+        else:
+            not_caught += 1
+        engine.next_round(gs)
+    return report(players, rounds, citizens, not_caught, caught_guessed)
+
+
+def simulate(players, rounds, policy, seed=None):
+    if np is not None:
+        return simulate_np(players, rounds, policy, seed)
+    return simulate_py(players, rounds, policy, seed)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+
+class SpectatorHub:
+    # 관전자: 플레이어가 아니라 방 채널(code)에도 들어가지 않고, 별도 채널(code:watch)에서
+    # 일정 간격으로 스냅샷만 받는다. 그래서 게임 이벤트 방송 비용은 관전자 수와 무관하고,
+    # 관전자 쪽은 틱마다 바뀐 방에 스냅샷 하나 (인코딩은 형식별로 한 번).
+    def __init__(self):
+        self.sids_of = {}  # code -> set(sid)
+        self.code_by_sid = {}
+        self.dirty = set()  # 마지막 틱 이후 공개 상태가 바뀐 방
+
+    def __len__(self):
+        return len(self.code_by_sid)
+
+    @staticmethod
+    def channel(code):
+        return "%s:watch" % code
+
+    def watch(self, sid, code):
+        # 다른 방을 보고 있었으면 그 방은 떠난다. 떠난 방 코드 (없으면 None)
+        prev = self.leave(sid)
+        self.code_by_sid[sid] = code
+        self.sids_of.setdefault(code, set()).add(sid)
+        return prev
+
+    def leave(self, sid):
+        code = self.code_by_sid.pop(sid, None)
+        if code is not None:
+            sids = self.sids_of.get(code)
+            sids.discard(sid)
+            if not sids:
+                del self.sids_of[code]
+                self.dirty.discard(code)
+        return code
+
+    def count(self, code):
+        return len(self.sids_of.get(code, ()))
+
+    def mark(self, code):
+        # 보는 사람이 없는 방은 표시하지 않는다 (틱이 방 개수에 비례하지 않게)
+        if code in self.sids_of:
+            self.dirty.add(code)
+
+    def take_dirty(self):
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def drop(self, code):
+        # 방이 사라짐: 관전자 목록만 정리 (소켓은 그대로 두고 새 방을 고르게 한다)
+        for sid in self.sids_of.pop(code, ()):
+            self.code_by_sid.pop(sid, None)
+        self.dirty.discard(code)
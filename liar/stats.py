@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from collections import deque
+
+# 플레이어 이름 = 리그 안의 한 사람 (계정이 없으므로). 누적 값은 모두 더하기만 한다
+COUNTERS = ("games", "rounds", "wins", "points", "liar_rounds", "liar_wins", "spy_rounds", "spy_wins",
+            "guesses", "guesses_correct", "votes", "votes_correct")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    %s,
+    last_played REAL
+);
+CREATE INDEX IF NOT EXISTS players_by_points ON players (points DESC, wins DESC);
+CREATE INDEX IF NOT EXISTS players_by_wins ON players (wins DESC, points DESC);
+CREATE INDEX IF NOT EXISTS players_by_games ON players (games DESC, points DESC);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    room TEXT NOT NULL,
+    ended_at REAL NOT NULL,
+    rounds INTEGER NOT NULL,
+    scores TEXT NOT NULL
+);
+""" % ",\n    ".join("%s INTEGER NOT NULL DEFAULT 0" % c for c in COUNTERS)
+
+UPSERT = "INSERT INTO players (name, %s, last_played) VALUES (?, %s, ?) ON CONFLICT(name) DO UPDATE SET %s, " \
+         "last_played = MAX(COALESCE(last_played, 0), excluded.last_played)" % (
+             ", ".join(COUNTERS), ", ".join("?" for _ in COUNTERS),
+             ", ".join("%s = %s + excluded.%s" % (c, c, c) for c in COUNTERS))
+
+# 순위 기준 -> ORDER BY (위의 인덱스와 같은 순서라 상위 K개는 인덱스 앞부분만 읽는다)
+BOARDS = {
+    "points": "points DESC, wins DESC",
+    "wins": "wins DESC, points DESC",
+    "games": "games DESC, points DESC",
+}
+TOP_K = 100  # 기준마다 이만큼 한 번 읽어 캐시하고, limit은 잘라서
+
+
+def rate(hit, total):
+    return round(hit / float(total), 4) if total else None
+
+
+def player_row(row):
+    out = dict(zip(("name",) + COUNTERS, row))
+    out["liar_win_rate"] = rate(out["liar_wins"], out["liar_rounds"])
+    out["guess_rate"] = rate(out["guesses_correct"], out["guesses"])
+    out["vote_accuracy"] = rate(out["votes_correct"], out["votes"])
+    return out
+
+
+class PlayerStats:
+    # 끝난 라운드/게임 결과를 SQLite에 누적한다. 핸들러는 메모리 목록에 붙이기만 하고,
+    # interval마다 쌓인 기록을 이름별로 합쳐 트랜잭션 하나로 쓴다 (Journal처럼 offload 스레드에서).
+    # 순위표는 기준별 상위 TOP_K를 캐시하고, 게임 결과가 디스크에 들어갈 때마다 무효화한다.
+    # 무효화 기준은 DB의 games 마지막 id라서 같은 파일을 쓰는 다른 워커가 기록한 게임도 본다.
+    # 읽기는 별도 연결 (WAL이라 쓰는 동안에도 읽힌다). read는 읽기를 돌릴 곳 (eventlet이면 tpool.execute).
+    def __init__(self, path, offload=None, read=None, interval=1.0, clock=time.perf_counter):
+        self.path = path
+        self.offload = offload or (lambda fn, *args: fn(*args))
+        self.read = read or (lambda fn, *args: fn(*args))
+        self.interval = interval
+        self.clock = clock
+        self.pending = []
+        self.wconn = None
+        self.rconn = None
+        self.rlock = threading.Lock()
+        self.cache = {}  # 기준 -> (마지막 게임 id, rows)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.written = 0
+        self.batches = 0
+        self.write_ms = deque(maxlen=10000)
+        dirpath = os.path.dirname(path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.close()
+
+    # ------------ recording (핸들러에서: 메모리에 붙이기만) ------------
+    def add_round(self, name, role, won, points, guessed, votes, votes_correct):
+        # guessed: 라이어가 지목돼서 제시어를 말했으면 맞혔는지(True/False), 아니면 None
+        self.pending.append(("round", name, role, won, points, guessed, votes, votes_correct, time.time()))
+
+    def add_game(self, room, rounds, scores):
+        # scores: [[이름, 점수], ...]
+        self.pending.append(("game", room, rounds, scores, time.time()))
+
+    # ------------ writing ------------
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write(self, batch):
+        # offload 스레드에서 실행: 쓰기 연결은 여기서만 만진다
+        t0 = self.clock()
+        if self.wconn is None:
+            self.wconn = self._connect()
+        totals = {}
+        games = []
+        for rec in batch:
+            if rec[0] == "round":
+                _, name, role, won, points, guessed, votes, votes_correct, at = rec
+                row = totals.get(name)
+                if row is None:
+                    row = totals[name] = [0] * len(COUNTERS) + [at]
+                row[1] += 1
+                row[2] += 1 if won else 0
+                row[3] += points
+                if role == "liar":
+                    row[4] += 1
+                    row[5] += 1 if won else 0
+                elif role == "spy":
+                    row[6] += 1
+                    row[7] += 1 if won else 0
+                if guessed is not None:
+                    row[8] += 1
+                    row[9] += 1 if guessed else 0
+                row[10] += votes
+                row[11] += votes_correct
+                row[-1] = max(row[-1], at)
+            else:
+                _, room, rounds, scores, at = rec
+                games.append((room, at, rounds, json.dumps(scores, ensure_ascii=False, separators=(",", ":"))))
+                for name, _score in scores:
+                    row = totals.get(name)
+                    if row is None:
+                        row = totals[name] = [0] * len(COUNTERS) + [at]
+                    row[0] += 1
+        with self.wconn:
+            self.wconn.executemany(UPSERT, [[name] + row for name, row in totals.items()])
+            if games:
+                self.wconn.executemany("INSERT INTO games (room, ended_at, rounds, scores) VALUES (?, ?, ?, ?)", games)
+        self.write_ms.append((self.clock() - t0) * 1000)
+        self.written += len(batch)
+        self.batches += 1
+
+    def flush(self):
+        if not self.pending:
+            return 0
+        batch, self.pending = self.pending, []
+        self.offload(self._write, batch)
+        return len(batch)
+
+    def tick(self):
+        try:
+            self.flush()
+        except Exception:
+            traceback.print_exc()
+
+    # ------------ reading ------------
+    def _query(self, sql, args=()):
+        with self.rlock:
+            if self.rconn is None:
+                self.rconn = self._connect()
+            return self.rconn.execute(sql, args).fetchall()
+
+    def leaderboard(self, by="points", limit=10):
+        order = BOARDS.get(by)
+        if order is None:
+            raise ValueError("unknown leaderboard: %s" % by)
+        # rowid 최댓값이라 인덱스 끝 한 번만 읽는다 (어느 워커가 썼든 바뀐다)
+        generation = self.read(self._query, "SELECT MAX(id) FROM games")[0][0]
+        hit = self.cache.get(by)
+        if hit is not None and hit[0] == generation:
+            self.cache_hits += 1
+            rows = hit[1]
+        else:
+            self.cache_misses += 1
+            sql = "SELECT name, %s FROM players ORDER BY %s LIMIT %d" % (", ".join(COUNTERS), order, TOP_K)
+            rows = [player_row(r) for r in self.read(self._query, sql)]
+            self.cache[by] = (generation, rows)
+        return rows[:max(0, min(limit, TOP_K))]
+
+    def player(self, name):
+        sql = "SELECT name, %s FROM players WHERE name = ?" % ", ".join(COUNTERS)
+        rows = self.read(self._query, sql, (name,))
+        return player_row(rows[0]) if rows else None
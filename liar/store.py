@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import json
+
+try:
+    import redis
+except ImportError:  # STORE_URL=redis://... 를 쓸 때만 필요
+    redis = None
+
+
+# ------------ Shared room store ------------
+# 방 상태를 워커 사이에서 나눠 갖는 곳. 방마다
+#   owner : 지금 그 방을 메모리에 들고 우편함을 돌리는 워커 (ttl 동안 유효, 주인이 주기적으로 연장)
+#   doc   : 방 문서 (liar/journal.py dump_room: 플레이어/점수/세션, 역할, 단계, 투표)
+# 그리고 워커끼리 메시지를 주고받는 pub/sub 채널 (방 작업 넘기기, 주인 캐시 무효화).
+# 메시지/문서는 JSON으로 주고받는다 (pid 키 dict는 dump_room처럼 쌍 목록으로).
+
+# 주인 표시 연장: 아직 이 워커 것인 키만 (GET == worker일 때만 EXPIRE), 아닌 키의 번호(1부터)를 돌려준다.
+# 멈춰 있던 사이 다른 워커가 이어받은 방의 주인 표시를 옛 주인이 연장하면 두 워커가 같은 방을 돌린다
+RENEW_SCRIPT = """
+local lost = {}
+for i, key in ipairs(KEYS) do
+  if redis.call("GET", key) == ARGV[1] then
+    redis.call("EXPIRE", key, ARGV[2])
+  else
+    lost[#lost + 1] = i
+  end
+end
+return lost
+"""
+
+
+class MemoryStore:
+    # 한 프로세스 (기본): 워커가 하나뿐이라 모든 방이 이 워커 것. 같은 프로세스 안의 구독자에게는 바로 전달.
+    shared = False
+
+    def __init__(self):
+        self.owners = {}
+        self.docs = {}
+        self.subscribers = {}  # channel -> [callback(channel, message)]
+
+    def claim(self, code, worker, ttl):
+        # 주인이 없으면 worker가 차지한다. 지금 주인을 돌려준다
+        return self.owners.setdefault(code, worker)
+
+    def owner(self, code):
+        return self.owners.get(code)
+
+    def renew(self, worker, codes, ttl):
+        # 연장하지 못한 (이제 worker 것이 아닌) 방 코드
+        return [code for code in codes if self.owners.get(code) != worker]
+
+    def save(self, docs):
+        self.docs.update(docs)
+
+    def load(self, code):
+        return self.docs.get(code)
+
+    def drop(self, code):
+        self.owners.pop(code, None)
+        self.docs.pop(code, None)
+
+    def publish(self, channel, message):
+        for callback in self.subscribers.get(channel, ()):
+            callback(channel, message)
+
+    def listen(self, channels, callback):
+        for channel in channels:
+            self.subscribers.setdefault(channel, []).append(callback)
+
+
+class RedisStore:
+    # Redis 프로토콜 서버 (Redis/Valkey, 로컬 테스트는 bench/respd.py). 워커마다 연결 하나 + 구독 연결 하나.
+    shared = True
+
+    def __init__(self, url, prefix="liar:"):
+        if redis is None:
+            raise RuntimeError("STORE_URL needs the redis package (pip install redis)")
+        self.r = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._renew = self.r.register_script(RENEW_SCRIPT)
+
+    def _owner_key(self, code):
+        return "%sowner:%s" % (self.prefix, code)
+
+    def _doc_key(self, code):
+        return "%sroom:%s" % (self.prefix, code)
+
+    def claim(self, code, worker, ttl):
+        key = self._owner_key(code)
+        if self.r.set(key, worker, nx=True, ex=ttl):
+            return worker
+        return self.owner(code) or self.claim(code, worker, ttl)
+
+    def owner(self, code):
+        owner = self.r.get(self._owner_key(code))
+        return owner.decode() if owner is not None else None
+
+    def renew(self, worker, codes, ttl):
+        # 스크립트 하나로 비교 + 연장 (방 수와 무관하게 왕복 한 번). 연장하지 못한 방 코드를 돌려준다
+        if not codes:
+            return []
+        lost = self._renew(keys=[self._owner_key(code) for code in codes], args=[worker, ttl])
+        return [codes[i - 1] for i in lost]
+
+    def save(self, docs):
+        pipe = self.r.pipeline(transaction=False)
+        for code, doc in docs.items():
+            pipe.set(self._doc_key(code), json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+        pipe.execute()
+
+    def load(self, code):
+        raw = self.r.get(self._doc_key(code))
+        return json.loads(raw) if raw is not None else None
+
+    def drop(self, code):
+        self.r.delete(self._owner_key(code), self._doc_key(code))
+
+    def publish(self, channel, message):
+        self.r.publish(self.prefix + channel, json.dumps(message, separators=(",", ":")))
+
+    def listen(self, channels, callback):
+        # 끝나지 않는 루프: 백그라운드 태스크에서 돌린다 (eventlet이 소켓을 패치해 허브를 막지 않음)
+        pubsub = self.r.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*[self.prefix + ch for ch in channels])
+        skip = len(self.prefix)
+        for msg in pubsub.listen():
+            if msg.get("type") == "message":
+                callback(msg["channel"].decode()[skip:], json.loads(msg["data"]))
+
+
+def open_store(url):
+    if not url:
+        return MemoryStore()
+    return RedisStore(url)
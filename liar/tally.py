@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+
+class VoteTally:
+    # 투표 집계를 매 표마다 갱신한다.
+    # counts: 후보 -> 득표수, by_count: 득표수 -> 후보 집합, top: 현재 최다 득표수.
+    # 표를 던지거나 바꿀 때 득표수는 ±1씩만 움직이므로 최다 득표자 갱신도 O(1).
+    __slots__ = ("votes", "counts", "by_count", "top")
+
+    def __init__(self):
+        self.votes = {}  # voter -> target
+        self.counts = {}
+        self.by_count = {}
+        self.top = 0
+
+    def __len__(self):
+        return len(self.votes)
+
+    def __contains__(self, voter):
+        return voter in self.votes
+
+    def _move(self, target, old, new):
+        if old:
+            bucket = self.by_count[old]
+            bucket.discard(target)
+            if not bucket:
+                del self.by_count[old]
+        if new:
+            self.by_count.setdefault(new, set()).add(target)
+            self.counts[target] = new
+        else:
+            self.counts.pop(target, None)
+
+    def _inc(self, target):
+        c = self.counts.get(target, 0)
+        self._move(target, c, c + 1)
+        if c + 1 > self.top:
+            self.top = c + 1
+
+    def _dec(self, target):
+        c = self.counts[target]
+        self._move(target, c, c - 1)
+        # 최다 득표자가 한 표 잃었고 동률이 없었다면 그 후보가 c-1 버킷에 있으므로 top-1
+        if c == self.top and c not in self.by_count:
+            self.top = c - 1
+
+    def cast(self, voter, target):
+        prev = self.votes.get(voter)
+        if prev == target:
+            return prev
+        if prev is not None:
+            self._dec(prev)
+        self.votes[voter] = target
+        self._inc(target)
+        return prev
+
+    def retract(self, voter):
+        prev = self.votes.pop(voter, None)
+        if prev is not None:
+            self._dec(prev)
+        return prev
+
+    def drop_target(self, target):
+        # 후보가 나갔을 때: 그 후보에게 간 표를 모두 무효 처리 (드문 경로라 O(투표자))
+        for voter in [v for v, t in self.votes.items() if t == target]:
+            self.retract(voter)
+
+    def count(self, target):
+        return self.counts.get(target, 0)
+
+    def leaders(self):
+        if not self.top:
+            return []
+        return list(self.by_count[self.top])
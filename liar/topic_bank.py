@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import glob
+import json
+import math
+import os
+import random
+import runpy
+import traceback
+
+
+class TopicIndex:
+    # 한 번 만들면 바뀌지 않는 주제 색인. 모든 방이 같은 객체를 공유한다.
+    # since[c]: 그 주제의 제시어 목록이 마지막으로 바뀐 세대 (그대로면 이전 색인 값을 물려받는다)
+    __slots__ = ("generation", "categories", "words", "since")
+
+    def __init__(self, generation, topics, previous=None):
+        self.generation = generation
+        self.categories = tuple(c for c, words in topics.items() if words)
+        self.words = {}
+        self.since = {}
+        for c in self.categories:
+            words = tuple(topics[c])
+            if previous is not None and previous.words.get(c) == words:
+                self.words[c] = previous.words[c]
+                self.since[c] = previous.since[c]
+            else:
+                self.words[c] = words
+                self.since[c] = generation
+
+
+def load_topics(paths):
+    # .py 파일은 TOPICS dict를, .json 파일은 {"주제": ["제시어", ...]}를 담는다.
+    # 같은 주제가 여러 파일에 있으면 제시어를 합친다 (중복 제거, 순서 유지).
+    merged = {}
+    for path in paths:
+        if path.endswith(".py"):
+            data = runpy.run_path(path).get("TOPICS", {})
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        for category, words in data.items():
+            bucket = merged.setdefault(category, {})
+            for w in words:
+                bucket.setdefault(str(w).strip(), None)
+    return {c: [w for w in words if w] for c, words in merged.items()}
+
+
+class TopicBank:
+    def __init__(self, main_path, pack_glob=None):
+        self.main_path = main_path
+        self.pack_glob = pack_glob
+        self.current = None
+        self._mtimes = None
+        self.reload()
+
+    def paths(self):
+        paths = [self.main_path]
+        if self.pack_glob:
+            paths.extend(sorted(glob.glob(self.pack_glob)))
+        return paths
+
+    def _stat(self):
+        out = {}
+        for p in self.paths():
+            try:
+                out[p] = os.stat(p).st_mtime_ns
+            except OSError:
+                pass
+        return out
+
+    def reload(self):
+        mtimes = self._stat()
+        try:
+            topics = load_topics(list(mtimes))
+        except Exception:
+            # 파일을 저장하다 만 상태 등: 기존 색인을 그대로 쓴다
+            traceback.print_exc()
+            return False
+        generation = self.current.generation + 1 if self.current else 1
+        # 참조 하나만 바꿔 끼우므로 진행 중인 게임은 막히지 않는다
+        self.current = TopicIndex(generation, topics, self.current)
+        self._mtimes = mtimes
+        return True
+
+    def check(self):
+        if self._stat() != self._mtimes:
+            return self.reload()
+        return False
+
+
+def _coprime_stride(n, rng):
+    if n <= 2:
+        return 1
+    while True:
+        a = rng.randrange(1, n)
+        if math.gcd(a, n) == 1:
+            return a
+
+
+class TopicDeck:
+    # 방마다 하나. 제시어 순열을 리스트로 만들지 않고 (a*i + b) mod n (gcd(a, n) = 1)으로
+    # 계산하므로 방당 메모리는 주제 수만큼의 정수 몇 개뿐이다.
+    # 한 주제의 제시어를 다 쓰기 전에는 같은 제시어가 다시 나오지 않는다.
+    __slots__ = ("rng", "generation", "rotation", "cursors")
+
+    def __init__(self, rng=None):
+        self.rng = rng or random
+        self.generation = None
+        self.rotation = []  # 이번 바퀴에 남은 주제 (뽑을 때마다 하나씩 소비)
+        self.cursors = {}  # category -> [a, b, i]
+
+    def draw(self, index, rng=None):
+        # rng: 엔진의 rng를 넘기면 같은 seed에서 역할뿐 아니라 제시어도 같게 나온다
+        rng = rng or self.rng
+        if self.generation != index.generation:
+            # 다시 읽어도 제시어 목록이 그대로인 주제는 커서를 이어 써서 반복을 막는다
+            if self.cursors:
+                self.cursors = {c: cur for c, cur in self.cursors.items()
+                                if index.since.get(c, index.generation) <= self.generation}
+            self.rotation = [c for c in self.rotation if c in index.words]
+            self.generation = index.generation
+        if not index.categories:
+            return None, None
+        if not self.rotation:
+            self.rotation = list(index.categories)
+            rng.shuffle(self.rotation)
+        category = self.rotation.pop()
+        words = index.words[category]
+        n = len(words)
+        cur = self.cursors.get(category)
+        if cur is None or cur[2] >= n:
+            cur = self.cursors[category] = [_coprime_stride(n, rng), rng.randrange(n), 0]
+        a, b, i = cur
+        cur[2] = i + 1
+        return category, words[(a * i + b) % n]
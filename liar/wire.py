@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+import inspect
+import json as _json
+from urllib.parse import parse_qs
+
+from engineio import packet as eio_packet
+from socketio import AsyncManager, Manager, RedisManager, packet
+
+try:
+    import msgpack
+except ImportError:  # MessagePack은 선택 사항: 없으면 JSON만
+    msgpack = None
+
+
+class CompactJSON:
+    # 한글을 \uXXXX(6바이트)로 늘리지 않고 UTF-8(3바이트) 그대로 보낸다
+    @staticmethod
+    def dumps(*args, **kwargs):
+        kwargs.setdefault("ensure_ascii", False)
+        return _json.dumps(*args, **kwargs)
+
+    @staticmethod
+    def loads(*args, **kwargs):
+        return _json.loads(*args, **kwargs)
+
+
+class WirePacket(packet.Packet):
+    # 들어오는 패킷은 형식을 스스로 알 수 있다: bytes면 MessagePack, str이면 기존 JSON 텍스트
+    def decode(self, encoded_packet):
+        if isinstance(encoded_packet, (bytes, bytearray)) and msgpack is not None:
+            decoded = msgpack.loads(encoded_packet)
+            self.packet_type = decoded["type"]
+            self.data = decoded.get("data")
+            self.id = decoded.get("id")
+            self.namespace = decoded.get("nsp") or "/"
+            return 0
+        return super().decode(encoded_packet)
+
+    def encode_msgpack(self):
+        return msgpack.dumps(self._to_dict())
+
+
+def wants_msgpack(environ):
+    if msgpack is None:
+        return False
+    query = parse_qs(environ.get("QUERY_STRING", ""))
+    return query.get("wire", [""])[0] == "msgpack"
+
+
+class _WireMixin:
+    # 연결마다 직렬화 형식을 고른다 (client.js가 ?wire=msgpack 으로 요청).
+    # 방송은 형식별로 한 번씩만 인코딩하고 같은 패킷을 참가자들에게 재사용한다.
+    def _init_wire(self):
+        self.msgpack_eio = set()
+
+    def _note_connect(self, sid, eio_sid):
+        if sid is not None and wants_msgpack(self.server.environ.get(eio_sid, {})):
+            self.msgpack_eio.add(eio_sid)
+
+    def fanout(self, event, data, namespace, room=None, skip_sid=None):
+        # [(eio_sid, engine.io 패킷)] — 보낼 대상은 지금 이 순간의 방 참가자
+        if namespace not in self.rooms:
+            return []
+        if isinstance(data, tuple):
+            data = list(data)
+        elif data is not None:
+            data = [data]
+        else:
+            data = []
+        if not isinstance(skip_sid, list):
+            skip_sid = [skip_sid]
+        pkt = self.server.packet_class(packet.EVENT, namespace=namespace, data=[event] + data)
+        as_json = as_msgpack = None
+        out = []
+        for sid, eio_sid in self.get_participants(namespace, room):
+            if sid in skip_sid:
+                continue
+            if eio_sid in self.msgpack_eio:
+                if as_msgpack is None:
+                    as_msgpack = eio_packet.Packet(eio_packet.MESSAGE, pkt.encode_msgpack())
+                out.append((eio_sid, as_msgpack))
+            else:
+                if as_json is None:
+                    encoded = pkt.encode()
+                    if not isinstance(encoded, list):
+                        encoded = [encoded]
+                    as_json = [eio_packet.Packet(eio_packet.MESSAGE, p) for p in encoded]
+                for p in as_json:
+                    out.append((eio_sid, p))
+        return out
+
+
+class WireManager(_WireMixin, Manager):
+    def __init__(self):
+        super().__init__()
+        self._init_wire()
+
+    def connect(self, eio_sid, namespace):
+        sid = super().connect(eio_sid, namespace)
+        self._note_connect(sid, eio_sid)
+        return sid
+
+    def disconnect(self, sid, namespace, **kwargs):
+        eio_sid = self.eio_sid_from_sid(sid, namespace)
+        ret = super().disconnect(sid, namespace, **kwargs)
+        self.msgpack_eio.discard(eio_sid)
+        return ret
+
+    def emit(self, event, data, namespace, room=None, skip_sid=None,
+             callback=None, to=None, **kwargs):
+        if callback:
+            return super().emit(event, data, namespace, room=room, skip_sid=skip_sid,
+                                callback=callback, to=to, **kwargs)
+        for eio_sid, p in self.fanout(event, data, namespace, to or room, skip_sid):
+            self.server._send_eio_packet(eio_sid, p)
+
+
+class WireRedisManager(_WireMixin, RedisManager):
+    # 여러 워커 (STORE_URL): Flask-SocketIO message_queue와 같은 채널로 방송을 모든 워커에 퍼뜨리고,
+    # 받은 워커는 자기 소켓에만 형식별로 한 번씩 인코딩해서 보낸다.
+    # 다른 워커에 붙은 sid의 방 입장/퇴장도 RedisManager가 메시지로 넘긴다 (enter_room/leave_room).
+    def __init__(self, url, channel="flask-socketio"):
+        super().__init__(url, channel=channel)
+        self._init_wire()
+
+    def connect(self, eio_sid, namespace):
+        sid = super().connect(eio_sid, namespace)
+        self._note_connect(sid, eio_sid)
+        return sid
+
+    def disconnect(self, sid, namespace, **kwargs):
+        eio_sid = self.eio_sid_from_sid(sid, namespace)
+        ret = super().disconnect(sid, namespace, **kwargs)
+        self.msgpack_eio.discard(eio_sid)
+        return ret
+
+    def _handle_emit(self, message):
+        # 이 워커에 붙은 참가자에게만 (콜백 없는 방송만 쓴다)
+        data = message["data"]
+        data = data[0] if len(data) == 1 else tuple(data)
+        for eio_sid, p in self.fanout(message["event"], data, message.get("namespace") or "/",
+                                      message.get("room"), message.get("skip_sid")):
+            self.server._send_eio_packet(eio_sid, p)
+
+    def publish_emit(self, event, data, namespace, room):
+        # 다른 워커에게만 (이 워커 몫은 호출한 쪽이 fanout으로 나눠 보낼 때)
+        self._publish({"method": "emit", "event": event, "data": [data], "binary": False,
+                       "namespace": namespace, "room": room, "skip_sid": None, "callback": None,
+                       "host_id": self.host_id})
+
+
+class AsyncWireManager(_WireMixin, AsyncManager):
+    # asyncio 서버용 (ASYNC_MODE=asgi). 인코딩/대상 선택은 WireManager와 같다.
+    def __init__(self):
+        super().__init__()
+        self._init_wire()
+
+    async def connect(self, eio_sid, namespace):
+        sid = await super().connect(eio_sid, namespace)
+        self._note_connect(sid, eio_sid)
+        return sid
+
+    async def disconnect(self, sid, namespace, **kwargs):
+        eio_sid = self.eio_sid_from_sid(sid, namespace)
+        ret = await super().disconnect(sid, namespace, **kwargs)
+        self.msgpack_eio.discard(eio_sid)
+        return ret
+
+    async def emit(self, event, data, namespace, room=None, skip_sid=None,
+                   callback=None, to=None, **kwargs):
+        if callback:
+            return await super().emit(event, data, namespace, room=room, skip_sid=skip_sid,
+                                      callback=callback, to=to, **kwargs)
+        for eio_sid, p in self.fanout(event, data, namespace, to or room, skip_sid):
+            await self.server._send_eio_packet(eio_sid, p)
+
+
+def install(server):
+    # 연결 응답(CONNECT) 등 매니저를 거치지 않는 패킷도 연결 형식에 맞춰 보낸다
+    send_packet = server._send_packet
+
+    if inspect.iscoroutinefunction(send_packet):
+        async def _send_packet(eio_sid, pkt):
+            if eio_sid in server.manager.msgpack_eio:
+                await server.eio.send(eio_sid, pkt.encode_msgpack())
+            else:
+                await send_packet(eio_sid, pkt)
+    else:
+        def _send_packet(eio_sid, pkt):
+            if eio_sid in server.manager.msgpack_eio:
+                server.eio.send(eio_sid, pkt.encode_msgpack())
+            else:
+                send_packet(eio_sid, pkt)
+    server._send_packet = _send_packet
+
+
+def event_name(data):
+    # 전송 패킷에서 이벤트 이름만 꺼낸다 (계측용)
+    if isinstance(data, str):
+        # '2["event",{...}]' (네임스페이스가 있으면 '2/ns,["event",...]')
+        parts = data.split('"', 2)
+        if len(parts) == 3:
+            return parts[1]
+    elif msgpack is not None:
+        try:
+            return msgpack.loads(data)["data"][0]
+        except Exception:
+            pass
+    return "other"
@@ -1,28 +1,105 @@
 (function(){
-  const socket = io();
+  // 서버가 MessagePack을 권하면(window.APP.wire) 바이너리 파서로 접속, 아니면 기본 JSON
+  const wire = (window.APP && window.APP.wire) || "json";
+  const socket = (wire === "msgpack" && window.LiarWire)
+    ? io({parser: window.LiarWire, query: {wire: "msgpack"}})
+    : io();
 
   // util
   const $ = (sel) => document.querySelector(sel);
   const $$ = (sel) => Array.from(document.querySelectorAll(sel));
   const meName = (window.APP && window.APP.name) || "";
+  const meRoom = (window.APP && window.APP.room) || "";
+  const meToken = (window.APP && window.APP.token) || "";
+  const seqKey = "liar:seq:" + meRoom;
 
   let isHost = false;
   let roundNum = 0;
   let currentPhase = "-";
   let order = [];
   let hintIndex = -1;
+  let myPid = null;
+  let myRole = null;
+  let leaving = false;
+
+  // 게임 메시지는 플레이어를 방 안의 작은 정수 pid로만 가리킨다.
+  // 이름표는 로비 명단(lobby_state / lobby_delta)에서 채우고, 나간 사람 이름도 지우지 않는다.
+  const names = {};
+  function nameOf(pid){ return names[pid] || "?"; }
+  const ROLE_LABELS = {liar: "라이어", spy: "스파이", citizen: "시민"};
+
+  // 방 방송에는 순번(seq)이 붙어 온다: 마지막으로 본 순번을 기억했다가
+  // 재접속/페이지 이동 때 서버에 알려주면 놓친 이벤트만 다시 받는다
+  function loadSeq(){
+    const v = sessionStorage.getItem(seqKey);
+    return v === null ? null : Number(v);
+  }
+  function saveSeq(seq){ sessionStorage.setItem(seqKey, String(seq)); }
+
+  const handlers = {};
+  function on(ev, fn){
+    (handlers[ev] = handlers[ev] || []).push(fn);
+    socket.on(ev, (d)=>{
+      fn(d);
+      if(!leaving && d && typeof d.seq === "number") saveSeq(d.seq);
+    });
+  }
 
   // 공용: 연결 & 등록
   socket.on("connect", ()=>{
     if(meName){
-      socket.emit("register", {name: meName});
+      socket.emit("register", {name: meName, room: meRoom, token: meToken, last_seq: loadSeq()});
     }
   });
 
-  // ✅ 공용: 로비 상태 수신(로비/게임 어디서든 호스트 표시/버튼 표시 갱신)
-  socket.on("lobby_state", (state)=>{
+  socket.on("session", (d)=>{ myPid = d.pid; });
+
+  // 너무 오래 끊겨 있었으면 서버가 현재 상태를 이벤트 묶음으로 보낸다
+  socket.on("snapshot", (snap)=>{
+    (snap.events || []).forEach(([ev, payload])=>{
+      (handlers[ev] || []).forEach(fn => fn(payload));
+    });
+    if(!leaving) saveSeq(snap.seq);
+  });
+
+  // ✅ 공용: 로비 명단 (로비/게임 어디서든 호스트 표시/버튼 표시 갱신)
+  // 처음엔 lobby_state 스냅샷을 받고, 이후엔 버전이 붙은 lobby_delta만 받아 이어붙인다
+  const lobby = {version: -1, players: [], hostName: null};
+
+  function lobbyKey(p){ return [p.is_host ? 0 : 1, p.name, p.pid]; }
+  function lobbyLess(a, b){
+    const ka = lobbyKey(a), kb = lobbyKey(b);
+    for(let i=0;i<ka.length;i++){ if(ka[i] !== kb[i]) return ka[i] < kb[i]; }
+    return false;
+  }
+  function lobbyInsert(p){
+    let i = 0;
+    while(i < lobby.players.length && lobbyLess(lobby.players[i], p)) i++;
+    lobby.players.splice(i, 0, p);
+  }
+  function lobbyRemove(pid){
+    const i = lobby.players.findIndex(p => p.pid === pid);
+    if(i >= 0) return lobby.players.splice(i, 1)[0];
+    return null;
+  }
+  function lobbyApply(op){
+    if(op.type === "player_joined"){
+      names[op.player.pid] = op.player.name;
+      lobbyRemove(op.player.pid);
+      lobbyInsert(op.player);
+    }else if(op.type === "player_left"){
+      lobbyRemove(op.pid);
+    }else if(op.type === "host_changed"){
+      lobby.players.filter(p => p.is_host).forEach(p=>{ lobbyRemove(p.pid); p.is_host = false; lobbyInsert(p); });
+      const h = lobbyRemove(op.host_pid);
+      if(h){ h.is_host = true; lobbyInsert(h); }
+      lobby.hostName = op.host_name;
+    }
+  }
+
+  function renderLobby(){
     // 호스트 여부 반영
-    const me = (state.players || []).find(p => p.name === meName);
+    const me = lobby.players.find(p => myPid ? p.pid === myPid : p.name === meName);
     isHost = !!(me && me.is_host);
     if(isHost) document.body.classList.add("host-enabled"); else document.body.classList.remove("host-enabled");
 
@@ -30,18 +107,45 @@
     const hostInfo = $("#host-info");
     const startBtn = $("#start-btn");
     const playerList = $("#player-list");
-    if(hostInfo) hostInfo.innerText = "호스트: " + (state.host_name || "대기중…");
+    if(hostInfo) hostInfo.innerText = "호스트: " + (lobby.hostName || "대기중…");
     if(startBtn) startBtn.disabled = !isHost;
     if(playerList){
       playerList.innerHTML = "";
-      (state.players || []).forEach(p=>{
+      lobby.players.forEach(p=>{
         const li = document.createElement("li");
         li.textContent = p.name + (p.is_host ? " 👑" : "");
         playerList.appendChild(li);
       });
     }
+  }
+
+  socket.on("lobby_state", (state)=>{
+    lobby.version = state.version;
+    lobby.players = state.players || [];
+    lobby.players.forEach(p=>{ names[p.pid] = p.name; });
+    lobby.hostName = state.host_name;
+    renderLobby();
+  });
+
+  socket.on("lobby_delta", (d)=>{
+    if(d.to <= lobby.version) return;           // 이미 스냅샷에 반영된 변경
+    if(d.from > lobby.version){                 // 중간 변경을 놓침 → 스냅샷 요청
+      socket.emit("lobby_sync", {version: lobby.version});
+      return;
+    }
+    d.ops.forEach(op=>{ if(op.v > lobby.version) lobbyApply(op); });
+    lobby.version = d.to;
+    renderLobby();
   });
 
+  // 한 페이지 모드(/play)에서는 로비/게임 화면이 모두 들어 있고 하나만 보인다
+  function showView(name){
+    const views = $$(".view");
+    if(!views.length) return false;
+    views.forEach(v => v.classList.toggle("hidden", v.id !== "view-" + name));
+    return true;
+  }
+
   // ───── index: 없음 ─────
 
   // ───── LOBBY ─────
@@ -75,7 +179,12 @@
       }
     });
 
-    socket.on("game_started", ()=>{
+    on("game_started", (g)=>{
+      // 한 페이지 모드: 같은 소켓 그대로 게임 화면으로 바꿔 끼운다
+      if(showView("game")) return;
+      // 게임 화면이 game_started부터 다시 받도록 순번을 그 직전으로 두고 이동
+      if(typeof g.seq === "number") saveSeq(g.seq - 1); else sessionStorage.removeItem(seqKey);
+      leaving = true;
       window.location.href = "/game";
     });
   }
@@ -105,21 +214,17 @@
   const scoreboard = $("#scoreboard");
   let timerId=null, remain=0;
 
-  function setTimer(sec){
+  // 타이머는 서버가 관리: 서버가 알려준 남은 시간(ms)만큼 화면만 카운트다운
+  function setTimer(d){
     clearInterval(timerId);
-    remain = sec;
-    renderTimer();
-    timerId = setInterval(()=>{
-      remain -= 1;
+    const deadline = Date.now() + (d.ms !== undefined ? d.ms : (d.seconds || 0) * 1000);
+    const tick = ()=>{
+      remain = Math.ceil((deadline - Date.now()) / 1000);
       renderTimer();
-      if(remain <= 0){
-        clearInterval(timerId);
-        if(isHost && currentPhase.startsWith("hint")){
-          // 자동 다음 발언자
-          socket.emit("hint_next", {index: ++hintIndex});
-        }
-      }
-    }, 1000);
+      if(remain <= 0) clearInterval(timerId);
+    };
+    tick();
+    timerId = setInterval(tick, 250);
   }
   function renderTimer(){
     const m = String(Math.floor(Math.max(remain,0)/60)).padStart(2,"0");
@@ -147,89 +252,95 @@
   }
 
   socket.on("role_info", (info)=>{
-    if(roleEl) roleEl.textContent = info.role;
+    myRole = info.role;
+    if(roleEl) roleEl.textContent = ROLE_LABELS[info.role] || info.role;
     if(topicEl) topicEl.textContent = info.topic || "-";
     if(keyEl) keyEl.textContent = info.keyword || "???";
   });
 
-  socket.on("game_started", (g)=>{
+  on("game_started", (g)=>{
     roundNum = g.round;
     if(roundEl) roundEl.textContent = String(roundNum);
   });
 
-  socket.on("hint_order", (data)=>{
+  on("hint_order", (data)=>{
     currentPhase = data.phase;
     if(phaseEl) phaseEl.textContent = phaseKo(currentPhase);
     order = data.order || [];
     if(orderList){
       orderList.innerHTML = "";
-      order.forEach((p, idx)=>{
+      order.forEach((pid, idx)=>{
         const li = document.createElement("li");
-        li.textContent = `${idx+1}. ${p.name}`;
+        li.textContent = `${idx+1}. ${nameOf(pid)}`;
         orderList.appendChild(li);
       });
     }
     hintIndex = -1;
-    if(isHost){
-      // 첫 발언자 시작
-      socket.emit("hint_next", {index: 0});
-    }
   });
 
-  socket.on("hint_turn", (d)=>{
+  on("hint_turn", (d)=>{
     hintIndex = d.index;
-    if(currentSpeaker) currentSpeaker.textContent = d.name || "-";
-    setTimer(d.seconds || 15);
+    if(currentSpeaker) currentSpeaker.textContent = nameOf(d.pid);
+    setTimer(d);
   });
 
-  socket.on("start_timer", (d)=>{
-    currentPhase = "discussion";
-    if(phaseEl) phaseEl.textContent = phaseKo(currentPhase) + ` (${d.label || ""})`;
-    setTimer(d.seconds || 120);
+  on("start_timer", (d)=>{
+    currentPhase = d.phase || "discussion";
+    if(phaseEl) phaseEl.textContent = phaseKo(currentPhase);
+    setTimer(d);
   });
 
-  socket.on("open_vote", (d)=>{
+  on("open_vote", (d)=>{
+    clearInterval(timerId);
+    remain = 0;
+    renderTimer();
     currentPhase = d.phase;
     if(phaseEl) phaseEl.textContent = phaseKo(currentPhase);
     if(voteGrid) voteGrid.innerHTML = "";
     if(voteLog) voteLog.innerHTML = "";
-    (d.players || []).forEach(p=>{
-      if(p.name === meName) return; // 자기 자신 투표 방지
+    (d.players || []).forEach(pid=>{
+      if(pid === myPid) return; // 자기 자신 투표 방지
       const btn = document.createElement("button");
       btn.className = "vote-btn";
-      btn.textContent = `🗳️ ${p.name}`;
+      btn.textContent = `🗳️ ${nameOf(pid)}`;
       btn.addEventListener("click", ()=>{
         $$(".vote-btn").forEach(b=>b.disabled=true);
         btn.classList.add("voted");
-        socket.emit("cast_vote", {target_sid: p.sid});
+        socket.emit("cast_vote", {target: pid});
       });
       voteGrid.appendChild(btn);
     });
   });
 
-  socket.on("vote_update", (d)=>{
-    const li = document.createElement("li");
-    li.textContent = `${d.voter} ➜ ${d.target}`;
-    voteLog.appendChild(li);
+  // 서버가 짧은 구간의 표 변경을 묶어서 보냄
+  on("vote_progress", (d)=>{
+    if(!voteLog) return;
+    (d.votes || []).forEach(([voter, target])=>{
+      const li = document.createElement("li");
+      li.textContent = `${nameOf(voter)} ➜ ${nameOf(target)}`;
+      voteLog.appendChild(li);
+    });
   });
 
-  socket.on("vote_closed", (d)=>{
+  on("vote_closed", (d)=>{
+    clearInterval(timerId);
     const li = document.createElement("li");
-    li.textContent = `✅ ${d.phase} 마감 (최다: ${d.top.join(", ") || "없음"} / 표수: ${d.max || 0})`;
+    li.textContent = `✅ ${d.phase} 마감 (최다: ${d.top.map(nameOf).join(", ") || "없음"} / 표수: ${d.max || 0})`;
     voteLog.appendChild(li);
   });
 
-  socket.on("liar_selected", (d)=>{
-    toast(`😈 라이어(${d.liar_name})가 지목됐어요! 30초 안에 정답을 맞추세요.`);
-    if(roleEl && roleEl.textContent === "라이어"){
-      const guess = prompt(`주제: ${d.category}\n정답(제시어)을 입력하세요 (30초 제한):`);
+  on("liar_selected", (d)=>{
+    setTimer(d);
+    toast(`😈 라이어(${nameOf(d.liar_pid)})가 지목됐어요! ${d.seconds}초 안에 정답을 맞추세요.`);
+    if(myRole === "liar"){
+      const guess = prompt(`주제: ${d.category}\n정답(제시어)을 입력하세요 (${d.seconds}초 제한):`);
       if(guess){
         socket.emit("liar_guess", {guess});
       }
     }
   });
 
-  socket.on("round_result", (res)=>{
+  on("round_result", (res)=>{
     const li = document.createElement("li");
     const w = (res.winner === "citizens") ? "🎉 시민 승리!" : "😎 라이어팀 승리!";
     li.textContent = `${w} (정답: ${res.secret_word} / 주제: ${res.category})`;
@@ -237,11 +348,11 @@
     toast("라운드 종료! 점수가 반영되었어요.");
   });
 
-  socket.on("final_scores", (data)=>{
+  on("final_scores", (data)=>{
     if(scoreboard) scoreboard.innerHTML = "";
-    data.scores.forEach((s, idx)=>{
+    data.scores.forEach(([pid, score], idx)=>{
       const li = document.createElement("li");
-      li.textContent = `#${idx+1} ${s.name} — ${s.score}점`;
+      li.textContent = `#${idx+1} ${nameOf(pid)} — ${score}점`;
       scoreboard.appendChild(li);
     });
     toast("🏁 게임 종료! 최종 점수 공개");
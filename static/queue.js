@@ -0,0 +1,48 @@
+(function(){
+  // 빠른 시작 대기열: 서버가 테이블을 만들면(matched) 그 방 코드로 /join 폼을 대신 보낸다
+  const wire = (window.APP && window.APP.wire) || "json";
+  const socket = (wire === "msgpack" && window.LiarWire)
+    ? io({parser: window.LiarWire, query: {wire: "msgpack"}})
+    : io();
+  const me = window.APP || {};
+  const opts = window.QUEUE || {};
+  const $ = (sel) => document.querySelector(sel);
+  let matched = false;
+
+  socket.on("connect", ()=>{
+    if(matched) return;
+    socket.emit("queue", {name: me.name, token: me.token, party: opts.party, hold: opts.hold});
+  });
+
+  socket.on("queue_state", (s)=>{
+    const solo = s.members.length === 1 && !s.held;
+    $("#party-box").classList.toggle("hidden", solo);
+    $("#party-code").textContent = s.party;
+    const list = $("#party-list");
+    list.innerHTML = "";
+    s.members.forEach(name=>{
+      const li = document.createElement("li");
+      li.textContent = name;
+      list.appendChild(li);
+    });
+    $("#ready-btn").classList.toggle("hidden", !(s.held && s.leader));
+    $("#queue-status").textContent = s.held
+      ? (s.leader ? "친구를 기다리는 중… 다 모이면 매칭 시작을 눌러 주세요" : "파티장이 매칭을 시작하기를 기다리는 중…")
+      : `${s.table_size}명 테이블을 찾는 중… (대기 ${s.waiting}명)`;
+  });
+
+  socket.on("matched", (d)=>{
+    matched = true;
+    $("#queue-status").textContent = "테이블을 찾았어요! 입장합니다…";
+    $("#join-room").value = d.room;
+    $("#join-form").submit();
+  });
+
+  socket.on("error", (d)=>{ $("#queue-status").textContent = "⚠️ " + (d && d.message || "오류"); });
+
+  $("#ready-btn").addEventListener("click", ()=> socket.emit("queue_ready"));
+  $("#leave-btn").addEventListener("click", ()=>{
+    socket.emit("queue_leave");
+    location.href = "/";
+  });
+})();
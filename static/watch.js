@@ -0,0 +1,73 @@
+(function(){
+  // 관전 화면: 서버가 초당 몇 번 보내는 스냅샷(spectate) 한 장으로 매번 전체를 다시 그린다.
+  // 역할/제시어는 오지 않는다. 정답은 라운드 결과가 나온 뒤에만 스냅샷에 들어 있다.
+  const wire = (window.APP && window.APP.wire) || "json";
+  const socket = (wire === "msgpack" && window.LiarWire)
+    ? io({parser: window.LiarWire, query: {wire: "msgpack"}})
+    : io();
+  const room = (window.APP && window.APP.room) || "";
+  const $ = (sel) => document.querySelector(sel);
+  const PHASES = {
+    lobby: "대기실", hint1: "1차 힌트", discussion: "전체 토론", vote1: "1차 투표", hint2: "2차 힌트",
+    vote2: "2차 투표", liar_guess: "라이어 정답 맞추기", results: "라운드 결과", summary: "최종 결과"
+  };
+  let timerId = null;
+
+  socket.on("connect", ()=> socket.emit("watch", {room}));
+
+  function setText(sel, text){ const el = $(sel); if(el) el.textContent = text; }
+
+  function list(sel, items){
+    const el = $(sel);
+    if(!el) return;
+    el.innerHTML = "";
+    items.forEach(text=>{
+      const li = document.createElement("li");
+      li.textContent = text;
+      el.appendChild(li);
+    });
+  }
+
+  function setTimer(ms){
+    clearInterval(timerId);
+    const deadline = Date.now() + ms;
+    const tick = ()=>{
+      const remain = Math.max(0, Math.ceil((deadline - Date.now()) / 1000));
+      setText("#timer", `${String(Math.floor(remain/60)).padStart(2,"0")}:${String(remain%60).padStart(2,"0")}`);
+      if(remain <= 0) clearInterval(timerId);
+    };
+    tick();
+    timerId = setInterval(tick, 250);
+  }
+
+  socket.on("spectate", (s)=>{
+    const names = {};
+    s.players.forEach(([pid, name])=>{ names[pid] = name; });
+    const nameOf = (pid) => names[pid] || "?";
+
+    setText("#watchers", String(s.watchers));
+    setText("#round", s.round ? `${s.round} / ${s.max_rounds}` : "-");
+    setText("#phase", PHASES[s.phase] || s.phase);
+    setTimer(s.ms || 0);
+    list("#order-list", (s.order || []).map((pid, i)=> `${i+1}. ${nameOf(pid)}`));
+    setText("#current-speaker strong", s.speaker !== null ? nameOf(s.speaker) : "-");
+    list("#vote-counts", (s.counts || []).map(([pid, n])=> `${nameOf(pid)} ${n}표`));
+
+    const scores = s.final ? s.final.scores
+      : s.players.map(([pid, , score])=> [pid, score]).sort((a, b)=> b[1] - a[1]);
+    list("#scoreboard", scores.map(([pid, score], i)=>
+      `#${i+1} ${nameOf(pid)}${pid === s.host_pid ? " 👑" : ""} — ${score}점`));
+
+    const result = $("#result");
+    if(!result) return;
+    if(s.accused !== null){
+      result.textContent = `😈 라이어(${nameOf(s.accused)})가 지목됐어요! 정답을 맞추는 중…`;
+    }else if(s.result){
+      const w = s.result.winner === "citizens" ? "🎉 시민 승리!" : "😎 라이어팀 승리!";
+      result.textContent = `${w} (정답: ${s.result.secret_word} / 주제: ${s.result.category})`;
+    }
+    result.classList.toggle("hidden", s.accused === null && !s.result);
+  });
+
+  socket.on("error", (e)=>{ setText("#phase", (e && e.message) || "오류"); });
+})();
@@ -0,0 +1,153 @@
+// MessagePack 코덱 + Socket.IO 파서 (socket.io-msgpack-parser와 같은 패킷 형식)
+// 서버가 권할 때만 client.js가 io({parser: window.LiarWire, query: {wire: "msgpack"}})로 사용한다.
+(function(){
+  const te = new TextEncoder();
+  const td = new TextDecoder();
+
+  // ───── encode ─────
+  function encode(value){
+    const out = [];
+    write(out, value);
+    return new Uint8Array(out);
+  }
+  function u16(out, n){ out.push((n >>> 8) & 0xff, n & 0xff); }
+  function u32(out, n){ out.push((n >>> 24) & 0xff, (n >>> 16) & 0xff, (n >>> 8) & 0xff, n & 0xff); }
+  function bytes(out, b){ for(let i=0;i<b.length;i++) out.push(b[i]); }
+  function write(out, v){
+    if(v === null || v === undefined){ out.push(0xc0); return; }
+    if(v === false){ out.push(0xc2); return; }
+    if(v === true){ out.push(0xc3); return; }
+    if(typeof v === "number"){
+      if(Number.isInteger(v) && v >= -2147483648 && v <= 4294967295){
+        if(v >= 0){
+          if(v < 0x80) out.push(v);
+          else if(v < 0x100) out.push(0xcc, v);
+          else if(v < 0x10000){ out.push(0xcd); u16(out, v); }
+          else { out.push(0xce); u32(out, v); }
+        }else{
+          if(v >= -32) out.push(v & 0xff);
+          else if(v >= -128) out.push(0xd0, v & 0xff);
+          else if(v >= -32768){ out.push(0xd1); u16(out, v); }
+          else { out.push(0xd2); u32(out, v); }
+        }
+        return;
+      }
+      const b = new Uint8Array(8);
+      new DataView(b.buffer).setFloat64(0, v);
+      out.push(0xcb); bytes(out, b);
+      return;
+    }
+    if(typeof v === "string"){
+      const b = te.encode(v);
+      const n = b.length;
+      if(n < 32) out.push(0xa0 | n);
+      else if(n < 0x100) out.push(0xd9, n);
+      else if(n < 0x10000){ out.push(0xda); u16(out, n); }
+      else { out.push(0xdb); u32(out, n); }
+      bytes(out, b);
+      return;
+    }
+    if(v instanceof ArrayBuffer || ArrayBuffer.isView(v)){
+      const b = v instanceof ArrayBuffer ? new Uint8Array(v) : new Uint8Array(v.buffer, v.byteOffset, v.byteLength);
+      const n = b.length;
+      if(n < 0x100) out.push(0xc4, n);
+      else if(n < 0x10000){ out.push(0xc5); u16(out, n); }
+      else { out.push(0xc6); u32(out, n); }
+      bytes(out, b);
+      return;
+    }
+    if(Array.isArray(v)){
+      const n = v.length;
+      if(n < 16) out.push(0x90 | n);
+      else if(n < 0x10000){ out.push(0xdc); u16(out, n); }
+      else { out.push(0xdd); u32(out, n); }
+      v.forEach(x => write(out, x));
+      return;
+    }
+    const keys = Object.keys(v).filter(k => v[k] !== undefined);
+    const n = keys.length;
+    if(n < 16) out.push(0x80 | n);
+    else if(n < 0x10000){ out.push(0xde); u16(out, n); }
+    else { out.push(0xdf); u32(out, n); }
+    keys.forEach(k => { write(out, k); write(out, v[k]); });
+  }
+
+  // ───── decode ─────
+  function decode(buf){
+    const b = buf instanceof Uint8Array ? buf : new Uint8Array(buf);
+    const dv = new DataView(b.buffer, b.byteOffset, b.byteLength);
+    let pos = 0;
+    function str(n){ const s = td.decode(b.subarray(pos, pos + n)); pos += n; return s; }
+    function bin(n){ const s = b.slice(pos, pos + n).buffer; pos += n; return s; }
+    function arr(n){ const a = new Array(n); for(let i=0;i<n;i++) a[i] = read(); return a; }
+    function map(n){ const m = {}; for(let i=0;i<n;i++){ const k = read(); m[k] = read(); } return m; }
+    function read(){
+      const t = b[pos++];
+      if(t < 0x80) return t;
+      if(t < 0x90) return map(t & 0x0f);
+      if(t < 0xa0) return arr(t & 0x0f);
+      if(t < 0xc0) return str(t & 0x1f);
+      if(t >= 0xe0) return t - 0x100;
+      let v;
+      switch(t){
+        case 0xc0: return null;
+        case 0xc2: return false;
+        case 0xc3: return true;
+        case 0xc4: v = b[pos]; pos += 1; return bin(v);
+        case 0xc5: v = dv.getUint16(pos); pos += 2; return bin(v);
+        case 0xc6: v = dv.getUint32(pos); pos += 4; return bin(v);
+        case 0xca: v = dv.getFloat32(pos); pos += 4; return v;
+        case 0xcb: v = dv.getFloat64(pos); pos += 8; return v;
+        case 0xcc: return b[pos++];
+        case 0xcd: v = dv.getUint16(pos); pos += 2; return v;
+        case 0xce: v = dv.getUint32(pos); pos += 4; return v;
+        case 0xcf: v = Number(dv.getBigUint64(pos)); pos += 8; return v;
+        case 0xd0: v = dv.getInt8(pos); pos += 1; return v;
+        case 0xd1: v = dv.getInt16(pos); pos += 2; return v;
+        case 0xd2: v = dv.getInt32(pos); pos += 4; return v;
+        case 0xd3: v = Number(dv.getBigInt64(pos)); pos += 8; return v;
+        case 0xd9: v = b[pos]; pos += 1; return str(v);
+        case 0xda: v = dv.getUint16(pos); pos += 2; return str(v);
+        case 0xdb: v = dv.getUint32(pos); pos += 4; return str(v);
+        case 0xdc: v = dv.getUint16(pos); pos += 2; return arr(v);
+        case 0xdd: v = dv.getUint32(pos); pos += 4; return arr(v);
+        case 0xde: v = dv.getUint16(pos); pos += 2; return map(v);
+        case 0xdf: v = dv.getUint32(pos); pos += 4; return map(v);
+      }
+      throw new Error("msgpack: unsupported type 0x" + t.toString(16));
+    }
+    return read();
+  }
+
+  // ───── Socket.IO parser ─────
+  class Encoder {
+    encode(packet){
+      const out = {type: packet.type, data: packet.data, nsp: packet.nsp};
+      if(packet.id !== undefined) out.id = packet.id;
+      return [encode(out)];
+    }
+  }
+
+  class Decoder {
+    constructor(){ this.listeners = {}; }
+    on(ev, fn){ (this.listeners[ev] = this.listeners[ev] || []).push(fn); return this; }
+    off(ev, fn){
+      if(!ev){ this.listeners = {}; return this; }
+      this.listeners[ev] = (this.listeners[ev] || []).filter(f => f !== fn);
+      return this;
+    }
+    add(chunk){
+      if(typeof chunk === "string") throw new Error("msgpack parser: unexpected text frame");
+      const packet = decode(chunk);
+      if(typeof packet.type !== "number" || typeof packet.nsp !== "string") throw new Error("msgpack parser: invalid packet");
+      (this.listeners.decoded || []).slice().forEach(fn => fn(packet));
+    }
+    destroy(){}
+  }
+
+  window.LiarWire = {
+    protocol: 5,
+    PacketType: {CONNECT: 0, DISCONNECT: 1, EVENT: 2, ACK: 3, CONNECT_ERROR: 4, BINARY_EVENT: 5, BINARY_ACK: 6},
+    Encoder, Decoder, encode, decode
+  };
+})();
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import itertools
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.py는 import할 때 환경 변수를 읽는다: 디스크/계측 없이, 타이머는 테스트가 직접 돌린다
+os.environ["JOURNAL_DIR"] = ""
+os.environ["STATS_DB"] = ""
+os.environ["RATE_LIMIT"] = "0"
+os.environ["METRICS"] = "0"
+os.environ["STORE_URL"] = ""
+
+_serial = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def app():
+    import app as A
+    logging.getLogger("engineio.server").setLevel(logging.ERROR)  # 소켓 없는 sid로 보내는 경고
+    return A
+
+
+@pytest.fixture
+def table(app):
+    # 플레이어 n명이 앉은 방 하나 (첫 자리가 호스트). 소켓 없이 매니저에 sid만 등록한다
+    def make(n=4):
+        gs = app.ROOMS.create()
+        sids = []
+        for i in range(n):
+            sid = app.socketio.server.manager.connect("t%d" % next(_serial), "/")
+            app.register(sid, {"name": "p%d" % i, "room": gs.code, "token": "%s-%d" % (gs.code, i)})
+            sids.append(sid)
+        app.dispatch(sids[0], "claim_host", {"code": app.HOST_CODE})
+        return gs, sids
+    return make
+
+
+@pytest.fixture
+def respd():
+    # bench/respd.py (Redis 대역)를 빈 포트에 띄운다: 스레드 하나에서 이벤트 루프를 돌리고 redis:// 주소를 돌려준다
+    import asyncio
+    import threading
+    from bench import respd as R
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(R.serve(R.Store()), "127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield "redis://127.0.0.1:%d/0" % port
+
+    async def shutdown():
+        # 남은 연결(구독 포함)을 끊고 나서 루프를 멈춘다
+        server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from liar.actors import RoomActors
+
+
+def test_same_room_work_queues_behind_current_job():
+    actors = RoomActors()
+    log = []
+
+    def job(name):
+        log.append(name)
+        if name == "a1":
+            # 처리 중에 같은 방으로 보낸 일은 끼어들지 않고 뒤에 붙는다
+            assert actors.tell("A", job, "a2") is False
+            assert actors.tell("A", job, "a3") is False
+            # 다른 방은 기다리지 않는다
+            assert actors.tell("B", job, "b1") is True
+            log.append("a1 done")
+
+    assert actors.tell("A", job, "a1") is True
+    assert log == ["a1", "b1", "a1 done", "a2", "a3"]
+    assert len(actors) == 0
+    assert (actors.processed, actors.deferred, actors.max_depth) == (4, 2, 2)
+
+
+def test_failed_job_does_not_block_the_room(capsys):
+    actors = RoomActors()
+    log = []
+
+    def boom():
+        actors.tell("A", log.append, "next")
+        raise RuntimeError("boom")
+
+    actors.tell("A", boom)
+    assert log == ["next"] and actors.errors == 1 and len(actors) == 0
+    assert "RuntimeError: boom" in capsys.readouterr().err
+
+
+def test_threads_never_run_one_room_concurrently():
+    actors = RoomActors()
+    running = {"A": 0, "B": 0}
+    overlap = []
+    done = []
+
+    def job(key):
+        running[key] += 1
+        if running[key] > 1:
+            overlap.append(key)
+        time.sleep(0.001)
+        running[key] -= 1
+        done.append(key)
+
+    def worker(i):
+        for _ in range(20):
+            actors.tell("AB"[i % 2], job, "AB"[i % 2])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert overlap == []
+    assert len(done) == actors.processed == 120 and len(actors) == 0
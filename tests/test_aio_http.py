@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from liar.aio import WSGIApp
+
+
+def thread_name(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [threading.current_thread().name.encode()]
+
+
+def get(http, path):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+    asyncio.run(http(scope, receive, send))
+    return sent[1]["body"].decode()
+
+
+def test_offloaded_routes_run_on_their_executor():
+    http = WSGIApp(thread_name)
+    http.offloaded.append(("/leaderboard", ThreadPoolExecutor(1, "stats")))
+    assert get(http, "/leaderboard").startswith("stats")
+    assert get(http, "/") == "MainThread"
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+
+def test_socketio_client_falls_back_to_cdn(app, monkeypatch):
+    # static/vendor/를 받지 않은 체크아웃: 시작은 되고 페이지는 CDN 파일을 SRI로 고정해 쓴다
+    monkeypatch.setattr(app.ASSETS, "by_name", {k: v for k, v in app.ASSETS.by_name.items()
+                                                if k != app.SOCKETIO_CLIENT})
+    page = app.app.test_client().get("/").get_data(as_text=True)
+    src, integrity = app.SOCKETIO_CDN
+    assert '<script src="%s" integrity="%s" crossorigin="anonymous">' % (src, integrity) in page
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from liar.cluster import Cluster
+from liar.store import MemoryStore, RedisStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def vote(code, *args):
+    pass  # 방 작업: 이름(vote)으로 주인 워커에 넘어간다
+
+
+def local_timer(code):
+    pass  # 등록하지 않은 작업 (타이머처럼 워커 안에서만)
+
+
+def worker(store, name, clock=time.monotonic, ttl=15):
+    c = Cluster(store, worker=name, ttl=ttl, clock=clock)
+    c.task(vote)
+    c.delivered = []
+    c.deliver = lambda code, fn, args: c.delivered.append((code, fn.__name__, list(args)))
+    c.adopted_docs = []
+    c.adopt = c.adopted_docs.append
+    c.evicted = []
+    c.evict = c.evicted.append
+    return c
+
+
+def test_two_workers_agree_on_owner():
+    store, clock = MemoryStore(), Clock()
+    a, b = worker(store, "a", clock), worker(store, "b", clock)
+    assert a.claim("ROOM1")
+    assert not b.claim("ROOM1")  # 같은 코드는 먼저 차지한 워커 것
+    assert a.owner_of("ROOM1") == b.owner_of("ROOM1") == "a"
+    assert b.owner_of("ROOM1") == "a"
+    assert (b.cache_misses, b.cache_hits) == (1, 1)  # 두 번째는 저장소를 보지 않는다
+    clock.now = b.ttl / 2.0
+    b.owner_of("ROOM1")
+    assert b.cache_misses == 2  # ttl 절반이 지나면 다시 확인
+
+
+def test_forward_reaches_owner_handler():
+    store = MemoryStore()  # 같은 프로세스 안의 구독자에게 바로 전달
+    a, b = worker(store, "a"), worker(store, "b")
+    a.listen()
+    b.listen()
+    a.claim("ROOM1")
+    assert b.forward("ROOM1", vote, [7, 3])
+    assert a.delivered == [("ROOM1", "vote", [7, 3])] and b.delivered == []
+    assert (b.forwarded, a.received) == (1, 1)
+    assert a.forward("ROOM1", local_timer, [])  # 주인 워커 안에서는 등록 없이도 바로
+    assert a.delivered[-1] == ("ROOM1", "local_timer", [])
+    assert not b.forward("ROOM1", local_timer, [])  # 이름이 없는 작업은 넘기지 않는다
+    assert not b.forward("NOPE1", vote, [])  # 없는 방
+
+
+def test_forward_follows_owner_change():
+    store = MemoryStore()
+    a, b, c = worker(store, "a"), worker(store, "b"), worker(store, "c")
+    for w in (a, b, c):
+        w.listen()
+    a.claim("ROOM1")
+    c.owner_of("ROOM1")  # c는 a가 주인이라고 기억한다
+    a.owned.discard("ROOM1")  # 그사이 방이 b로 옮겼다
+    store.owners["ROOM1"] = "b"
+    b.owned.add("ROOM1")
+    c.forward("ROOM1", vote, [1])
+    # a가 받아서 (자기 방이 아니니) 주인을 다시 찾아 b에 넘긴다
+    assert b.delivered == [("ROOM1", "vote", [1])] and a.delivered == []
+    c.on_message("owners", ["ROOM1"])  # 주인이 바뀐 방은 'owners' 채널로 캐시 무효화
+    assert "ROOM1" not in c.owners
+    assert c.owner_of("ROOM1") == "b"
+
+
+def test_orphaned_room_adopted_after_lease_expires(respd):
+    a, b = worker(RedisStore(respd), "a", ttl=1), worker(RedisStore(respd), "b", ttl=1)
+    assert a.claim("ROOM1")
+    a.touch("ROOM1")
+    a.flush(lambda code: {"code": code, "phase": "vote2"})
+    assert b.owner_of("ROOM1") == "a" and b.adopted_docs == []
+    time.sleep(1.2)  # a가 죽어서 주인 표시를 연장하지 못했다
+    assert b.owner_of("ROOM1") == "b"
+    assert b.adopted_docs == [{"code": "ROOM1", "phase": "vote2"}] and b.adopted == 1
+    assert "ROOM1" in b.owned
+    assert a.owner_of("ROOM1") == "b"  # 다른 워커도 새 주인을 본다
+
+
+def test_forward_over_redis(respd):
+    a, b = worker(RedisStore(respd), "a"), worker(RedisStore(respd), "b")
+    a.claim("ROOM1")
+
+    def listen():
+        try:
+            a.listen()
+        except Exception:  # 테스트가 끝나 서버가 닫히면
+            pass
+
+    threading.Thread(target=listen, daemon=True).start()
+    deadline = time.monotonic() + 5
+    while not a.delivered and time.monotonic() < deadline:
+        b.forward("ROOM1", vote, ["가", 1])  # 구독이 붙기 전에 보낸 것은 사라진다
+        time.sleep(0.05)
+    assert a.delivered[0] == ("ROOM1", "vote", ["가", 1])
+
+
+def test_stalled_owner_drops_room_taken_over(respd):
+    a, b = worker(RedisStore(respd), "a", ttl=1), worker(RedisStore(respd), "b", ttl=1)
+    a.claim("ROOM1")
+    a.touch("ROOM1")
+    a.flush(lambda code: {"code": code, "by": "a"})
+    time.sleep(1.2)  # a가 ttl보다 오래 멈췄다
+    assert b.owner_of("ROOM1") == "b" and b.owned == {"ROOM1"}
+    a.touch("ROOM1")
+    a.flush(lambda code: {"code": code, "by": "a"})
+    assert a.evicted == ["ROOM1"] and a.owned == set() and a.lost == 1
+    assert b.store.load("ROOM1") == {"code": "ROOM1", "by": "a"}  # 빼앗긴 뒤 a는 저장하지 않았다 (이어받을 때 문서 그대로)
+    assert b.store.owner("ROOM1") == "b"
+    assert a.owner_of("ROOM1") == "b"
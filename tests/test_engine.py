@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from liar.engine import SENDER, Engine, Phase, Role
+from liar.rooms import GameState, Player
+from liar.topic_bank import TopicIndex
+
+
+def make_table(n, max_rounds=2):
+    gs = GameState("TEST")
+    for pid in range(1, n + 1):
+        gs.players[pid] = Player("p%d" % pid)
+    gs.max_rounds = max_rounds
+    return gs
+
+
+def play(seed, n=5):
+    # 로비 → 요약까지 서버 없이: 호스트/타이머가 보내는 명령만 차례로
+    engine = Engine(seed)
+    gs = make_table(n)
+    log = engine.start(gs)
+    while gs.phase != Phase.SUMMARY:
+        for phase in (Phase.HINT1, Phase.HINT2):
+            assert gs.phase == phase
+            for idx in range(1, len(gs.order) + 1):
+                log += engine.next_hint(gs, idx)  # 발언 시간 초과
+            if phase == Phase.HINT1:
+                assert gs.phase == Phase.DISCUSSION
+                log += engine.open_vote(gs, Phase.VOTE1)
+                log += engine.close_vote(gs, Phase.VOTE1)
+                log += engine.start_hint2(gs)
+        assert gs.phase == Phase.VOTE2
+        for voter in gs.players:
+            log += engine.cast_vote(gs, voter, gs.liar_pid if voter != gs.liar_pid else gs.order[0])
+        log += engine.close_vote(gs, Phase.VOTE2)
+        if gs.phase == Phase.LIAR_GUESS:
+            log += engine.guess(gs, gs.liar_pid, None)
+        assert gs.phase == Phase.RESULTS
+        log += engine.next_round(gs)
+    return gs, log
+
+
+def test_full_game_without_server():
+    gs, log = play(1)
+    names = [event for event, _, _ in log]
+    assert names.count("game_started") == 2
+    assert names.count("round_result") == 2
+    assert names[-1] == "final_scores"
+    # 역할 정보는 역할 채널로만, 나머지는 테이블 전체로
+    assert {to for event, _, to in log if event == "role_info"} == {Role.LIAR, Role.CITIZEN}
+    assert all(to is None for event, _, to in log if event != "role_info")
+    # 모두 라이어를 찍었다: 라이어가 못 맞히면 시민 승리
+    result = [p for event, p, _ in log if event == "round_result"][-1]
+    assert result["winner"] == "citizens" and result["accused"] == gs.liar_pid
+    assert gs.final_scores["scores"][0][1] >= 1
+
+
+def test_same_seed_same_events():
+    assert play(7)[1] == play(7)[1]
+    assert play(7)[1] != play(8)[1]
+
+
+def test_same_seed_same_topics():
+    # 제시어도 엔진의 rng로 뽑는다 (방마다 다른 덱이어도)
+    index = TopicIndex(1, {"동물": ["개", "고양이", "토끼", "말"], "과일": ["사과", "배", "감"]})
+
+    def rounds(seed):
+        engine = Engine(seed, draw_topic=lambda gs, rng: gs.deck.draw(index, rng))
+        gs = make_table(4, max_rounds=6)
+        out = []
+        for _ in range(6):
+            engine.begin_round(gs)
+            out.append((gs.category, gs.secret_word, gs.liar_pid))
+        return out
+
+    assert rounds(5) == rounds(5)
+    assert rounds(5) != rounds(6)
+
+
+def test_wrong_phase_commands_are_ignored():
+    engine = Engine(3)
+    gs = make_table(4)
+    assert engine.start(make_table(2)) == [("error", {"message": "최소 3명 이상이 필요합니다."}, SENDER)]
+    engine.start(gs)
+    assert engine.open_vote(gs, Phase.VOTE2) == []  # 1차 힌트에서 바로 2차 투표는 안 된다
+    engine.start_discussion(gs)
+    engine.open_vote(gs, Phase.VOTE2)
+    assert gs.phase == Phase.VOTE2
+    for cmd in (lambda: engine.start_discussion(gs), lambda: engine.open_vote(gs, Phase.VOTE1),
+                lambda: engine.start_hint2(gs), lambda: engine.next_hint(gs, 0),
+                lambda: engine.close_vote(gs, Phase.VOTE1), lambda: engine.guess(gs, gs.liar_pid, "x"),
+                lambda: engine.next_round(gs)):
+        assert cmd() == []
+        assert gs.phase == Phase.VOTE2
+    voter = next(pid for pid in gs.players if pid != gs.liar_pid)
+    assert engine.cast_vote(gs, voter, voter)[0][2] == SENDER
+    assert engine.cast_vote(gs, voter, gs.liar_pid)[0][0] == "vote_progress"
+    assert engine.cast_vote(gs, voter, gs.liar_pid) == []  # 같은 표는 변화 없음
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from liar.eventlog import EventLog
+
+
+def test_catch_up_from_last_seen():
+    log = EventLog(maxlen=4)
+    assert log.since(0) == [] and log.first_seq() == 1  # 아직 아무것도 안 보냈다
+    for i in range(3):
+        log.append("hint_turn", {"index": i})
+    assert log.since(3) == []  # 다 본 클라이언트
+    assert log.since(1) == [("hint_turn", {"index": 1}), ("hint_turn", {"index": 2})]
+    assert log.since(0) == [("hint_turn", {"index": i}) for i in range(3)]
+
+
+def test_wrapped_ring_forces_snapshot():
+    log = EventLog(maxlen=4)
+    for i in range(10):
+        log.append("hint_turn", {"index": i})
+    assert log.first_seq() == 7
+    assert log.since(6) == [("hint_turn", {"index": i}) for i in range(6, 10)]  # 남아 있는 만큼은 그대로
+    assert log.since(5) is None  # seq 6이 밀려났다: 스냅샷으로
+    assert log.since(None) is None  # 처음 붙는 클라이언트
+    assert log.since(11) is None  # 서버가 재시작해 순번이 줄었다
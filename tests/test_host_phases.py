@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from liar.engine import Phase
+
+
+def test_late_host_clicks_do_not_rewind(app, table):
+    gs, sids = table(4)
+    host = sids[0]
+    app.dispatch(host, "start_game")
+    app.dispatch(host, "start_discussion")
+    assert gs.phase == Phase.DISCUSSION
+    timer = gs.timer
+    app.dispatch(host, "start_discussion")  # 토론 중 다시 눌러도 타이머를 새로 걸지 않는다
+    assert gs.timer is timer
+
+    app.dispatch(host, "start_vote2")
+    assert gs.phase == Phase.VOTE2
+    for event in ("start_vote1", "start_hint2", "start_discussion", "next_round"):
+        app.dispatch(host, event)
+        assert gs.phase == Phase.VOTE2, event
+
+
+def test_summary_ignores_round_buttons(app, table):
+    gs, sids = table(4)
+    gs.round_num = gs.max_rounds
+    gs.phase = Phase.RESULTS
+    app.dispatch(sids[0], "next_round")
+    assert gs.phase == Phase.SUMMARY
+    for event in ("start_vote1", "start_vote2", "start_hint2", "start_discussion"):
+        app.dispatch(sids[0], event)
+        assert gs.phase == Phase.SUMMARY, event
+
+
+def test_late_hint_clicks_do_not_repeat_or_rewind(app, table):
+    gs, sids = table(4)
+    host = sids[0]
+    app.dispatch(host, "start_game")
+    assert gs.hint_index == 0
+    timer = gs.timer
+    app.dispatch(host, "hint_next", {"index": 0})  # 늦게 누른 '1차 힌트': 첫 발언자를 다시 세우지 않는다
+    assert gs.hint_index == 0 and gs.timer is timer
+
+    # 발언 시간이 끝나 서버 타이머가 다음 사람으로 넘긴 뒤에 '다음 차례'(hintIndex+1 = 1)가 도착
+    app.SCHED.cancel(gs.timer)
+    app.run_phase_timer(gs.code, gs.round_num, app.hint_timeout, ({"index": gs.hint_index},))
+    assert gs.hint_index == 1
+    timer = gs.timer
+    app.dispatch(host, "hint_next", {"index": 1})
+    assert gs.hint_index == 1 and gs.timer is timer  # 같은 사람의 시간을 다시 걸지 않는다
+    app.dispatch(host, "hint_next", {"index": 2})
+    assert gs.hint_index == 2 and gs.timer is not timer
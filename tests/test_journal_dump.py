@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+from liar.journal import dump_room
+from liar.rooms import GameState
+
+
+def test_dump_room_copies_live_result_dicts():
+    gs = GameState("AAAAA")
+    gs.last_result = {"liar": 1}
+    gs.final_scores = {"scores": [[1, 3]]}
+    d = dump_room(gs)
+    gs.last_result["seq"] = 7  # room_emit이 방송하며 붙이는 값
+    gs.final_scores["seq"] = 8
+    assert d["last_result"] == {"liar": 1}
+    assert d["final_scores"] == {"scores": [[1, 3]]}
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from liar.engine import Phase
+from liar.journal import Journal, recover
+from liar.rooms import RoomRegistry
+
+
+def state(gs):
+    return {
+        "phase": gs.phase,
+        "round": gs.round_num,
+        "host": gs.host_pid,
+        "players": {pid: (p.name, p.score) for pid, p in gs.players.items()},
+        "sessions": dict(gs.sessions),
+        "roles": dict(gs.roles),
+        "word": (gs.category, gs.secret_word),
+        "order": list(gs.order),
+        "hint_index": gs.hint_index,
+        "votes1": dict(gs.votes1.votes),
+        "votes2": dict(gs.votes2.votes),
+        "tally2": (dict(gs.votes2.counts), gs.votes2.top),
+        "last_result": gs.last_result and {k: v for k, v in gs.last_result.items() if k != "seq"},
+    }
+
+
+def vote_all(app, gs, sids, target):
+    for sid in sids:
+        pid = gs.pid_of_sid[sid]
+        app.dispatch(sid, "cast_vote", {"target": target if pid != target else next(p for p in gs.players
+                                                                                    if p != pid)})
+
+
+def test_restart_rebuilds_room_from_snapshot_and_tail(app, table, tmp_path, monkeypatch):
+    journal = Journal(str(tmp_path))
+    monkeypatch.setattr(app, "JOURNAL", journal)
+    gs, sids = table(4)
+    journal.snapshot([app.dump_room(gs)])
+
+    # 1라운드: 모두 라이어를 찍고, 라이어가 못 맞힌다 (시민 점수)
+    host = sids[0]
+    app.dispatch(host, "start_game")
+    app.dispatch(host, "start_discussion")
+    app.dispatch(host, "start_vote2")
+    vote_all(app, gs, sids, gs.liar_pid)
+    app.dispatch(host, "close_vote2")
+    assert gs.phase == Phase.LIAR_GUESS
+    app.dispatch(gs.sid_of[gs.liar_pid], "liar_guess", {"guess": "틀린 답"})
+    assert gs.phase == Phase.RESULTS
+    journal.tick()  # group commit
+    journal.snapshot([app.dump_room(gs)])  # 두 번째 스냅샷: 앞 세그먼트는 지워진다
+
+    # 2라운드 진행 중에 프로세스가 죽는다: 스냅샷 뒤 꼬리 기록만 남는다
+    app.dispatch(host, "next_round")
+    app.dispatch(host, "start_discussion")
+    app.dispatch(host, "start_vote1")
+    vote_all(app, gs, sids, gs.order[0])
+    app.dispatch(host, "close_vote1")
+    app.dispatch(host, "start_hint2")
+    app.dispatch(host, "start_vote2")
+    vote_all(app, gs, sids[1:], gs.order[-1])
+    app.dispatch(sids[1], "cast_vote", {"target": gs.order[1] if gs.order[1] != gs.pid_of_sid[sids[1]]
+                                        else gs.order[2]})  # 표를 바꿨다
+    journal.flush()
+    assert len(journal._segments()) == 1
+
+    registry = RoomRegistry()
+    rebuilt = recover(Journal(str(tmp_path)), registry)
+    assert [r.code for r in rebuilt] == [gs.code]
+    again = registry.rooms[gs.code]
+    assert state(again) == state(gs)
+    assert again.phase == Phase.VOTE2 and again.round_num == 2
+    assert sorted(p.score for p in again.players.values()) == [0, 1, 1, 1]
+    assert all(p.away for p in again.players.values())  # 소켓은 재접속 때 다시
+
+
+def test_failed_background_write_is_logged(tmp_path, monkeypatch, caplog):
+    # asyncio 모드처럼 아무도 Future를 읽지 않는 executor로 offload
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(1)
+    journal = Journal(str(tmp_path), offload=executor.submit)
+
+    def fsync(fd):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("liar.journal.os.fsync", fsync)
+    journal.append(["room", "AAAAA"])
+    journal.flush()
+    executor.submit(lambda: None).result()  # 앞 작업이 끝날 때까지
+    assert journal.failures == 1 and journal.commits == 0
+    assert any("journal _write failed" in r.getMessage() and r.exc_info for r in caplog.records)
+
+    monkeypatch.undo()
+    journal.append(["room", "BBBBB"])
+    journal.flush()
+    executor.shutdown(wait=True)
+    assert journal.commits == 1 and journal.failures == 1
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from liar.limits import Outbox, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_refill():
+    clock = Clock()
+    limiter = RateLimiter({"cast_vote": (2.0, 3)}, clock=clock)
+    assert [limiter.allow("s1", "cast_vote") for _ in range(4)] == [True, True, True, False]
+    assert limiter.throttled == {"cast_vote": 1}
+    clock.now = 0.25  # 초당 2개: 0.5개만 찼다
+    assert not limiter.allow("s1", "cast_vote")
+    clock.now = 0.5
+    assert limiter.allow("s1", "cast_vote")
+    assert not limiter.allow("s1", "cast_vote")
+    clock.now = 100  # 오래 쉬어도 burst까지만 모인다
+    assert [limiter.allow("s1", "cast_vote") for _ in range(4)] == [True, True, True, False]
+
+
+def test_limits_are_per_socket_and_per_event():
+    clock = Clock()
+    limiter = RateLimiter({"cast_vote": (1.0, 1)}, {"hint_next": (1.0, 2)}, default=(1.0, 1), clock=clock)
+    assert limiter.limit_for("hint_next") == (1.0, 2)
+    assert limiter.limit_for("chat") == (1.0, 1)
+    assert limiter.allow("s1", "cast_vote")
+    assert not limiter.allow("s1", "cast_vote")
+    assert limiter.allow("s2", "cast_vote")  # 다른 소켓은 자기 버킷
+    assert limiter.allow("s1", "hint_next") and limiter.allow("s1", "hint_next")  # 다른 이벤트도
+    limiter.forget("s1")
+    assert limiter.allow("s1", "cast_vote")
+
+
+def test_wrapped_handler_is_skipped_when_throttled():
+    limiter = RateLimiter({}, default=(1.0, 1), clock=Clock())
+    calls = []
+    handler = limiter.wrap("cast_vote", lambda sid, data: calls.append(data) or "ok")
+    assert handler("s1", 1) == "ok"
+    assert handler("s1", 2) is None
+    assert calls == [1]
+
+
+class Queue:
+    def __init__(self, size):
+        self.size = size
+
+    def qsize(self):
+        return self.size
+
+
+class Socket:
+    def __init__(self, size):
+        self.queue = Queue(size)
+        self.closed = False
+
+    def close(self, wait=True, abort=False):
+        self.closed = True
+
+
+class Packet:
+    def __init__(self, event):
+        self.data = '2["%s",{}]' % event
+
+
+class Server:
+    # python-socketio Server에서 Outbox가 쓰는 부분만: eio 소켓 큐, 패킷 보내기, 백그라운드 태스크
+    def __init__(self, sizes):
+        self.eio = self
+        self.sockets = {sid: Socket(size) for sid, size in sizes.items()}
+        self.sent = []
+        self.tasks = []
+
+    def send(self, *args):
+        pass
+
+    def _send_eio_packet(self, eio_sid, pkt):
+        self.sent.append((eio_sid, pkt.data))
+
+    def start_background_task(self, fn, *args):
+        self.tasks.append((fn, args))
+
+
+def test_outbox_drops_replaceable_events_past_soft_limit():
+    server = Server({"fast": 0, "slow": 40})
+    outbox = Outbox(soft=32, hard=256)
+    outbox.install(server)
+    for sid in ("fast", "slow"):
+        server._send_eio_packet(sid, Packet("lobby_delta"))
+        server._send_eio_packet(sid, Packet("round_result"))
+    # 밀린 소켓에서 다음 것으로 대체되는 lobby_delta만 버리고 나머지는 그대로 보낸다
+    assert [(sid, data.split('"')[1]) for sid, data in server.sent] == [
+        ("fast", "lobby_delta"), ("fast", "round_result"), ("slow", "round_result")]
+    assert outbox.dropped == {"lobby_delta": 1}
+    assert outbox.kicked == 0 and server.tasks == []
+
+
+def test_outbox_disconnects_past_hard_limit():
+    server = Server({"stuck": 256})
+    outbox = Outbox(soft=32, hard=256)
+    outbox.install(server)
+    sock = server.sockets["stuck"]
+    server._send_eio_packet("stuck", Packet("round_result"))
+    server._send_eio_packet("stuck", Packet("hint_turn"))
+    assert server.sent == []
+    assert outbox.dropped == {"round_result": 1, "hint_turn": 1}
+    assert outbox.kicked == 1 and len(server.tasks) == 1  # 끊기는 한 번만, 보내는 루프 밖에서
+    fn, args = server.tasks[0]
+    fn(*args)
+    assert sock.closed and "stuck" not in server.sockets and not outbox.kicking
+    server._send_eio_packet("stuck", Packet("hint_turn"))  # 이미 끊긴 소켓은 그냥 넘긴다
+    assert len(server.sent) == 1
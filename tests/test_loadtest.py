@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from bench.loadtest import Stats, compare
+
+
+def test_summary_percentiles_per_event():
+    stats = Stats()
+    for ms in range(1, 101):
+        stats.record("hint_turn", ms / 1000)
+    stats.record("vote_progress", 0.002)
+    stats.record("lobby_update", None)  # 지연을 재지 않는 이벤트는 메시지 수에만
+    assert stats.messages == 102
+    out = stats.summary()
+    assert set(out) == {"hint_turn", "vote_progress"}
+    assert out["hint_turn"]["n"] == 100
+    assert round(out["hint_turn"]["p50_ms"]) == 51
+    assert round(out["hint_turn"]["p95_ms"]) == 96
+    assert round(out["hint_turn"]["p99_ms"]) == 100
+    assert out["vote_progress"]["p99_ms"] == out["vote_progress"]["p50_ms"]
+
+
+def test_compare_flags_only_p95_regressions_over_threshold():
+    old = {"events": {"hint_turn": {"p95_ms": 10.0}, "vote_progress": {"p95_ms": 10.0}, "role_info": {"p95_ms": 0}}}
+    new = {"events": {"hint_turn": {"p95_ms": 12.5}, "vote_progress": {"p95_ms": 11.9},
+                      "role_info": {"p95_ms": 50.0}, "final_scores": {"p95_ms": 99.0}}}
+    assert compare(old, new, 0.2) == [{"event": "hint_turn", "old_p95_ms": 10.0, "new_p95_ms": 12.5}]
+    assert compare(old, new, 0.3) == []
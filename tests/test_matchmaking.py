@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import random
+
+from liar.matchmaking import MatchQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(table_size=4, min_size=3, max_wait=20.0):
+    clock = Clock()
+    return MatchQueue(table_size, min_size, max_wait, clock=clock, rng=random.Random(1)), clock
+
+
+def party(q, sids, hold=True):
+    ticket = q.join(sids[0], sids[0], "t-" + sids[0], hold=hold)
+    for sid in sids[1:]:
+        q.join(sid, sid, "t-" + sid, party=ticket.code)
+    if hold:
+        q.ready(sids[0])
+    return ticket
+
+
+def seated(table):
+    return [sid for sid, _, _ in table]
+
+
+def test_party_keeps_its_place_after_a_member_leaves():
+    q, clock = make_queue()
+    party(q, ["a1", "a2", "a3"])
+    clock.now = 1
+    q.join("s", "s", "t-s")
+    clock.now = 2
+    party(q, ["b1", "b2"])
+    clock.now = 3
+    rest = q.leave("a3")  # 남은 a1, a2는 b보다 먼저 줄 섰다
+    assert rest.since == 0
+    assert [seated(t) for t in q.pack()] == [["a1", "a2", "b1", "b2"]]
+    assert q.waiting == 1 and len(q) == 1
+
+
+def test_largest_party_that_fits_fills_the_table():
+    q, clock = make_queue(table_size=7)
+    q.join("s1", "s1", "t")
+    clock.now = 1
+    party(q, ["a1", "a2"])
+    clock.now = 2
+    party(q, ["b1", "b2", "b3", "b4"])
+    clock.now = 3
+    party(q, ["c1", "c2", "c3"])
+    # 가장 오래 기다린 s1부터, 남은 6자리: 4명 파티 → 2명 파티 (3명 파티는 안 들어간다)
+    assert [seated(t) for t in q.pack()] == [["s1", "b1", "b2", "b3", "b4", "a1", "a2"]]
+    assert q.waiting == 3 and q.tables == 1 and q.matched == 7
+
+
+def test_unfilled_table_puts_tickets_back():
+    q, clock = make_queue()
+    q.join("s1", "s1", "t")
+    clock.now = 1
+    party(q, ["a1", "a2"])
+    assert q.pack() == []  # 4자리 중 3명뿐, 아직 max_wait 전
+    assert q.waiting == 3 and len(q) == 3
+    clock.now = 2
+    q.join("s2", "s2", "t")
+    # 돌려놓은 순서 그대로: s1이 여전히 맨 앞
+    assert [seated(t) for t in q.pack()] == [["s1", "a1", "a2", "s2"]]
+
+
+def test_overdue_table_starts_at_min_size():
+    q, clock = make_queue(table_size=5, min_size=3, max_wait=20)
+    q.join("s1", "s1", "t")
+    q.join("s2", "s2", "t")
+    assert q.pack(now=19) == []
+    assert q.pack(now=20) == []  # 다 기다렸어도 min_size보다 적으면 출발하지 않는다
+    clock.now = 5
+    q.join("s3", "s3", "t")
+    assert [seated(t) for t in q.pack(now=20)] == [["s1", "s2", "s3"]]
+    assert sorted(q.waited) == [15, 20, 20]
+
+
+def test_held_party_waits_until_ready():
+    q, clock = make_queue(table_size=3)
+    ticket = q.join("a1", "a1", "t", hold=True)
+    assert q.join("a2", "a2", "t", party=ticket.code) is ticket
+    q.join("s1", "s1", "t")
+    assert q.pack(now=100) == []  # 보류 중인 파티는 대기열에 없다
+    assert q.waiting == 1
+    assert q.ready("a2") is None  # 파티장만
+    clock.now = 10
+    assert q.ready("a1") is ticket and ticket.since == 10
+    assert q.join("a3", "a3", "t", party=ticket.code) is None  # 이미 줄 선 파티에는 못 들어간다
+    assert [seated(t) for t in q.pack()] == [["s1", "a1", "a2"]]
+
+
+def test_leave_and_rejoin():
+    q, clock = make_queue(table_size=3)
+    q.join("s1", "s1", "t")
+    clock.now = 1
+    q.join("s2", "s2", "t")
+    assert q.leave("s1") is None
+    assert q.waiting == 1 and len(q) == 1
+    clock.now = 2
+    q.join("s1", "s1", "t")  # 다시 들어오면 맨 뒤
+    clock.now = 3
+    q.join("s3", "s3", "t")
+    assert [seated(t) for t in q.pack()] == [["s2", "s1", "s3"]]
+    assert q.leave("s2") is None  # 이미 앉은 사람
+    assert q.waiting == 0 and len(q) == 0
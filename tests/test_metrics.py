@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from functools import wraps
+
+import pytest
+
+from liar.metrics import Metrics
+
+
+def socketio_handler(fn):
+    # Flask-SocketIO처럼 (sid, *args)로 감싼다
+    @wraps(fn)
+    def _handler(sid, *args):
+        return fn(*args)
+    return _handler
+
+
+def trigger(handler, *args):
+    # python-socketio: disconnect 핸들러가 reason을 못 받으면 빼고 다시 부른다
+    try:
+        return handler(*args)
+    except TypeError:
+        return handler(*args[:-1])
+
+
+def test_legacy_signature_retry_is_counted_once():
+    m = Metrics()
+    handler = m.wrap("disconnect", socketio_handler(lambda: None))
+    trigger(handler, "sid1", "client disconnect")
+    assert m.calls["disconnect"] == 1
+    assert m.errors.get("disconnect", 0) == 0
+
+
+def test_disconnect_with_reason():
+    m = Metrics()
+    seen = []
+    handler = m.wrap("disconnect", socketio_handler(lambda reason=None: seen.append(reason)))
+    trigger(handler, "sid1", "client disconnect")
+    assert seen == ["client disconnect"]
+    assert m.calls["disconnect"] == 1
+
+
+def test_type_error_inside_handler_is_an_error():
+    m = Metrics()
+
+    def broken(data):
+        return len(None)
+
+    handler = m.wrap("cast_vote", socketio_handler(broken))
+    with pytest.raises(TypeError):
+        handler("sid1", {})
+    assert m.calls["cast_vote"] == 1
+    assert m.errors["cast_vote"] == 1
+
+
+def test_hub_block_is_logged(caplog):
+    m = Metrics(block_threshold=0.1)
+    m.slow.append(("close_vote2", 0.3))
+    m.record_block(0.32)
+    assert m.hub_blocks == {"close_vote2": 1}
+    assert [(r.name, r.levelname, r.getMessage()) for r in caplog.records] == [
+        ("liar.metrics", "WARNING", "hub blocked for 320ms (handler: close_vote2)")]
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from liar.engine import Phase
+from liar.eventlog import EventLog
+
+
+@pytest.fixture
+def join(app):
+    # 진짜 Socket.IO 핸들러를 거쳐 방에 들어가는 테스트 클라이언트
+    clients = []
+
+    def connect(gs, name, token, last_seq=None):
+        client = app.socketio.test_client(app.app)
+        data = {"name": name, "room": gs.code, "token": token}
+        if last_seq is not None:
+            data["last_seq"] = last_seq
+        client.emit("register", data)
+        clients.append(client)
+        return client
+
+    yield connect
+    for client in clients:
+        if client.is_connected():
+            client.disconnect()
+
+
+def received(client):
+    return [(r["name"], r["args"][0]) for r in client.get_received()]
+
+
+def session_of(events):
+    return next(payload for name, payload in events if name == "session")
+
+
+def last_seq(events):
+    return max(payload["seq"] for _, payload in events if isinstance(payload, dict) and "seq" in payload)
+
+
+def start_table(app, join, tokens=("h", "a", "b")):
+    gs = app.ROOMS.create()
+    clients = [join(gs, "p-" + t, "%s-%s" % (gs.code, t)) for t in tokens]
+    clients[0].emit("claim_host", {"code": app.HOST_CODE})
+    clients[0].emit("start_game")
+    return gs, clients
+
+
+def test_resume_replays_only_missed_events(app, join):
+    gs, (host, a, b) = start_table(app, join)
+    seen = received(a)
+    pid = session_of(seen)["pid"]
+    seq = last_seq(seen)
+    a.disconnect()
+    assert gs.players[pid].away
+    host.emit("start_discussion")
+    host.emit("start_vote1")
+
+    again = received(join(gs, "p-a", gs.code + "-a", seq))
+    assert session_of(again) == {"pid": pid, "token": gs.code + "-a", "resumed": True}
+    assert not gs.players[pid].away
+    names = [name for name, _ in again]
+    assert "snapshot" not in names
+    assert names.count("role_info") == 1  # 역할은 개인 정보라 다시 보낸다
+    replay = [(name, p) for name, p in again if isinstance(p, dict) and "seq" in p]
+    assert [name for name, _ in replay] == ["start_timer", "open_vote"]
+    assert [p["seq"] for _, p in replay] == [seq + 1, seq + 2]
+
+
+def test_exact_catch_up_sends_nothing_missed(app, join):
+    gs, (host, a, b) = start_table(app, join)
+    seq = last_seq(received(a))
+    a.disconnect()
+    names = [name for name, _ in received(join(gs, "p-a", gs.code + "-a", seq))]
+    assert "snapshot" not in names and "hint_turn" not in names and "game_started" not in names
+
+
+def test_resume_after_ring_wrapped_gets_snapshot(app, join):
+    gs = app.ROOMS.create()
+    gs.events = EventLog(maxlen=2)
+    host, a, b = [join(gs, "p-" + t, "%s-%s" % (gs.code, t)) for t in ("h", "a", "b")]
+    host.emit("claim_host", {"code": app.HOST_CODE})
+    host.emit("start_game")
+    seq = last_seq(received(a))
+    a.disconnect()
+    host.emit("start_discussion")
+    host.emit("start_vote1")
+    host.emit("close_vote1")  # 끊긴 동안 2개 넘게 지나갔다
+
+    again = received(join(gs, "p-a", gs.code + "-a", seq))
+    assert session_of(again)["resumed"]
+    snaps = [p for name, p in again if name == "snapshot"]
+    assert len(snaps) == 1 and snaps[0]["seq"] == gs.events.seq
+    assert [e for e, _ in snaps[0]["events"]][:2] == ["game_started", "hint_order"]
+    assert not any(name in ("start_timer", "open_vote") for name, _ in again)
+
+
+def test_unknown_or_expired_token_gets_a_new_seat(app, join):
+    gs, (host, a, b) = start_table(app, join)
+    pid = session_of(received(a))["pid"]
+    stranger = received(join(gs, "p-x", "nobody"))
+    assert not session_of(stranger)["resumed"] and session_of(stranger)["pid"] != pid
+    assert [name for name, _ in stranger].count("snapshot") == 1  # 게임 중에 처음 붙으면 지금 화면부터
+
+    a.disconnect()
+    app.expire_player(gs.code, pid)  # 유예 시간이 지났다
+    assert pid not in gs.players and gs.code + "-a" not in gs.sessions
+    late = session_of(received(join(gs, "p-a", gs.code + "-a", 1)))
+    assert not late["resumed"] and late["pid"] != pid
+    assert gs.phase == Phase.HINT1
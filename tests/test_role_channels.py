@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from liar.engine import Role
+
+
+def members(app, room):
+    return set(app.socketio.server.manager.rooms["/"].get(room, {}))
+
+
+def test_role_info_goes_once_per_role_channel(app, table, monkeypatch):
+    gs, sids = table(5)
+    sent = []
+    monkeypatch.setattr(app.socketio, "emit", lambda event, payload, to=None, **kw: sent.append((event, payload, to)))
+    app.dispatch(sids[0], "start_game")
+    infos = [(p, to) for event, p, to in sent if event == "role_info"]
+    assert sorted(to for _, to in infos) == sorted(app.role_channel(gs, r) for r in set(gs.roles.values()))
+    for payload, to in infos:
+        assert to == app.role_channel(gs, payload["role"])
+        assert payload["keyword"] == (None if payload["role"] == Role.LIAR else gs.secret_word)
+    for role in Role:
+        want = {gs.sid_of[pid] for pid, r in gs.roles.items() if r == role}
+        assert members(app, app.role_channel(gs, role)) == want
+
+
+def test_channels_follow_roles_across_rounds_and_rejoin(app, table):
+    gs, sids = table(4)
+    app.dispatch(sids[0], "start_game")
+    liar = gs.liar_pid
+    # 다음 라운드에 역할이 바뀐 사람만 옮긴다
+    gs.roles, gs.liar_pid = {pid: Role.CITIZEN for pid in gs.players}, None
+    app.sync_role_channels(gs)
+    assert members(app, app.role_channel(gs, Role.LIAR)) == set()
+    assert gs.sid_of[liar] in members(app, app.role_channel(gs, Role.CITIZEN))
+
+    # 새 소켓으로 돌아온 사람은 자기 역할 채널에 다시 들어간다
+    new_sid = app.socketio.server.manager.connect("rejoin-%s" % gs.code, "/")
+    app.bind_socket(gs, liar, new_sid)
+    assert new_sid in members(app, app.role_channel(gs, Role.CITIZEN))
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+
+from liar.engine import Phase, Role
+from liar.rooms import GameState, Player, RoomRegistry
+
+
+def test_codes_are_unique_and_lookup_ignores_case():
+    reg = RoomRegistry()
+    rooms = [reg.create() for _ in range(50)]
+    assert len(reg) == len({gs.code for gs in rooms}) == 50
+    gs = rooms[0]
+    assert reg.get(" %s " % gs.code.lower()) is gs
+    assert reg.get("") is None and reg.get("NOPE") is None
+
+
+def test_join_binds_socket_to_one_room():
+    reg = RoomRegistry()
+    a, b = reg.create(), reg.create()
+    assert reg.join("s1", a.code) is a
+    assert reg.join("s1", "NOPE") is None
+    assert reg.code_by_sid == {"s1": a.code}
+    reg.join("s1", b.code)  # 다른 방으로 옮기면 이전 방에서 빠진다
+    assert reg.code_by_sid == {"s1": b.code}
+    assert reg.leave("s1") is b
+    assert reg.leave("s1") is None
+
+
+def test_only_empty_idle_rooms_are_collected():
+    reg = RoomRegistry(idle_ttl=10)
+    empty, seated, fresh = reg.create(), reg.create(), reg.create()
+    seated.players[1] = object()
+    t = empty.touched_at
+    seated.touched_at = t
+    fresh.touched_at = t + 15
+    assert reg.collect_idle(now=t + 20) == [empty.code]
+    assert set(reg.rooms) == {seated.code, fresh.code}
+
+
+def test_tables_do_not_share_state(app, table):
+    a, sids_a = table(4)
+    b, sids_b = table(3)
+    app.dispatch(sids_a[0], "start_game")
+    assert a.phase == Phase.HINT1 and a.round_num == 1
+    assert b.phase == Phase.LOBBY and b.round_num == 0
+    # 다른 방의 호스트 명령은 자기 방에만
+    app.dispatch(sids_b[0], "start_game")
+    assert b.round_num == 1 and a.round_num == 1
+    assert set(a.roles) == set(a.players) and set(b.roles) == set(b.players)
+    assert app.ROOMS.code_by_sid[sids_a[1]] == a.code and app.ROOMS.code_by_sid[sids_b[1]] == b.code
+
+
+def test_rooms_and_players_are_slotted():
+    gs = GameState("SLOT")
+    for obj in (gs, Player("p"), gs.events, gs.roster, gs.votes1, gs.deck):
+        assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+
+def test_enums_stay_plain_strings_on_the_wire():
+    assert Phase.VOTE1 == "vote1" and Role.LIAR == "liar"
+    assert json.dumps({"phase": Phase.HINT2, "role": Role.SPY}) == '{"phase": "hint2", "role": "spy"}'
+
+
+def test_rejoin_churn_does_not_grow_room_indexes(app, table):
+    gs, sids = table(4)
+    manager = app.socketio.server.manager
+
+    def sizes():
+        return (len(gs.players), len(gs.sessions), len(gs.sid_of), len(gs.pid_of_sid), len(gs.roster))
+
+    before = sizes()
+    for n in range(3):
+        for i in range(1, 4):
+            app.disconnect(sids[i])
+            sids[i] = manager.connect("churn-%s-%d-%d" % (gs.code, n, i), "/")
+            app.register(sids[i], {"name": "new%d-%d" % (n, i), "room": gs.code, "token": "%s-%d" % (gs.code, i)})
+    assert sizes() == before
+    assert not any(p.away for p in gs.players.values()) and gs.away_timers == {}
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from liar.roster import Roster
+
+
+class Lobby:
+    # static/client.js의 lobby_state / lobby_delta 처리와 같은 규칙
+    def __init__(self):
+        self.version = -1
+        self.players = []
+        self.host_name = None
+
+    def load(self, state):
+        self.version = state["version"]
+        self.players = [dict(p) for p in state["players"]]
+        self.host_name = state["host_name"]
+
+    def apply(self, d):
+        # False면 중간 변경을 놓쳤다: lobby_sync로 스냅샷을 받아야 한다
+        if d["to"] <= self.version:
+            return True
+        if d["from"] > self.version:
+            return False
+        for op in d["ops"]:
+            if op["v"] > self.version:
+                self._op(op)
+        self.version = d["to"]
+        return True
+
+    def _op(self, op):
+        if op["type"] == "player_joined":
+            self._remove(op["player"]["pid"])
+            self._insert(dict(op["player"]))
+        elif op["type"] == "player_left":
+            self._remove(op["pid"])
+        elif op["type"] == "host_changed":
+            for p in [p for p in self.players if p["is_host"]]:
+                self._remove(p["pid"])
+                p["is_host"] = False
+                self._insert(p)
+            h = self._remove(op["host_pid"])
+            if h:
+                h["is_host"] = True
+                self._insert(h)
+            self.host_name = op["host_name"]
+
+    def _remove(self, pid):
+        for i, p in enumerate(self.players):
+            if p["pid"] == pid:
+                return self.players.pop(i)
+        return None
+
+    def _insert(self, p):
+        key = lambda q: (not q["is_host"], q["name"], q["pid"])
+        i = 0
+        while i < len(self.players) and key(self.players[i]) < key(p):
+            i += 1
+        self.players.insert(i, p)
+
+    def state(self):
+        return {"version": self.version, "players": self.players, "host_name": self.host_name}
+
+
+def server_state(roster):
+    snap = roster.snapshot()
+    return {"version": snap["version"], "players": snap["players"], "host_name": snap["host_name"]}
+
+
+def test_deltas_rebuild_the_snapshot():
+    roster, lobby = Roster(), Lobby()
+    lobby.load(roster.snapshot())
+    for pid, name in ((1, "다"), (2, "가"), (3, "나")):
+        roster.add(pid, name)
+    assert lobby.apply(roster.take_delta())
+    roster.set_host(3)
+    roster.add(2, "라")  # 이름만 바뀜
+    roster.remove(1)
+    delta = roster.take_delta()
+    assert delta == {"from": 3, "to": 6, "ops": [
+        {"type": "host_changed", "host_pid": 3, "host_name": "나", "v": 4},
+        {"type": "player_joined", "player": {"pid": 2, "name": "라", "is_host": False}, "v": 5},
+        {"type": "player_left", "pid": 1, "v": 6}]}
+    assert roster.take_delta() is None
+    assert lobby.apply(delta)
+    assert lobby.state() == server_state(roster)
+    assert [p["pid"] for p in lobby.players] == [3, 2]
+
+
+def test_version_gap_needs_full_snapshot():
+    roster, lobby = Roster(), Lobby()
+    roster.add(1, "가")
+    lobby.load(roster.snapshot())
+    roster.add(2, "나")
+    roster.take_delta()  # 이 클라이언트는 못 받았다
+    roster.add(3, "다")
+    roster.set_host(3)
+    late = roster.take_delta()
+    assert not lobby.apply(late)  # 빈 곳이 있으면 이어붙이지 않는다
+    assert lobby.version == 1
+    lobby.load(roster.snapshot())
+    assert lobby.state() == server_state(roster)
+    assert lobby.apply(late)  # 스냅샷에 이미 들어간 변경은 무시
+    assert lobby.state() == server_state(roster)
+
+
+def test_snapshot_then_overlapping_delta():
+    roster, lobby = Roster(), Lobby()
+    roster.add(1, "가")
+    roster.add(2, "나")
+    lobby.load(roster.snapshot())  # 방송 전 변경까지 담긴 스냅샷
+    roster.set_host(2)
+    assert lobby.apply(roster.take_delta())  # 겹친 앞부분은 건너뛰고 새 것만
+    assert lobby.state() == server_state(roster)
+    assert lobby.players[0] == {"pid": 2, "name": "나", "is_host": True}
+
+
+def test_lobby_sync_sends_snapshot_only_when_behind(app, table):
+    gs, sids = table(3)
+    client = app.socketio.test_client(app.app)
+    client.emit("register", {"name": "늦은", "room": gs.code, "token": gs.code + "-late"})
+    client.get_received()
+    client.emit("lobby_sync", {"version": gs.roster.version})
+    assert [r["name"] for r in client.get_received()] == []
+    client.emit("lobby_sync", {"version": gs.roster.version - 2})
+    states = [r["args"][0] for r in client.get_received() if r["name"] == "lobby_state"]
+    assert len(states) == 1 and states[0]["version"] == gs.roster.version
+    assert [p["name"] for p in states[0]["players"]] == [p["name"] for p in gs.roster.players()]
+    client.disconnect()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from liar.engine import SPY_MIN_PLAYERS, Role, assign_roles, pick_accused, round_winner, score_deltas
+from liar.tally import VoteTally
+
+
+@pytest.mark.parametrize("players", [3, 6, SPY_MIN_PLAYERS, 10])
+def test_assign_roles(players):
+    pids = list(range(1, players + 1))
+    for seed in range(50):
+        roles, liar, spy = assign_roles(pids, random.Random(seed))
+        assert sorted(roles) == pids
+        assert roles[liar] is Role.LIAR
+        assert list(roles.values()).count(Role.LIAR) == 1
+        if players >= SPY_MIN_PLAYERS:
+            assert spy != liar and roles[spy] is Role.SPY
+        else:
+            assert spy is None and Role.SPY not in roles.values()
+
+
+def test_pick_accused():
+    assert pick_accused([]) is None
+    assert pick_accused([4]) == 4
+    picks = {pick_accused([3, 1, 2], random.Random(seed)) for seed in range(100)}
+    assert picks == {1, 2, 3}
+    # 같은 seed면 후보 순서와 무관하게 같은 사람
+    assert pick_accused([3, 1, 2], random.Random(7)) == pick_accused([2, 3, 1], random.Random(7))
+
+
+def test_round_winner():
+    assert round_winner(True, False) == "citizens"
+    assert round_winner(True, True) == "liar_team"
+    assert round_winner(False, None) == "liar_team"
+
+
+def test_score_deltas():
+    roles = {1: Role.LIAR, 2: Role.SPY, 3: Role.CITIZEN, 4: Role.CITIZEN}
+    assert score_deltas(roles, "citizens") == {3: 1, 4: 1}
+    assert score_deltas(roles, "liar_team") == {1: 2, 2: 1}
+    # 저널에서 읽은 문자열 역할도 같은 결과
+    assert score_deltas({1: "liar", 3: "citizen"}, "liar_team") == {1: 2}
+
+
+def test_vote_tally_leaders():
+    tally = VoteTally()
+    tally.cast(1, 2)
+    tally.cast(3, 2)
+    tally.cast(2, 4)
+    assert tally.leaders() == [2] and tally.top == 2
+    tally.cast(3, 4)  # 표를 옮기면 최다 득표자가 바뀐다
+    assert tally.leaders() == [4] and tally.top == 2
+    tally.cast(5, 2)
+    assert sorted(tally.leaders()) == [2, 4]
+    tally.retract(5)
+    tally.drop_target(4)
+    assert tally.leaders() == [2] and len(tally) == 1
+    tally.retract(1)
+    assert tally.leaders() == [] and tally.top == 0
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from liar.scheduler import TimerScheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cancel_compaction_inside_callback():
+    clock = Clock()
+    s = TimerScheduler(clock=clock)
+    later = [s.call_at(10, lambda: None) for _ in range(100)]
+    fired = []
+
+    def cancel_all():
+        # 절반 넘게 취소되면 cancel()이 힙을 새로 만든다 (run_due 도중)
+        for t in later:
+            s.cancel(t)
+
+    s.call_at(1, cancel_all)
+    for i in range(10):
+        s.call_at(2, fired.append, i)
+    assert s.run_due(5) == 11
+    assert fired == list(range(10))
+    assert len(s) == 0
+    assert s._cancelled >= 0
+    assert s.run_due(20) == 0
+    assert len(s) == 0
+
+
+def test_cancelled_timer_does_not_fire():
+    clock = Clock()
+    s = TimerScheduler(clock=clock)
+    fired = []
+    t = s.call_later(1, fired.append, "x")
+    s.cancel(t)
+    clock.now = 2
+    assert s.run_due() == 0
+    assert fired == [] and len(s) == 0
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import json
+
+from liar.spectators import SpectatorHub
+
+
+def test_hub_tracks_watchers_and_dirty_rooms():
+    hub = SpectatorHub()
+    hub.mark("AAAA")  # 아무도 안 보는 방은 표시하지 않는다
+    assert hub.take_dirty() == set()
+    assert hub.watch("s1", "AAAA") is None
+    hub.watch("s2", "AAAA")
+    assert hub.watch("s1", "BBBB") == "AAAA"  # 다른 방으로 옮기면 이전 방은 떠난다
+    assert (hub.count("AAAA"), hub.count("BBBB"), len(hub)) == (1, 1, 2)
+    hub.mark("AAAA")
+    hub.mark("AAAA")
+    hub.mark("BBBB")
+    assert hub.take_dirty() == {"AAAA", "BBBB"}
+    assert hub.take_dirty() == set()
+
+    hub.mark("AAAA")
+    assert hub.leave("s2") == "AAAA"
+    assert hub.take_dirty() == set() and "AAAA" not in hub.sids_of
+    hub.drop("BBBB")
+    assert len(hub) == 0 and hub.leave("s1") is None
+
+
+def test_snapshot_hides_roles_and_word(app, table):
+    gs, sids = table(4)
+    app.dispatch(sids[0], "start_game")
+    snap = app.spectator_snapshot(gs)
+    assert snap["phase"] == "hint1" and snap["speaker"] == gs.order[0]
+    text = json.dumps(snap, ensure_ascii=False)
+    assert gs.secret_word not in text and "liar" not in text
+    assert snap["accused"] is None and snap["result"] is None
+
+
+def test_room_broadcasts_mark_watched_rooms_only(app, table):
+    watched, sids = table(4)
+    other, other_sids = table(3)
+    app.WATCH.take_dirty()
+    app.WATCH.watch("viewer-%s" % watched.code, watched.code)
+    try:
+        app.dispatch(sids[0], "start_game")
+        app.dispatch(other_sids[0], "start_game")
+        assert app.WATCH.take_dirty() == {watched.code}
+    finally:
+        app.WATCH.leave("viewer-%s" % watched.code)
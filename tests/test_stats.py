@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from liar.stats import PlayerStats
+
+
+def play(stats, room, names, rounds=1):
+    for name in names:
+        stats.add_round(name, "citizen", True, 1, None, 1, 1)
+    stats.add_game(room, rounds, [[name, 1] for name in names])
+    stats.flush()
+
+
+def test_leaderboard_sees_games_from_other_workers(tmp_path):
+    path = str(tmp_path / "stats.sqlite3")
+    a, b = PlayerStats(path), PlayerStats(path)  # 같은 DB를 쓰는 워커 둘
+    play(a, "AAAAA", ["x", "y"])
+    assert len(a.leaderboard("games")) == 2
+    a.leaderboard("games")
+    assert a.cache_hits == 1
+    play(b, "BBBBB", ["z"])
+    names = {r["name"] for r in a.leaderboard("games")}
+    assert names == {"x", "y", "z"}
+    assert a.cache_misses == 2
+
+
+def test_leaderboard_cached_between_games(tmp_path):
+    stats = PlayerStats(str(tmp_path / "stats.sqlite3"))
+    play(stats, "AAAAA", ["x"])
+    for _ in range(3):
+        assert stats.leaderboard("points")[0]["points"] == 1
+    assert (stats.cache_misses, stats.cache_hits) == (1, 2)
+    play(stats, "AAAAA", ["x"])
+    assert stats.leaderboard("points")[0]["points"] == 2
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from liar.engine import Phase
+from liar.stats import PlayerStats
+
+
+def games_recorded(stats):
+    return sum(1 for rec in stats.pending if rec[0] == "game")
+
+
+def test_game_recorded_once_at_summary(app, table, tmp_path, monkeypatch):
+    stats = PlayerStats(str(tmp_path / "stats.sqlite3"))
+    monkeypatch.setattr(app, "STATS", stats)
+    gs, sids = table(4)
+    gs.round_num = gs.max_rounds
+    gs.phase = Phase.RESULTS
+    app.dispatch(sids[0], "next_round")
+    assert gs.phase == Phase.SUMMARY
+    assert games_recorded(stats) == 1
+    # 요약 화면에서 더 누르면 아무 일도 없다
+    app.dispatch(sids[0], "next_round")
+    app.dispatch(sids[0], "next_round")
+    assert games_recorded(stats) == 1
+    stats.flush()
+    assert [row["games"] for row in stats.leaderboard("games")] == [1, 1, 1, 1]
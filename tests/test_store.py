@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from liar.store import MemoryStore, RedisStore
+
+
+def test_memory_store_owner_and_docs():
+    store = MemoryStore()
+    assert store.claim("ROOM1", "a", 15) == "a"
+    assert store.claim("ROOM1", "b", 15) == "a"
+    got = []
+    store.listen(["owners"], lambda channel, message: got.append((channel, message)))
+    store.publish("owners", ["ROOM1"])
+    assert got == [("owners", ["ROOM1"])]
+    store.save({"ROOM1": {"code": "ROOM1"}})
+    assert store.load("ROOM1") == {"code": "ROOM1"}
+    store.drop("ROOM1")
+    assert store.owner("ROOM1") is None and store.load("ROOM1") is None
+
+
+def test_redis_store_claim_and_lease(respd):
+    a, b = RedisStore(respd), RedisStore(respd)
+    assert a.claim("ROOM1", "a", 1) == "a"
+    assert b.claim("ROOM1", "b", 1) == "a"  # 먼저 차지한 쪽이 주인
+    assert b.owner("ROOM1") == "a"
+    assert a.renew("a", ["ROOM1"], 2) == []
+    time.sleep(1.2)
+    assert b.owner("ROOM1") == "a"  # 연장했으니 아직 살아 있다
+    time.sleep(1.0)
+    assert b.owner("ROOM1") is None  # 연장이 끊기면 주인 표시가 사라진다
+    assert b.claim("ROOM1", "b", 1) == "b"
+
+
+def test_redis_store_docs_and_pubsub(respd):
+    a, b = RedisStore(respd), RedisStore(respd)
+    a.save({"ROOM1": {"code": "ROOM1", "players": [[1, "가나다"]]}})
+    assert b.load("ROOM1") == {"code": "ROOM1", "players": [[1, "가나다"]]}
+    got = []
+    ready = threading.Event()
+
+    def listen():
+        try:
+            b.listen(["w:b"], lambda channel, message: (got.append((channel, message)), ready.set()))
+        except Exception:  # 테스트가 끝나 서버가 닫히면
+            pass
+
+    threading.Thread(target=listen, daemon=True).start()
+    deadline = time.monotonic() + 5
+    while not ready.is_set() and time.monotonic() < deadline:
+        a.publish("w:b", ["ROOM1", "task", [1], 0])  # 구독이 붙기 전에 보낸 것은 사라진다
+        ready.wait(0.05)
+    assert got[0] == ("w:b", ["ROOM1", "task", [1], 0])
+    a.drop("ROOM1")
+    assert b.load("ROOM1") is None and b.owner("ROOM1") is None
+
+
+def test_redis_store_renew_only_own_leases(respd):
+    a, b = RedisStore(respd), RedisStore(respd)
+    a.claim("ROOM1", "a", 1)
+    a.claim("ROOM2", "a", 1)
+    time.sleep(1.2)  # a가 멈춰 있는 사이 ROOM1은 b가 이어받았다
+    assert b.claim("ROOM1", "b", 1) == "b"
+    assert a.renew("a", ["ROOM1", "ROOM2"], 5) == ["ROOM1", "ROOM2"]  # ROOM2는 만료돼 주인이 없다
+    assert a.claim("ROOM2", "a", 1) == "a"
+    assert a.renew("a", ["ROOM1", "ROOM2"], 5) == ["ROOM1"]
+    time.sleep(1.2)
+    assert b.owner("ROOM1") is None  # b의 주인 표시를 a가 연장하지 않았다
+    assert b.owner("ROOM2") == "a"
+    assert MemoryStore().renew("a", ["ROOM1"], 5) == ["ROOM1"]
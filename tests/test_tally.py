@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import random
+from collections import Counter
+
+from liar.engine import Phase
+from liar.tally import VoteTally
+
+
+def test_running_tally_matches_recount():
+    rng = random.Random(4)
+    tally = VoteTally()
+    for _ in range(2000):
+        voter, target = rng.randrange(12), rng.randrange(6)
+        if rng.random() < 0.2:
+            tally.retract(voter)
+        elif rng.random() < 0.05:
+            tally.drop_target(target)
+        else:
+            tally.cast(voter, target)
+        counts = Counter(tally.votes.values())
+        top = max(counts.values(), default=0)
+        assert tally.counts == dict(counts)
+        assert tally.top == top
+        assert sorted(tally.leaders()) == sorted(t for t, n in counts.items() if n == top)
+
+
+def test_vote_progress_is_coalesced(app, table):
+    gs, sids = table(4)
+    host = sids[0]
+    for event in ("start_game", "start_discussion", "start_vote1"):
+        app.dispatch(host, event)
+    assert gs.phase == Phase.VOTE1
+    pid = gs.pid_of_sid
+    seq = gs.events.seq
+
+    app.dispatch(sids[1], "cast_vote", {"target": pid[sids[2]]})
+    app.dispatch(sids[1], "cast_vote", {"target": pid[sids[3]]})  # 창 안에서 바꾸면 마지막 표만
+    app.dispatch(sids[2], "cast_vote", {"target": pid[sids[3]]})
+    assert gs.events.since(seq) == []  # 아직 보내지 않았다
+    assert gs.vote_flush is not None
+
+    app.vote_flush_due(gs.code)
+    [(event, payload)] = gs.events.since(seq)
+    assert event == "vote_progress"
+    assert payload["votes"] == [[pid[sids[1]], pid[sids[3]]], [pid[sids[2]], pid[sids[3]]]]
+    assert dict(payload["counts"]) == {pid[sids[2]]: 0, pid[sids[3]]: 2}
+    assert payload["voted"] == 2 and payload["top"] == [pid[sids[3]]] and payload["max"] == 2
+    assert gs.vote_flush is None and gs.vote_pending == {}
+
+
+def test_close_flushes_pending_votes_first(app, table):
+    gs, sids = table(4)
+    host = sids[0]
+    for event in ("start_game", "start_discussion", "start_vote1"):
+        app.dispatch(host, event)
+    seq = gs.events.seq
+    app.dispatch(sids[1], "cast_vote", {"target": gs.pid_of_sid[sids[2]]})
+    app.dispatch(host, "close_vote1")
+    names = [event for event, _ in gs.events.since(seq)]
+    assert names[:2] == ["vote_progress", "vote_closed"]
+    assert gs.vote_flush is None
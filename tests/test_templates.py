@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+
+from flask import render_template
+
+
+def injected(html, var):
+    # window.APP = {...} / window.QUEUE = {...} 안의 값: 키를 따옴표로 감싸면 그대로 JSON
+    body = re.search(r"window\.%s = (\{.*?\});" % var, html, re.S).group(1)
+    return json.loads(re.sub(r"(\w+):", r'"\1":', body))
+
+
+def test_injected_values_are_js_literals(app):
+    name = 'a\\b "c"\n</script>&amp;'
+    with app.app.test_request_context():
+        page = render_template("index.html", name=name, room="AB12C", token="t'1")
+        queue = render_template("queue.html", name=name, token="t", party='P"1', hold=True, table_size=7)
+    assert "</script>&amp;" not in page.split("window.APP", 1)[1].split("</script>", 1)[0]
+    assert injected(page, "APP") == {"name": name, "room": "AB12C", "token": "t'1", "wire": app.WIRE_FORMAT}
+    assert injected(queue, "QUEUE") == {"party": 'P"1', "hold": True, "tableSize": 7}
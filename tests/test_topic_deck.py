@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import random
+
+from liar.topic_bank import TopicDeck, TopicIndex
+
+
+def draw_all(deck, index, category, n):
+    seen = []
+    while len(seen) < n:
+        c, w = deck.draw(index)
+        if c == category:
+            seen.append(w)
+    return seen
+
+
+def test_reload_keeps_cursor_of_unchanged_category():
+    animals = ["개", "고양이", "토끼", "말", "소", "양", "닭"]
+    old = TopicIndex(1, {"동물": animals, "과일": ["사과", "배"]})
+    deck = TopicDeck(random.Random(1))
+    first = draw_all(deck, old, "동물", 3)
+
+    new = TopicIndex(2, {"동물": animals, "과일": ["사과", "배", "감"]}, old)
+    assert new.words["동물"] is old.words["동물"]
+    assert new.since == {"동물": 1, "과일": 2}
+    rest = draw_all(deck, new, "동물", len(animals) - 3)
+    assert sorted(first + rest) == sorted(animals)
+
+
+def test_reload_resets_cursor_of_changed_category():
+    old = TopicIndex(1, {"동물": ["개", "고양이", "토끼"]})
+    deck = TopicDeck(random.Random(2))
+    deck.draw(old)
+    new = TopicIndex(2, {"동물": ["개", "고양이", "토끼", "말"]}, old)
+    deck.draw(new)
+    assert deck.cursors["동물"][2] == 1
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import pytest
+import socketio
+from socketio import packet
+
+from liar.wire import CompactJSON, WireManager, WirePacket, event_name, msgpack
+
+# pid는 정수 그대로, pid를 키로 쓰는 값은 [pid, 값] 쌍 (JSON 키는 문자열이 되므로)
+PAYLOAD = {"phase": "vote2", "votes": [[1, 3], [2, 3]], "counts": [[3, 2]], "voted": 2, "top": [3],
+           "max": 2, "seq": 41, "names": [[3, "라이어 아님"]]}
+
+
+def server():
+    srv = socketio.Server(client_manager=WireManager(), serializer=WirePacket, json=CompactJSON)
+    srv.sent = []
+    srv._send_eio_packet = lambda eio_sid, pkt: srv.sent.append((eio_sid, pkt))
+    return srv
+
+
+def test_compact_json_keeps_utf8():
+    text = CompactJSON.dumps(PAYLOAD, separators=(",", ":"))
+    assert "라이어" in text and "\\u" not in text
+    assert CompactJSON.loads(text) == PAYLOAD
+
+
+def test_json_packet_round_trip():
+    srv = server()
+    encoded = srv.packet_class(packet.EVENT, data=["vote_progress", PAYLOAD]).encode()
+    assert isinstance(encoded, str) and event_name(encoded) == "vote_progress"
+    decoded = srv.packet_class(encoded_packet=encoded)
+    assert decoded.packet_type == packet.EVENT
+    assert decoded.data == ["vote_progress", PAYLOAD]
+
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+def test_msgpack_packet_round_trip():
+    encoded = WirePacket(packet.EVENT, namespace="/", data=["vote_progress", PAYLOAD]).encode_msgpack()
+    assert isinstance(encoded, bytes) and event_name(encoded) == "vote_progress"
+    decoded = WirePacket(encoded_packet=encoded)
+    assert decoded.packet_type == packet.EVENT and decoded.namespace == "/"
+    assert decoded.data == ["vote_progress", PAYLOAD]
+    assert all(isinstance(pid, int) for pair in decoded.data[1]["votes"] for pid in pair)
+    # 클라이언트가 보내는 쪽 (static/wire.js): 네임스페이스 없이 ack id 포함
+    ack = WirePacket(encoded_packet=msgpack.dumps({"type": packet.EVENT, "data": ["cast_vote", {"target": 3}],
+                                                   "id": 5}))
+    assert (ack.namespace, ack.id, ack.data) == ("/", 5, ["cast_vote", {"target": 3}])
+
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+def test_broadcast_encodes_once_per_format():
+    srv = server()
+    srv.environ.update({"m1": {"QUERY_STRING": "wire=msgpack"}, "m2": {"QUERY_STRING": "wire=msgpack&EIO=4"},
+                        "j1": {"QUERY_STRING": "EIO=4"}})
+    for eio_sid in ("m1", "m2", "j1"):
+        srv.manager.enter_room(srv.manager.connect(eio_sid, "/"), "/", "ROOM1")
+    srv.emit("vote_progress", PAYLOAD, to="ROOM1")
+    by_sid = dict(srv.sent)
+    assert by_sid["m1"] is by_sid["m2"]  # 같은 형식끼리는 같은 패킷을 재사용
+    assert WirePacket(encoded_packet=by_sid["m1"].data).data == ["vote_progress", PAYLOAD]
+    text = by_sid["j1"].data
+    assert isinstance(text, str)
+    assert WirePacket(encoded_packet=text).data == ["vote_progress", PAYLOAD]
+    srv.manager.disconnect(srv.manager.sid_from_eio_sid("m1", "/"), "/")
+    assert srv.manager.msgpack_eio == {"m2"}